@@ -1,18 +1,20 @@
-from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
+
+from apps.notifications import counters
 
 
 def unread_notifications_count(request):
-    """Context processor to add unread notifications count to all templates."""
-    if request.user.is_authenticated:
-        try:
-            # Get count of unread notifications
-            count = request.user.notifications.filter(is_read=False).count()
-        except AttributeError:
-            # Handle case where notifications relationship doesn't exist yet
-            count = 0
-    else:
-        count = 0
+    """
+    Context processor to add unread notifications count to all templates.
+
+    The count is lazy: the user, and then the cached count (rebuilt from the
+    database on a miss), are only looked up when a template renders it.
+    """
+    def count():
+        if not request.user.is_authenticated:
+            return 0
+        return counters.unread_count(request.user.id)
 
     return {
-        'unread_notifications_count': count,
-    }
\ No newline at end of file
+        'unread_notifications_count': SimpleLazyObject(count),
+    }
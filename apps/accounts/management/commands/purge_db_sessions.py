@@ -0,0 +1,76 @@
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.accounts.sessions import CacheSessionStore
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete rows from the legacy django_session table, optionally copying '
+        'live sessions into the cache first so nobody is logged out.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--expired-only',
+            action='store_true',
+            help='Only delete sessions past their expiry date.',
+        )
+        parser.add_argument(
+            '--copy-to-cache',
+            action='store_true',
+            help='Copy unexpired sessions into the session cache before deleting them.',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Delete unexpired sessions without copying them, logging those users out.',
+        )
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows deleted per query.')
+        parser.add_argument('--dry-run', action='store_true', help='Report counts without changing anything.')
+
+    def handle(self, *args, **options):
+        if settings.SESSION_DB_WRITE_THROUGH and not options['expired_only']:
+            raise CommandError(
+                'SESSION_DB_WRITE_THROUGH is on, so django_session holds live sessions; '
+                'use --expired-only.'
+            )
+
+        if not (options['expired_only'] or options['copy_to_cache'] or options['force'] or options['dry_run']):
+            raise CommandError(
+                'This would delete every live session and log all users out; '
+                'use --copy-to-cache to keep them, --expired-only, or --force.'
+            )
+
+        now = timezone.now()
+        sessions = Session.objects.all()
+        if options['expired_only']:
+            sessions = sessions.filter(expire_date__lt=now)
+
+        total = sessions.count()
+        live = Session.objects.filter(expire_date__gte=now)
+        self.stdout.write(f'{total} session rows to delete ({live.count()} unexpired in the table).')
+        if options['dry_run']:
+            return
+
+        if options['copy_to_cache'] and not options['expired_only']:
+            copied = 0
+            for session in live.iterator(chunk_size=options['batch_size']):
+                store = CacheSessionStore(session.session_key)
+                timeout = int((session.expire_date - now).total_seconds())
+                store._cache.set(store.cache_key, session.get_decoded(), timeout)
+                copied += 1
+            self.stdout.write(f'Copied {copied} sessions to the cache.')
+
+        # Delete in primary-key batches so a large table does not hold a
+        # write lock (SQLite) for one long statement
+        deleted = 0
+        while True:
+            keys = list(sessions.values_list('session_key', flat=True)[:options['batch_size']])
+            if not keys:
+                break
+            deleted += Session.objects.filter(session_key__in=keys).delete()[0]
+
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} session rows.'))
@@ -0,0 +1,257 @@
+import random
+import time
+import uuid
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.accounts.models import CompanyProfile, PersonalProfile, User
+from apps.following.models import Follow
+from apps.messages.models import Conversation, Message
+from apps.notifications.models import Notification
+from apps.resumes.models import Resume
+from apps.resumes.synthetic import (
+    COMPANIES, DEGREES, INSTITUTIONS, ROLES, SKILLS, generate_resume_text,
+)
+
+
+# Every seeded user has an address on this domain, so reruns can find them
+SEED_DOMAIN = 'seed.hiresight.test'
+
+INDUSTRIES = ['Software', 'Finance', 'Healthcare', 'Retail', 'Logistics', 'Education', 'Energy']
+CITIES = ['Lagos', 'London', 'Toronto', 'Berlin', 'Nairobi', 'San Francisco', 'Tokyo', 'Remote']
+NOTIFICATION_MESSAGES = [
+    'Your resume was viewed by a recruiter.',
+    'A new job matches your profile.',
+    'You have a new follower.',
+    'Your application status changed.',
+    'You have a new message.',
+]
+
+
+def _batched(iterable, size):
+    """Yield lists of at most ``size`` items."""
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed production-like data volumes (users with profiles, resumes, follows, '
+        'conversations, messages, notifications) with bulk inserts.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10000, help='Users to create.')
+        parser.add_argument('--company-ratio', type=float, default=0.1, help='Share of company accounts.')
+        parser.add_argument(
+            '--resumes-per-user',
+            type=int,
+            default=2,
+            choices=[0, 1, 2],
+            help='Resumes per personal account (Resume allows one primary and one other per user).',
+        )
+        parser.add_argument('--follows-per-user', type=int, default=10, help='Accounts each user follows.')
+        parser.add_argument('--conversations', type=int, default=None, help='Conversations (default: users / 2).')
+        parser.add_argument('--messages-per-conversation', type=int, default=8, help='Messages per conversation.')
+        parser.add_argument('--notifications-per-user', type=int, default=10, help='Notifications per user.')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk insert.')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed.')
+        parser.add_argument('--flush', action='store_true', help='Delete previously seeded users first.')
+
+    def handle(self, *args, **options):
+        if options['users'] < 2:
+            raise CommandError('--users must be at least 2.')
+
+        seeded = User.objects.filter(email__endswith=f'@{SEED_DOMAIN}')
+        if seeded.exists():
+            if not options['flush']:
+                raise CommandError('Seeded users already exist; rerun with --flush to replace them.')
+            self._phase('Deleting previous seed data', lambda: seeded.delete()[0])
+
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+
+        start = time.perf_counter()
+        personal, companies = self._phase('Users and profiles', lambda: self._create_users(options))
+        everyone = personal + companies
+        self._phase('Resumes', lambda: self._create_resumes(personal, options['resumes_per_user']))
+        self._phase('Follows', lambda: self._create_follows(everyone, options['follows_per_user']))
+        conversations = options['conversations']
+        if conversations is None:
+            conversations = len(everyone) // 2
+        self._phase(
+            'Conversations and messages',
+            lambda: self._create_conversations(everyone, conversations, options['messages_per_conversation']),
+        )
+        self._phase('Notifications', lambda: self._create_notifications(everyone, options['notifications_per_user']))
+
+        self.stdout.write(self.style.SUCCESS(f'Seeded in {time.perf_counter() - start:.1f}s'))
+
+    def _phase(self, label, action):
+        """Run one seeding step and report its row count and duration."""
+        self.stdout.write(f'{label}...', ending='')
+        self.stdout.flush()
+        start = time.perf_counter()
+        result = action()
+        rows = result if isinstance(result, int) else sum(len(part) for part in result)
+        self.stdout.write(f' {rows} rows in {time.perf_counter() - start:.1f}s')
+        return result
+
+    def _bulk_insert(self, model, objects, **kwargs):
+        """Insert ``objects`` in batches, one transaction per batch."""
+        count = 0
+        for batch in _batched(objects, self.batch_size):
+            with transaction.atomic():
+                model.objects.bulk_create(batch, batch_size=self.batch_size, **kwargs)
+            count += len(batch)
+        return count
+
+    def _create_users(self, options):
+        """Create users plus their profiles; bulk_create skips the post_save profile signals."""
+        rng = self.rng
+        total = options['users']
+        company_count = max(1, int(total * options['company_ratio']))
+        # One hash for everyone: hashing per user would dominate the run
+        password = make_password('seed-password')
+
+        personal, companies = [], []
+
+        def users():
+            for number in range(total):
+                account_type = 'company' if number < company_count else 'personal'
+                user_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+                (companies if account_type == 'company' else personal).append(user_id)
+                yield User(
+                    id=user_id,
+                    email=f'user{number}@{SEED_DOMAIN}',
+                    password=password,
+                    account_type=account_type,
+                    is_verified=True,
+                )
+
+        self._bulk_insert(User, users())
+
+        def personal_profiles():
+            for user_id in personal:
+                yield PersonalProfile(
+                    id=uuid.UUID(int=rng.getrandbits(128), version=4),
+                    user_id=user_id,
+                    full_name=f'Seed User {user_id.hex[:8]}',
+                    headline=rng.choice(ROLES),
+                    location=rng.choice(CITIES),
+                    skills=rng.sample(SKILLS, rng.randint(3, 10)),
+                    profile_visibility=rng.choice(['public', 'public', 'verified_companies', 'private']),
+                )
+
+        def company_profiles():
+            for user_id in companies:
+                yield CompanyProfile(
+                    id=uuid.UUID(int=rng.getrandbits(128), version=4),
+                    user_id=user_id,
+                    company_name=f'{rng.choice(COMPANIES)} {user_id.hex[:6]}',
+                    industry=rng.choice(INDUSTRIES),
+                    locations=rng.sample(CITIES, 2),
+                )
+
+        self._bulk_insert(PersonalProfile, personal_profiles())
+        self._bulk_insert(CompanyProfile, company_profiles())
+        return personal, companies
+
+    def _create_resumes(self, personal, per_user):
+        rng = self.rng
+
+        def resumes():
+            for user_id in personal:
+                for number in range(per_user):
+                    text = generate_resume_text(rng)
+                    yield Resume(
+                        user_id=user_id,
+                        title=f'{rng.choice(ROLES)} Resume',
+                        file=f'resumes/{user_id}/seed-{number}.pdf',
+                        file_size=rng.randint(40_000, 400_000),
+                        original_filename=f'resume-{number}.pdf',
+                        status='parsed',
+                        is_primary=number == 0,
+                        parsed_text=text,
+                        skills=rng.sample(SKILLS, rng.randint(4, 12)),
+                        experience_years=round(rng.uniform(0, 20), 1),
+                        education=[{
+                            'degree': rng.choice(DEGREES),
+                            'institution': rng.choice(INSTITUTIONS),
+                            'year': str(rng.randint(1995, 2022)),
+                        }],
+                        contact_info={'email': f'{user_id.hex[:10]}@example.com'},
+                    )
+
+        return self._bulk_insert(Resume, resumes())
+
+    def _create_follows(self, everyone, per_user):
+        rng = self.rng
+        per_user = min(per_user, len(everyone) - 1)
+
+        def follows():
+            for index, follower in enumerate(everyone):
+                targets = set()
+                while len(targets) < per_user:
+                    target = rng.randrange(len(everyone))
+                    if target != index:
+                        targets.add(target)
+                for target in targets:
+                    yield Follow(follower_id=follower, followed_id=everyone[target])
+
+        return self._bulk_insert(Follow, follows())
+
+    def _create_conversations(self, everyone, count, messages_per_conversation):
+        rng = self.rng
+        Participant = Conversation.participants.through
+        rows = 0
+
+        for batch_start in range(0, count, self.batch_size):
+            size = min(self.batch_size, count - batch_start)
+            with transaction.atomic():
+                # Primary keys are returned by bulk_create (PostgreSQL, SQLite 3.35+)
+                conversations = Conversation.objects.bulk_create([Conversation() for _ in range(size)])
+                pairs = [rng.sample(everyone, 2) for _ in conversations]
+                Participant.objects.bulk_create(
+                    [
+                        Participant(conversation_id=conversation.pk, user_id=user_id)
+                        for conversation, pair in zip(conversations, pairs)
+                        for user_id in pair
+                    ],
+                    batch_size=self.batch_size,
+                )
+                Message.objects.bulk_create(
+                    (
+                        Message(
+                            conversation_id=conversation.pk,
+                            sender_id=rng.choice(pair),
+                            content=f'Seed message {number} in conversation {conversation.pk}.',
+                        )
+                        for conversation, pair in zip(conversations, pairs)
+                        for number in range(messages_per_conversation)
+                    ),
+                    batch_size=self.batch_size,
+                )
+            rows += size * (3 + messages_per_conversation)
+        return rows
+
+    def _create_notifications(self, everyone, per_user):
+        rng = self.rng
+
+        def notifications():
+            for user_id in everyone:
+                for _ in range(per_user):
+                    yield Notification(
+                        user_id=user_id,
+                        message=rng.choice(NOTIFICATION_MESSAGES),
+                        is_read=rng.random() < 0.7,
+                    )
+
+        return self._bulk_insert(Notification, notifications())
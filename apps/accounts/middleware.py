@@ -0,0 +1,70 @@
+"""
+Authentication middleware that caches the logged-in user per session.
+
+The user (with its profile, see ``ProfileModelBackend``) is pickled into the
+cache under the session key, tagged with a per-user version. Saving the user
+or either profile replaces the version, so every session's cached copy goes
+stale at once and is reloaded on its next request.
+"""
+import uuid
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+
+
+def _user_key(session_key):
+    return f'auth:user:{session_key}'
+
+
+def _version_key(user_id):
+    return f'auth:user_version:{user_id}'
+
+
+def invalidate_user(user_id):
+    """Make every cached copy of the user stale."""
+    cache.set(_version_key(user_id), uuid.uuid4().hex, None)
+
+
+def _is_valid(user, session):
+    """The checks ``auth.get_user`` makes against the session, minus the query."""
+    if session.get(BACKEND_SESSION_KEY) not in settings.AUTHENTICATION_BACKENDS:
+        return False
+    session_hash = session.get(HASH_SESSION_KEY)
+    return bool(session_hash) and constant_time_compare(session_hash, user.get_session_auth_hash())
+
+
+def get_cached_user(request):
+    session = request.session
+    user_id = session.get(SESSION_KEY)
+    if user_id is None or session.session_key is None:
+        return auth.get_user(request)
+
+    user_key = _user_key(session.session_key)
+    version_key = _version_key(user_id)
+    cached = cache.get_many([user_key, version_key])
+    version = cached.get(version_key)
+    entry = cached.get(user_key)
+    if version is not None and entry is not None and entry[0] == version and _is_valid(entry[1], session):
+        return entry[1]
+
+    # Read the version before loading, so a save racing with the load
+    # leaves this copy tagged with the old version
+    if version is None:
+        cache.add(version_key, uuid.uuid4().hex, None)
+        version = cache.get(version_key)
+    user = auth.get_user(request)
+    if user.is_authenticated:
+        cache.set(user_key, (version, user), settings.AUTH_USER_CACHE_TTL)
+    return user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """``AuthenticationMiddleware`` whose ``request.user`` comes from the cache when current."""
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_cached_user(request))
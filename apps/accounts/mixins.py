@@ -0,0 +1,88 @@
+import json
+from django.db import models
+
+
+# Never equal to anything, so an unserializable JSON value always counts as changed
+_UNSERIALIZABLE = object()
+
+
+class DirtyFieldsMixin(models.Model):
+    """
+    Track field changes since a model instance was loaded or last saved.
+
+    ``save()`` on an existing row writes only the changed columns (plus any
+    ``auto_now`` fields) via ``update_fields``, and does nothing at all when
+    no field changed. Passing ``update_fields`` explicitly, or saving a new
+    instance, behaves exactly like ``Model.save()``.
+    """
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot()
+        return instance
+
+    def _tracked_value(self, field):
+        value = getattr(self, field.attname)
+        if isinstance(field, models.FileField):
+            return value.name
+        if isinstance(field, models.JSONField):
+            # Lists and dicts can be changed in place, so keep their
+            # serialized form: far cheaper than a deep copy on every load
+            try:
+                return json.dumps(value, cls=field.encoder)
+            except (TypeError, ValueError):
+                return _UNSERIALIZABLE
+        return value
+
+    def _snapshot(self, fields=None):
+        """Record current values of loaded (non-deferred) fields."""
+        loaded = self.__dict__.setdefault('_loaded_values', {})
+        for field in self._meta.concrete_fields:
+            if field.attname in self.__dict__ and (fields is None or field.attname in fields or field.name in fields):
+                loaded[field.attname] = self._tracked_value(field)
+
+    def get_dirty_fields(self):
+        """
+        Names of fields whose value differs from the last load or save.
+
+        A deferred field that was assigned without being loaded first has
+        no recorded value and always counts as changed.
+        """
+        loaded = self.__dict__.get('_loaded_values', {})
+        return [
+            field.name
+            for field in self._meta.concrete_fields
+            if not field.primary_key
+            and field.attname in self.__dict__
+            and (field.attname not in loaded or self._tracked_value(field) != loaded[field.attname])
+        ]
+
+    def is_dirty(self):
+        return bool(self.get_dirty_fields())
+
+    def save(self, *args, **kwargs):
+        if (
+            not self._state.adding
+            and kwargs.get('update_fields') is None
+            and not kwargs.get('force_insert')
+            and '_loaded_values' in self.__dict__
+        ):
+            dirty = self.get_dirty_fields()
+            if not dirty:
+                return
+            auto_now = [
+                field.name for field in self._meta.concrete_fields
+                if getattr(field, 'auto_now', False) and field.name not in dirty
+            ]
+            kwargs['update_fields'] = dirty + auto_now
+
+        super().save(*args, **kwargs)
+        self._snapshot(kwargs.get('update_fields'))
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._snapshot(kwargs.get('fields'))
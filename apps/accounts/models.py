@@ -4,6 +4,8 @@ from django.utils import timezone
 from django.core.validators import MinLengthValidator, EmailValidator
 import uuid
 
+from .mixins import DirtyFieldsMixin
+
 
 class UserManager(BaseUserManager):
     """Custom user manager for email-based authentication."""
@@ -34,7 +36,7 @@ class UserManager(BaseUserManager):
         return self.create_user(email, password, **extra_fields)
 
 
-class User(AbstractBaseUser, PermissionsMixin):
+class User(DirtyFieldsMixin, AbstractBaseUser, PermissionsMixin):
     """Custom user model with email authentication and account type."""
     
     ACCOUNT_TYPE_CHOICES = [
@@ -105,7 +107,7 @@ class User(AbstractBaseUser, PermissionsMixin):
         return None
 
 
-class PersonalProfile(models.Model):
+class PersonalProfile(DirtyFieldsMixin, models.Model):
     """Profile for personal (job seeker) accounts."""
     
     PROFILE_VISIBILITY_CHOICES = [
@@ -245,7 +247,7 @@ class PersonalProfile(models.Model):
         return [skill.get('skill', '') for skill in self.skills[:limit]]
 
 
-class CompanyProfile(models.Model):
+class CompanyProfile(DirtyFieldsMixin, models.Model):
     """Profile for company (recruiter) accounts."""
     
     COMPANY_SIZE_CHOICES = [
@@ -0,0 +1,62 @@
+"""
+Session engine that keeps sessions in the Redis cache.
+
+With SESSION_DB_WRITE_THROUGH every save also goes to ``django_session`` so
+sessions survive a cache flush. Either way a session is re-saved (pushing its
+expiry forward) at most once per SESSION_REFRESH_INTERVAL seconds rather than
+on every request, so SESSION_SAVE_EVERY_REQUEST should stay off.
+"""
+import time
+from django.conf import settings
+from django.contrib.sessions.backends import cache, cached_db
+
+
+# Session key holding the time of the last save
+REFRESHED_AT_KEY = '_refreshed_at'
+
+
+class RefreshMixin:
+    """Mark a loaded session as modified once its last save is older than the interval."""
+
+    @property
+    def key_salt(self):
+        # Sign like Django's own SessionStore classes, so django_session rows
+        # stay readable by Session.get_decoded() and the stock db engine
+        return 'django.contrib.sessions.SessionStore'
+
+    def _check_refresh(self, data):
+        refreshed_at = data.get(REFRESHED_AT_KEY)
+        if data and (
+            refreshed_at is None
+            or time.time() - refreshed_at >= settings.SESSION_REFRESH_INTERVAL
+        ):
+            self.modified = True
+        return data
+
+    def _stamp(self, must_create):
+        self._get_session(no_load=must_create)[REFRESHED_AT_KEY] = int(time.time())
+
+    def load(self):
+        return self._check_refresh(super().load())
+
+    async def aload(self):
+        return self._check_refresh(await super().aload())
+
+    def save(self, must_create=False):
+        self._stamp(must_create)
+        super().save(must_create=must_create)
+
+    async def asave(self, must_create=False):
+        self._stamp(must_create)
+        await super().asave(must_create=must_create)
+
+
+class CacheSessionStore(RefreshMixin, cache.SessionStore):
+    """Sessions in the cache only."""
+
+
+class WriteThroughSessionStore(RefreshMixin, cached_db.SessionStore):
+    """Sessions in the cache, written through to the database."""
+
+
+SessionStore = WriteThroughSessionStore if settings.SESSION_DB_WRITE_THROUGH else CacheSessionStore
@@ -1,5 +1,7 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
+from .middleware import invalidate_user
 from .models import User, PersonalProfile, CompanyProfile
 
 
@@ -23,12 +25,14 @@ def create_user_profile(sender, instance, created, **kwargs):
             )
 
 
-@receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
-    """
-    Save the profile when user is saved.
-    """
-    if instance.account_type == 'personal' and hasattr(instance, 'personal_profile'):
-        instance.personal_profile.save()
-    elif instance.account_type == 'company' and hasattr(instance, 'company_profile'):
-        instance.company_profile.save()
\ No newline at end of file
+@receiver([post_save, post_delete], sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """Drop cached copies of the user once the change is committed."""
+    transaction.on_commit(lambda: invalidate_user(instance.pk))
+
+
+@receiver([post_save, post_delete], sender=PersonalProfile)
+@receiver([post_save, post_delete], sender=CompanyProfile)
+def invalidate_cached_profile_user(sender, instance, **kwargs):
+    """Cached users carry their profile, so a profile change invalidates the user."""
+    transaction.on_commit(lambda: invalidate_user(instance.user_id))
@@ -1,4 +1,3 @@
-from django.http import JsonResponse
 from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
@@ -532,52 +531,7 @@ def ratelimit_view(request, exception):
 def health_check(request):
     """
     Health check endpoint for monitoring.
-    Returns JSON with system status.
+    Kept for existing monitors; same response as the /readyz probe.
     """
-    from django.db import connection
-    from django.core.cache import cache
-    import psutil
-    import json
-    from datetime import datetime
-
-    health_data = {
-        'status': 'healthy',
-        'timestamp': datetime.utcnow().isoformat(),
-        'checks': {}
-    }
-
-    # Database check
-    try:
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT 1")
-        health_data['checks']['database'] = 'healthy'
-    except Exception as e:
-        health_data['checks']['database'] = f'unhealthy: {str(e)}'
-        health_data['status'] = 'unhealthy'
-
-    # Cache check
-    try:
-        cache.set('health_check', 'ok', 10)
-        cache_value = cache.get('health_check')
-        if cache_value == 'ok':
-            health_data['checks']['cache'] = 'healthy'
-        else:
-            health_data['checks']['cache'] = 'unhealthy: cache not working'
-            health_data['status'] = 'unhealthy'
-    except Exception as e:
-        health_data['checks']['cache'] = f'unhealthy: {str(e)}'
-        health_data['status'] = 'unhealthy'
-
-    # System resources
-    try:
-        health_data['system'] = {
-            'cpu_percent': psutil.cpu_percent(interval=1),
-            'memory_percent': psutil.virtual_memory().percent,
-            'disk_percent': psutil.disk_usage('/').percent,
-        }
-    except ImportError:
-        health_data['system'] = {'note': 'psutil not available'}
-
-    status_code = 200 if health_data['status'] == 'healthy' else 503
-
-    return JsonResponse(health_data, status=status_code)
\ No newline at end of file
+    from apps.monitoring.views import readyz
+    return readyz(request)
\ No newline at end of file
@@ -20,11 +20,15 @@ def unfollow_user(request, user_id):
 
 @login_required
 def following_list(request):
-    following = Follow.objects.filter(follower=request.user).select_related('followed')
+    following = Follow.objects.filter(follower=request.user).select_related(
+        'followed__personal_profile', 'followed__company_profile'
+    )
     return render(request, 'following/following_list.html', {'following': following})
 
 
 @login_required
 def followers_list(request):
-    followers = Follow.objects.filter(followed=request.user).select_related('follower')
+    followers = Follow.objects.filter(followed=request.user).select_related(
+        'follower__personal_profile', 'follower__company_profile'
+    )
     return render(request, 'following/followers_list.html', {'followers': followers})
\ No newline at end of file
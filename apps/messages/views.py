@@ -3,11 +3,12 @@ from .models import Conversation, Message
 
 
 def inbox(request):
-    conversations = Conversation.objects.filter(participants=request.user)
+    # Conversation.__str__ lists participants; prefetch them in one query
+    conversations = Conversation.objects.filter(participants=request.user).prefetch_related('participants')
     return render(request, 'messages/inbox.html', {'conversations': conversations})
 
 
 def conversation_detail(request, pk):
     conversation = get_object_or_404(Conversation, pk=pk, participants=request.user)
-    messages = Message.objects.filter(conversation=conversation).order_by('timestamp')
+    messages = Message.objects.filter(conversation=conversation).select_related('sender').order_by('timestamp')
     return render(request, 'messages/conversation.html', {'conversation': conversation, 'messages': messages})
\ No newline at end of file
@@ -0,0 +1,24 @@
+from django.core.cache.backends.redis import RedisCache
+
+from .metrics import record_cache_lookup
+
+
+_missing = object()
+
+
+class InstrumentedRedisCache(RedisCache):
+    """RedisCache that counts hits and misses for the metrics endpoint."""
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _missing, version)
+        if value is _missing:
+            record_cache_lookup(0, 1)
+            return default
+        record_cache_lookup(1, 0)
+        return value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        values = super().get_many(keys, version)
+        record_cache_lookup(len(values), len(keys) - len(values))
+        return values
@@ -0,0 +1,96 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from typing import Callable, Dict
+
+
+# One thread per dependency: a hung check occupies only its own thread,
+# and is not resubmitted until it returns
+_executors = {
+    'database': ThreadPoolExecutor(max_workers=1, thread_name_prefix='health-database'),
+    'cache': ThreadPoolExecutor(max_workers=1, thread_name_prefix='health-cache'),
+}
+_pending = {}
+_results: Dict[str, tuple] = {}
+# Checks some probe is currently re-running; others serve the old result
+_refreshing = set()
+_lock = threading.Lock()
+
+
+def _check_database():
+    from django.db import connection
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except Exception:
+        # Reconnect on the next check instead of reusing a broken connection
+        connection.close()
+        raise
+
+
+def _check_cache():
+    from django.core.cache import cache
+
+    cache.set('health_check', 'ok', 10)
+    if cache.get('health_check') != 'ok':
+        raise RuntimeError('cache not working')
+
+
+CHECKS: Dict[str, Callable[[], None]] = {
+    'database': _check_database,
+    'cache': _check_cache,
+}
+
+
+def _run_check(name: str, timeout: float) -> str:
+    """Run one check in its own thread, waiting at most ``timeout`` seconds."""
+    future = _pending.get(name)
+    if future is None or future.done():
+        future = _executors[name].submit(CHECKS[name])
+        _pending[name] = future
+
+    try:
+        future.result(timeout=timeout)
+    except TimeoutError:
+        return f'unhealthy: no response within {timeout}s'
+    except Exception as e:
+        return f'unhealthy: {e}'
+    return 'healthy'
+
+
+def dependency_checks() -> Dict[str, str]:
+    """
+    Return the status of each dependency.
+
+    Results are reused for HEALTH_CHECK_CACHE_TTL seconds, so frequent
+    probes from load balancers and monitors cost a dict lookup. When a
+    result expires, one probe re-runs the check (outside the lock) while
+    concurrent probes keep serving the previous result.
+    """
+    from django.conf import settings
+
+    now = time.monotonic()
+    statuses = {}
+    refresh = []
+    with _lock:
+        for name in CHECKS:
+            cached = _results.get(name)
+            if (cached is None or now - cached[0] > settings.HEALTH_CHECK_CACHE_TTL) and name not in _refreshing:
+                _refreshing.add(name)
+                refresh.append(name)
+            elif cached is not None:
+                statuses[name] = cached[1]
+
+    for name in refresh:
+        status = 'unhealthy: check failed'
+        try:
+            status = _run_check(name, settings.HEALTH_CHECK_TIMEOUT)
+        finally:
+            with _lock:
+                _results[name] = (time.monotonic(), status)
+                _refreshing.discard(name)
+        statuses[name] = status
+
+    # A check with no result yet is being run for the first time by another probe
+    return {name: statuses.get(name, 'unknown: first check in progress') for name in CHECKS}
@@ -0,0 +1,156 @@
+"""
+Non-blocking logging.
+
+Handlers here put records on a bounded in-memory queue; a listener thread
+formats and writes them. The request thread pays for one ``put_nowait``;
+when the queue is full records are dropped and counted instead of
+blocking, and the count is logged once the queue drains.
+"""
+import atexit
+import copy
+import contextvars
+import json
+import logging
+import os
+import queue
+import weakref
+from datetime import datetime, timezone
+from logging.handlers import QueueListener, RotatingFileHandler
+
+
+request_id_var = contextvars.ContextVar('request_id', default='-')
+
+_handlers = weakref.WeakSet()
+
+
+class RequestIDFilter(logging.Filter):
+    """Stamp records with the current request's ID (``-`` outside requests)."""
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line."""
+
+    def format(self, record):
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'module': record.module,
+            'process': record.process,
+            'thread': record.thread,
+            'request_id': getattr(record, 'request_id', '-'),
+        }
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        elif record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class AsyncRotatingFileHandler(logging.Handler):
+    """
+    Size-rotated log file written by a background listener thread.
+
+    Accepts the same file arguments as ``RotatingFileHandler`` plus
+    ``queue_size``, the most records buffered before new ones are dropped.
+
+    This is deliberately not a ``QueueHandler`` subclass: since Python 3.12
+    ``dictConfig`` configures those itself (``queue``/``listener``/
+    ``handlers`` keys) and would not pass the file arguments through.
+    """
+
+    def __init__(self, filename, maxBytes=0, backupCount=0, encoding=None, queue_size=10000):
+        super().__init__()
+        self.queue_size = queue_size
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self._reported_dropped = 0
+        self.target = RotatingFileHandler(
+            filename, maxBytes=maxBytes, backupCount=backupCount, encoding=encoding, delay=True,
+        )
+        self.listener = None
+        self._start_listener()
+        _handlers.add(self)
+
+    def _start_listener(self):
+        self.listener = QueueListener(self.queue, self.target)
+        self.listener.start()
+
+    def _after_fork(self):
+        # The listener thread does not survive fork (e.g. gunicorn's
+        # preloaded master -> workers); give the child its own queue and thread
+        if self.listener is None:
+            return
+        self.queue = queue.Queue(maxsize=self.queue_size)
+        self.dropped = self._reported_dropped = 0
+        self._start_listener()
+
+    def setFormatter(self, fmt):
+        # Formatting happens on the listener thread, not the caller's
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        """Freeze the message now; the rest of formatting is left to the listener."""
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def emit(self, record):
+        try:
+            self.enqueue(self.prepare(record))
+        except Exception:
+            self.handleError(record)
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return
+
+        if self.dropped > self._reported_dropped:
+            lost = self.dropped - self._reported_dropped
+            self._reported_dropped = self.dropped
+            notice = logging.LogRecord(
+                record.name, logging.WARNING, __file__, 0,
+                '%d log records dropped: logging queue was full', (lost,), None,
+            )
+            notice.request_id = getattr(record, 'request_id', '-')
+            try:
+                self.queue.put_nowait(notice)
+            except queue.Full:
+                pass
+
+    def close(self):
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+        self.target.close()
+        super().close()
+
+
+def _restart_listeners():
+    for handler in list(_handlers):
+        handler._after_fork()
+
+
+def _stop_listeners():
+    """Flush queued records at interpreter exit."""
+    for handler in list(_handlers):
+        if handler.listener is not None:
+            handler.listener.stop()
+            handler.listener = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_listeners)
+atexit.register(_stop_listeners)
@@ -0,0 +1,84 @@
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# Run in a fresh interpreter so nothing is already imported
+STARTUP_SCRIPT = """
+import time
+start = time.perf_counter()
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(f"STARTUP_MS={(time.perf_counter() - start) * 1000:.1f}")
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        'Fail when django.setup() plus URLconf loading exceeds the import-time '
+        'budget, listing the heaviest imports from `python -X importtime`.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--budget',
+            type=int,
+            default=settings.IMPORT_TIME_BUDGET_MS,
+            help='Budget in milliseconds (default: IMPORT_TIME_BUDGET_MS).',
+        )
+        parser.add_argument('--top', type=int, default=15, help='Number of offenders to list.')
+
+    def handle(self, *args, **options):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'hiresight.settings'))
+        process = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', STARTUP_SCRIPT],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if process.returncode != 0:
+            raise CommandError(f'Startup failed:\n{process.stderr[-2000:]}')
+
+        startup_ms = float(process.stdout.strip().rsplit('STARTUP_MS=', 1)[-1])
+        packages, modules = self._parse_importtime(process.stderr)
+
+        self.stdout.write(f'Top {options["top"]} packages by self import time:')
+        for name, micros in sorted(packages.items(), key=lambda item: -item[1])[:options['top']]:
+            self.stdout.write(f'  {micros / 1000:>9.1f} ms  {name}')
+
+        self.stdout.write(f'\nTop {options["top"]} modules by cumulative import time:')
+        for name, micros in sorted(modules.items(), key=lambda item: -item[1])[:options['top']]:
+            self.stdout.write(f'  {micros / 1000:>9.1f} ms  {name}')
+
+        self.stdout.write(f'\nStartup: {startup_ms:.0f} ms (budget {options["budget"]} ms)')
+        if startup_ms > options['budget']:
+            raise CommandError(
+                f'Import-time budget exceeded by {startup_ms - options["budget"]:.0f} ms. '
+                f'Import heavy libraries inside the code paths that need them.'
+            )
+        self.stdout.write(self.style.SUCCESS('Import-time budget OK'))
+
+    def _parse_importtime(self, output):
+        """
+        Parse ``-X importtime`` lines
+        (``import time: <self us> | <cumulative us> | <indented module>``).
+
+        Returns self time summed per top-level package, and the cumulative
+        time of each module.
+        """
+        packages = defaultdict(int)
+        modules = {}
+        for line in output.splitlines():
+            if not line.startswith('import time:') or 'imported package' in line:
+                continue
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            name = name.strip()
+            packages[name.split('.')[0]] += int(self_us)
+            modules[name] = int(cumulative_us)
+        return packages, modules
@@ -0,0 +1,151 @@
+import gc
+import os
+import threading
+import tracemalloc
+from collections import deque
+from typing import Dict, List, Optional
+
+
+# Allocation sites are attributed to the innermost traceback frame that
+# matches one of these path fragments, in this order
+ALLOCATION_GROUPS = [
+    ('apps.resumes.parsers', ('apps/resumes/parsers.py', 'apps/resumes/components.py', 'apps/resumes/sections.py')),
+    ('caches', (
+        'apps/resumes/nlp.py', 'apps/screening/embeddings.py', 'apps/monitoring/slow_queries.py',
+        'django/core/cache/', 'functools.py',
+    )),
+    ('querysets', ('django/db/models/', 'django/db/backends/')),
+    ('spacy', ('/spacy/', '/thinc/', '/srsly/')),
+    ('pymupdf', ('/fitz/', '/pymupdf/')),
+    ('docx', ('/docx/', '/lxml/')),
+    ('torch', ('/torch/', '/sentence_transformers/', '/transformers/')),
+    ('apps', ('/apps/',)),
+]
+
+MAX_SNAPSHOTS = 5
+
+_snapshots = deque(maxlen=MAX_SNAPSHOTS)
+_lock = threading.Lock()
+
+
+def _group(traceback) -> str:
+    # Traceback frames run oldest first; attribute to the innermost match
+    for frame in reversed(traceback):
+        filename = frame.filename.replace(os.sep, '/')
+        for group, fragments in ALLOCATION_GROUPS:
+            if any(fragment in filename for fragment in fragments):
+                return group
+    return 'other'
+
+
+def start(frames: int = 10) -> None:
+    """Start tracing allocations, keeping ``frames`` frames per allocation."""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+
+
+def stop() -> None:
+    """Stop tracing and drop the stored snapshots (and their memory)."""
+    with _lock:
+        _snapshots.clear()
+    tracemalloc.stop()
+
+
+def take_snapshot() -> int:
+    """Store a snapshot of current allocations and return its number."""
+    if not tracemalloc.is_tracing():
+        raise RuntimeError('tracemalloc is not running')
+    snapshot = tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        tracemalloc.Filter(False, '<unknown>'),
+    ])
+    with _lock:
+        number = (_snapshots[-1][0] + 1) if _snapshots else 1
+        _snapshots.append((number, snapshot))
+    return number
+
+
+def _stats_by_group(stats) -> List[Dict]:
+    groups: Dict[str, Dict] = {}
+    for stat in stats:
+        entry = groups.setdefault(_group(stat.traceback), {'size': 0, 'size_diff': 0, 'count': 0, 'count_diff': 0})
+        entry['size'] += stat.size
+        entry['count'] += stat.count
+        entry['size_diff'] += getattr(stat, 'size_diff', stat.size)
+        entry['count_diff'] += getattr(stat, 'count_diff', stat.count)
+    return sorted(
+        ({'group': group, **values} for group, values in groups.items()),
+        key=lambda entry: -abs(entry['size_diff']),
+    )
+
+
+def _top_sites(stats, limit: int) -> List[Dict]:
+    sites = []
+    for stat in stats[:limit]:
+        frame = stat.traceback[-1]
+        sites.append({
+            'site': f'{frame.filename}:{frame.lineno}',
+            'group': _group(stat.traceback),
+            'size': stat.size,
+            'size_diff': getattr(stat, 'size_diff', stat.size),
+            'count': stat.count,
+        })
+    return sites
+
+
+def report(limit: int = 20) -> Dict:
+    """
+    Tracing status, ``gc`` generation stats and, when snapshots exist, the
+    top allocation sites and per-group totals.
+
+    With two or more snapshots the last two are diffed to show growth;
+    with one, its absolute sizes are shown.
+    """
+    current, peak = tracemalloc.get_traced_memory()
+    data = {
+        'pid': os.getpid(),
+        'tracing': tracemalloc.is_tracing(),
+        'traced_current': current,
+        'traced_peak': peak,
+        'snapshots': [number for number, _snapshot in _snapshots],
+        'gc': {
+            'counts': gc.get_count(),
+            'thresholds': gc.get_threshold(),
+            'generations': gc.get_stats(),
+            'frozen': gc.get_freeze_count(),
+            'garbage': len(gc.garbage),
+        },
+    }
+
+    with _lock:
+        snapshots = list(_snapshots)
+    if not snapshots:
+        return data
+
+    newest_number, newest = snapshots[-1]
+    if len(snapshots) > 1:
+        oldest_number, oldest = snapshots[-2]
+        stats = newest.compare_to(oldest, 'traceback')
+        data['compared'] = [oldest_number, newest_number]
+    else:
+        stats = newest.statistics('traceback')
+        data['compared'] = [newest_number]
+
+    data['groups'] = _stats_by_group(stats)
+    data['top_sites'] = _top_sites(stats, limit)
+    return data
+
+
+def handle_action(action: str, frames: Optional[int] = None) -> None:
+    """Apply a diagnostics action posted to the endpoint."""
+    if action == 'start':
+        start(frames or 10)
+    elif action == 'stop':
+        stop()
+    elif action == 'snapshot':
+        take_snapshot()
+    elif action == 'collect':
+        gc.collect()
+    else:
+        raise ValueError(f'Unknown action "{action}"')
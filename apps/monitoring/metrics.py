@@ -0,0 +1,74 @@
+"""
+Prometheus metrics.
+
+Under gunicorn every worker has its own registry, so values are written
+to PROMETHEUS_MULTIPROC_DIR (set in ``gunicorn.conf.py``) and merged at
+scrape time by ``MultiProcessCollector``. Without that variable metrics
+live in the process's default registry.
+"""
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest,
+)
+
+
+REQUEST_LATENCY = Histogram(
+    'hiresight_request_duration_seconds',
+    'Request latency by resolved URL name.',
+    ['view', 'method', 'status'],
+)
+REQUEST_DB_QUERIES = Histogram(
+    'hiresight_request_db_queries',
+    'SQL queries issued per request.',
+    ['view'],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, float('inf')),
+)
+REQUEST_DB_SECONDS = Histogram(
+    'hiresight_request_db_seconds',
+    'Time spent in SQL per request.',
+    ['view'],
+)
+CACHE_REQUESTS = Counter(
+    'hiresight_cache_requests_total',
+    'Cache lookups by result.',
+    ['result'],
+)
+PARSE_STAGE_SECONDS = Histogram(
+    'hiresight_resume_parse_stage_seconds',
+    'Resume parser time per stage.',
+    ['stage'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, float('inf')),
+)
+
+
+@contextmanager
+def parse_stage(stage: str):
+    """Time a resume parser stage."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        PARSE_STAGE_SECONDS.labels(stage).observe(time.perf_counter() - start)
+
+
+def record_cache_lookup(hits: int, misses: int) -> None:
+    """Count cache hits and misses."""
+    if hits:
+        CACHE_REQUESTS.labels('hit').inc(hits)
+    if misses:
+        CACHE_REQUESTS.labels('miss').inc(misses)
+
+
+def render_metrics():
+    """Return ``(body, content_type)`` in the Prometheus text format."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
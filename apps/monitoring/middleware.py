@@ -0,0 +1,146 @@
+import random
+import re
+import time
+import uuid
+from contextlib import ExitStack
+from django.conf import settings
+from django.db import connections
+
+from .log_handlers import request_id_var
+from .metrics import REQUEST_DB_QUERIES, REQUEST_DB_SECONDS, REQUEST_LATENCY
+from .profiling import RequestProfile
+from .slow_queries import slow_query_logging
+
+
+REQUEST_ID_PATTERN = re.compile(r'^[\w.-]{1,64}$')
+
+# Methods recorded as-is; anything else is labelled 'other'
+HTTP_METHODS = {'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS', 'TRACE', 'CONNECT'}
+
+
+class RequestIDMiddleware:
+    """
+    Tag each request with an ID for log correlation.
+
+    Reuses a well-formed ``X-Request-ID`` from the proxy, otherwise
+    generates one, and echoes it in the response.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request_id = request.headers.get('X-Request-ID', '')
+        if not REQUEST_ID_PATTERN.match(request_id):
+            request_id = uuid.uuid4().hex
+        request.request_id = request_id
+
+        token = request_id_var.set(request_id)
+        try:
+            response = self.get_response(request)
+        finally:
+            request_id_var.reset(token)
+        response['X-Request-ID'] = request_id
+        return response
+
+
+class QueryCounter:
+    """``execute_wrapper`` that counts queries and their total duration."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+
+class MetricsMiddleware:
+    """
+    Record latency and SQL usage per request, labelled by URL name.
+
+    Also times each query for the slow-query log.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            stack.enter_context(slow_query_logging())
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        # Label by route name, never by raw path, to bound label cardinality
+        match = request.resolver_match
+        view = (match.view_name if match else None) or 'unresolved'
+        method = request.method if request.method in HTTP_METHODS else 'other'
+        REQUEST_LATENCY.labels(view, method, response.status_code).observe(elapsed)
+        REQUEST_DB_QUERIES.labels(view).observe(counter.count)
+        REQUEST_DB_SECONDS.labels(view).observe(counter.duration)
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    Profile selected requests: staff opt-in or random sampling.
+
+    Staff trigger a profile with the ``X-Profile: 1`` header or a
+    ``?_profile=1`` query parameter and get the profile's file name back in
+    ``X-Profile-File``. Other requests are picked at random with probability
+    ``PROFILING_SAMPLE_RATE`` and profiled silently. Untriggered requests pay
+    only for those checks. Must come after AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def _requested(self, request):
+        requested = request.headers.get('X-Profile') == '1' or request.GET.get('_profile') == '1'
+        return requested and request.user.is_staff
+
+    def __call__(self, request):
+        requested = self._requested(request)
+        rate = settings.PROFILING_SAMPLE_RATE
+        if not requested and not (rate and random.random() < rate):
+            return self.get_response(request)
+
+        profile = RequestProfile(settings.PROFILING_MODE, settings.PROFILING_INTERVAL)
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(profile.queries))
+            try:
+                profile.start()
+                response = self.get_response(request)
+            finally:
+                profile.stop()
+        elapsed = time.perf_counter() - start
+
+        match = request.resolver_match
+        view = (match.view_name if match else None) or 'unresolved'
+        path = profile.save(
+            settings.PROFILING_DIR,
+            label=re.sub(r'[^\w.-]+', '_', view),
+            keep=settings.PROFILING_KEEP,
+            meta={
+                'path': request.path,
+                'method': request.method,
+                'view': view,
+                'status': response.status_code,
+                'duration_ms': round(elapsed * 1000, 3),
+            },
+        )
+        if requested:
+            # Sampled profiles stay on disk; only staff who asked learn the file name
+            response['X-Profile-File'] = path.name
+        return response
@@ -0,0 +1,131 @@
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+
+class StackSampler(threading.Thread):
+    """
+    Sample one thread's call stack at a fixed interval.
+
+    The result is in the collapsed-stack format (``frame;frame;frame count``)
+    read by flamegraph.pl, speedscope and inferno.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(name='request-stack-sampler', daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{code.co_name} ({code.co_filename}:{frame.f_lineno})')
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def collapsed(self) -> str:
+        return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common())
+
+
+class QueryRecorder:
+    """``execute_wrapper`` keeping every SQL statement with its duration."""
+
+    def __init__(self):
+        self.queries: List[Dict] = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                'sql': sql,
+                'many': many,
+                'duration_ms': round((time.perf_counter() - start) * 1000, 3),
+            })
+
+
+class RequestProfile:
+    """Profile of one request, by stack sampling or cProfile."""
+
+    def __init__(self, mode: str, interval: float):
+        self.mode = mode
+        self.interval = interval
+        self.queries = QueryRecorder()
+        self._profiler = None
+        self._sampler = None
+
+    def start(self):
+        if self.mode == 'cprofile':
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Since Python 3.12 only one cProfile can be active per
+                # process; a request overlapping another is sampled instead
+                pass
+            else:
+                self._profiler = profiler
+                return
+
+        self._sampler = StackSampler(threading.get_ident(), self.interval)
+        self._sampler.start()
+
+    def stop(self):
+        if self._profiler is not None:
+            self._profiler.disable()
+        if self._sampler is not None:
+            self._sampler.stop()
+
+    def save(self, directory, label: str, keep: int, meta: Dict) -> Path:
+        """
+        Write the profile and its SQL log to ``directory``.
+
+        Only the newest ``keep`` profiles are kept.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        stem = f"{datetime.now():%Y%m%d-%H%M%S-%f}-{os.getpid()}-{label}"
+
+        if self._profiler is not None:
+            # Convert for flame graphs with e.g. flameprof or snakeviz
+            path = directory / f'{stem}.prof'
+            self._profiler.dump_stats(str(path))
+        else:
+            path = directory / f'{stem}.folded'
+            path.write_text(self._sampler.collapsed())
+
+        with open(directory / f'{stem}.json', 'w') as sidecar:
+            json.dump({**meta, 'queries': self.queries.queries}, sidecar, indent=2, default=str)
+
+        _rotate(directory, keep)
+        return path
+
+
+def _rotate(directory: Path, keep: int) -> None:
+    """Delete all but the newest ``keep`` profiles (and their SQL logs)."""
+    profiles = sorted(
+        (path for path in directory.iterdir() if path.suffix in ('.prof', '.folded')),
+        key=lambda path: path.name,
+    )
+    for path in profiles[:-keep] if keep else profiles:
+        path.unlink(missing_ok=True)
+        path.with_suffix('.json').unlink(missing_ok=True)
@@ -0,0 +1,80 @@
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class SystemSampler(threading.Thread):
+    """
+    Daemon thread that samples CPU, memory and disk usage in the background.
+
+    Probes read ``latest`` from memory instead of calling psutil, whose
+    ``cpu_percent(interval=1)`` blocks the caller for a full second.
+    """
+
+    def __init__(self, interval: float):
+        super().__init__(name='system-metrics-sampler', daemon=True)
+        self.interval = interval
+        self.latest: Dict[str, Optional[float]] = {
+            'cpu_percent': None,
+            'memory_percent': None,
+            'disk_percent': None,
+            'sampled_at': None,
+        }
+        self._stop_event = threading.Event()
+
+    def run(self):
+        try:
+            import psutil
+        except ImportError:
+            self.latest = {'note': 'psutil not available'}
+            return
+
+        # The first non-blocking call only primes psutil's CPU counters
+        psutil.cpu_percent(interval=None)
+        while not self._stop_event.wait(self.interval):
+            try:
+                # Replace the whole dict so readers never see a partial sample
+                self.latest = {
+                    'cpu_percent': psutil.cpu_percent(interval=None),
+                    'memory_percent': psutil.virtual_memory().percent,
+                    'disk_percent': psutil.disk_usage('/').percent,
+                    'sampled_at': time.time(),
+                }
+            except Exception:
+                logger.exception("System metrics sample failed")
+
+    def stop(self):
+        self._stop_event.set()
+
+
+_sampler: Optional[SystemSampler] = None
+_sampler_pid: Optional[int] = None
+_sampler_lock = threading.Lock()
+
+
+def start_sampler() -> SystemSampler:
+    """
+    Start this process's sampler if it is not running.
+
+    Threads do not survive fork, so a pre-fork master's sampler is
+    replaced by a fresh one in each worker.
+    """
+    global _sampler, _sampler_pid
+    from django.conf import settings
+
+    with _sampler_lock:
+        if _sampler is None or _sampler_pid != os.getpid():
+            _sampler = SystemSampler(settings.HEALTH_SAMPLE_INTERVAL)
+            _sampler_pid = os.getpid()
+            _sampler.start()
+        return _sampler
+
+
+def get_system_metrics() -> Dict:
+    """Latest background sample (values are None until the first one lands)."""
+    return dict(start_sampler().latest)
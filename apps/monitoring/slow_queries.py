@@ -0,0 +1,165 @@
+import inspect
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import connections
+from django.views import View
+
+
+logger = logging.getLogger('hiresight.slow_queries')
+
+LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+IN_LISTS = re.compile(r'\bIN \((?:(?:%s|\?), )*(?:%s|\?)\)', re.IGNORECASE)
+WHITESPACE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(sql: str) -> str:
+    """
+    Normalise SQL so repeated statements group together.
+
+    Inline literals become ``?`` and IN-lists of any length collapse to
+    ``IN (...)``. Django's parameterised SQL repeats verbatim, so results
+    are cached.
+    """
+    sql = LITERALS.sub('?', WHITESPACE.sub(' ', sql).strip())
+    return IN_LISTS.sub('IN (...)', sql)
+
+
+# Project code that only wraps the code issuing a query: this app's
+# middleware and execute wrappers, and every middleware's __call__
+WRAPPER_PATHS = ('apps/monitoring/',)
+WRAPPER_FUNCTIONS = {('middleware.py', '__call__')}
+
+
+def _view_site(view, base: str) -> Optional[str]:
+    """Return ``file:line in ViewClass`` for a class-based view instance."""
+    view_class = type(view)
+    try:
+        filename = inspect.getsourcefile(view_class)
+        line = inspect.getsourcelines(view_class)[1]
+    except (OSError, TypeError):
+        return f'{view_class.__module__} in {view_class.__qualname__}'
+    if filename.startswith(base):
+        filename = filename[len(base) + 1:]
+    return f'{filename}:{line} in {view_class.__qualname__}'
+
+
+def call_site() -> Optional[str]:
+    """
+    Return ``file:line in function`` of the innermost project frame.
+
+    Middleware and monitoring wrappers are skipped. When the query runs
+    inside Django's own code for a class-based view (``get_object()`` and
+    the like), the view class is reported instead.
+    """
+    base = str(settings.BASE_DIR)
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        relative = filename[len(base) + 1:].replace(os.sep, '/')
+        if (filename.startswith(base) and 'site-packages' not in filename
+                and not relative.startswith(WRAPPER_PATHS)
+                and (os.path.basename(filename), frame.f_code.co_name) not in WRAPPER_FUNCTIONS):
+            return f'{relative}:{frame.f_lineno} in {frame.f_code.co_name}'
+
+        view = frame.f_locals.get('self')
+        if isinstance(view, View):
+            return _view_site(view, base)
+        frame = frame.f_back
+    return None
+
+
+class QueryStats:
+    """Per-process totals by fingerprint, flushed as a periodic top-N report."""
+
+    def __init__(self):
+        self._stats: Dict[str, List] = {}
+        self._lock = threading.Lock()
+        self._last_report = time.monotonic()
+
+    def record(self, sql: str, duration: float, site: Optional[str]) -> None:
+        with self._lock:
+            entry = self._stats.get(sql)
+            if entry is None:
+                # count, total seconds, max seconds, slow count, last slow call site
+                entry = self._stats[sql] = [0, 0.0, 0.0, 0, None]
+            entry[0] += 1
+            entry[1] += duration
+            entry[2] = max(entry[2], duration)
+            if site is not None:
+                entry[3] += 1
+                entry[4] = site
+
+    def maybe_report(self) -> None:
+        """Log the report if SLOW_QUERY_REPORT_INTERVAL has passed."""
+        if time.monotonic() - self._last_report < settings.SLOW_QUERY_REPORT_INTERVAL:
+            return
+        with self._lock:
+            stats, self._stats = self._stats, {}
+            self._last_report = time.monotonic()
+        if stats:
+            logger.info(self.format_report(stats, settings.SLOW_QUERY_REPORT_TOP))
+
+    @staticmethod
+    def format_report(stats: Dict[str, List], top: int) -> str:
+        lines = [f'Top {top} queries by total time:']
+        ranked = sorted(stats.items(), key=lambda item: -item[1][1])[:top]
+        for rank, (sql, (count, total, longest, slow, site)) in enumerate(ranked, start=1):
+            lines.append(
+                f'{rank:>2}. total={total * 1000:.1f}ms count={count} '
+                f'avg={total / count * 1000:.2f}ms max={longest * 1000:.1f}ms slow={slow}'
+                f'{f" site={site}" if site else ""}\n    {sql}'
+            )
+        return '\n'.join(lines)
+
+
+query_stats = QueryStats()
+
+
+def slow_query_wrapper(execute, sql, params, many, context):
+    """
+    ``execute_wrapper`` timing every query.
+
+    Statements over SLOW_QUERY_THRESHOLD_MS are logged with their
+    fingerprint and the project code that issued them; parameter values
+    are never logged, only their count.
+    """
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - start
+        normalised = fingerprint(sql)
+        site = None
+        if duration * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+            site = call_site()
+            logger.warning(
+                'Slow query %.1fms at %s params=<%d redacted>%s: %s',
+                duration * 1000, site or 'unknown',
+                len(params) if params else 0, ' (executemany)' if many else '', normalised,
+            )
+        query_stats.record(normalised, duration, site)
+        query_stats.maybe_report()
+
+
+@contextmanager
+def slow_query_logging():
+    """
+    Time queries on every connection for the duration of the block.
+
+    Uses ``connection.execute_wrapper()`` so wrappers nest and unwind in
+    order even when the connection is first opened inside the block.
+    """
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(slow_query_wrapper))
+        yield
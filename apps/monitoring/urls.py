@@ -0,0 +1,11 @@
+from django.urls import path
+from . import views
+
+app_name = 'monitoring'
+
+urlpatterns = [
+    path('livez', views.livez, name='livez'),
+    path('readyz', views.readyz, name='readyz'),
+    path('metrics', views.metrics, name='metrics'),
+    path('diagnostics/memory', views.memory_diagnostics, name='memory_diagnostics'),
+]
@@ -0,0 +1,78 @@
+import hmac
+from datetime import datetime, timezone
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_http_methods
+
+from . import memory
+
+from .health import dependency_checks
+from .metrics import render_metrics
+from .sampler import get_system_metrics
+
+
+@never_cache
+def livez(request):
+    """Liveness probe: the process is up and serving requests."""
+    return JsonResponse({'status': 'alive'})
+
+
+@never_cache
+def readyz(request):
+    """
+    Readiness probe: database and cache reachable.
+
+    Dependency results are cached briefly and system metrics come from the
+    background sampler, so the probe never blocks a worker.
+    """
+    checks = dependency_checks()
+    healthy = all(status == 'healthy' for status in checks.values())
+    health_data = {
+        'status': 'healthy' if healthy else 'unhealthy',
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'checks': checks,
+        'system': get_system_metrics(),
+    }
+    return JsonResponse(health_data, status=200 if healthy else 503)
+
+
+def _metrics_authorized(request):
+    """Staff users, or scrapers sending ``Authorization: Bearer <METRICS_TOKEN>``."""
+    token = settings.METRICS_TOKEN
+    header = request.headers.get('Authorization', '')
+    if token and header.startswith('Bearer '):
+        return hmac.compare_digest(header[len('Bearer '):], token)
+    return request.user.is_authenticated and request.user.is_staff
+
+
+@never_cache
+def metrics(request):
+    """Prometheus scrape endpoint, aggregated across worker processes."""
+    if not _metrics_authorized(request):
+        return HttpResponseForbidden()
+    body, content_type = render_metrics()
+    return HttpResponse(body, content_type=content_type)
+
+
+@never_cache
+@staff_member_required
+@require_http_methods(['GET', 'POST'])
+def memory_diagnostics(request):
+    """
+    tracemalloc and gc diagnostics for the worker process serving the request.
+
+    GET returns the report. POST ``action`` is ``start`` (optional
+    ``frames``), ``snapshot``, ``collect`` or ``stop``. Nothing is traced
+    until ``start``, so the endpoint costs nothing while unused.
+    """
+    if request.method == 'POST':
+        frames = request.POST.get('frames')
+        try:
+            memory.handle_action(request.POST.get('action', ''), int(frames) if frames else None)
+        except (RuntimeError, ValueError) as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+    limit = request.GET.get('limit', '20')
+    return JsonResponse(memory.report(int(limit) if limit.isdigit() else 20))
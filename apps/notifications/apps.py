@@ -3,4 +3,8 @@ from django.apps import AppConfig
 
 class NotificationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'apps.notifications'
\ No newline at end of file
+    name = 'apps.notifications'
+
+    def ready(self):
+        """Import signals when app is ready."""
+        import apps.notifications.signals
@@ -0,0 +1,61 @@
+"""
+Per-user unread notification counts kept in the cache.
+
+Creating or reading a notification adjusts the count with INCR/DECR. A
+missing count is rebuilt from the database the next time it is read.
+
+Counts are stored under a per-user generation. A change that finds no
+count to adjust moves the user to a new generation, so a rebuild that
+counted before the change was committed stores its result under the old
+generation, where nothing reads it, instead of caching a wrong count.
+"""
+import uuid
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Notification
+
+
+def generation_key(user_id):
+    return f'notifications:unread_generation:{user_id}'
+
+
+def cache_key(user_id, generation):
+    return f'notifications:unread:{user_id}:{generation}'
+
+
+def _generation(user_id):
+    generation = cache.get(generation_key(user_id))
+    if generation is None:
+        cache.add(generation_key(user_id), uuid.uuid4().hex, None)
+        generation = cache.get(generation_key(user_id))
+    return generation
+
+
+def unread_count(user_id):
+    """Return the user's unread count, counting in the database on a miss."""
+    key = cache_key(user_id, _generation(user_id))
+    count = cache.get(key)
+    if count is None:
+        count = Notification.objects.filter(user_id=user_id, is_read=False).count()
+        cache.add(key, count, settings.NOTIFICATION_UNREAD_CACHE_TTL)
+    return count
+
+
+def adjust(user_id, delta):
+    """Atomically add ``delta`` to the cached count, or invalidate it if there is none."""
+    if not delta:
+        return
+    generation = cache.get(generation_key(user_id))
+    if generation is not None:
+        try:
+            if cache.incr(cache_key(user_id, generation), delta) >= 0:
+                return
+        except ValueError:
+            pass
+    reset(user_id)
+
+
+def reset(user_id):
+    """Invalidate the cached count, e.g. after bulk changes that bypass ``adjust``."""
+    cache.set(generation_key(user_id), uuid.uuid4().hex, None)
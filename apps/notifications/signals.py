@@ -0,0 +1,19 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import counters
+from .models import Notification
+
+
+@receiver(post_save, sender=Notification)
+def count_new_notification(sender, instance, created, **kwargs):
+    """Bump the unread counter once the new notification is committed."""
+    if created and not instance.is_read:
+        transaction.on_commit(lambda: counters.adjust(instance.user_id, 1))
+
+
+@receiver(post_delete, sender=Notification)
+def uncount_deleted_notification(sender, instance, **kwargs):
+    if not instance.is_read:
+        transaction.on_commit(lambda: counters.adjust(instance.user_id, -1))
@@ -6,4 +6,5 @@ app_name = 'notifications'
 urlpatterns = [
     path('', views.notification_list, name='list'),
     path('<int:pk>/read/', views.mark_as_read, name='mark_as_read'),
-]
\ No newline at end of file
+    path('read-all/', views.mark_all_as_read, name='mark_all_as_read'),
+]
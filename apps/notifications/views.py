@@ -1,14 +1,30 @@
-from django.shortcuts import render
+from django.contrib.auth.decorators import login_required
+from django.db import transaction
+from django.shortcuts import render, redirect
+from django.views.decorators.http import require_POST
+
+from . import counters
 from .models import Notification
 
 
+@login_required
 def notification_list(request):
     notifications = Notification.objects.filter(user=request.user).order_by('-created_at')
     return render(request, 'notifications/notification_list.html', {'notifications': notifications})
 
 
+@login_required
 def mark_as_read(request, pk):
-    notification = Notification.objects.get(pk=pk, user=request.user)
-    notification.is_read = True
-    notification.save()
-    return redirect('notification_list')
\ No newline at end of file
+    # A conditional UPDATE, so two concurrent reads of the same notification
+    # decrement the counter only once
+    updated = Notification.objects.filter(pk=pk, user=request.user, is_read=False).update(is_read=True)
+    transaction.on_commit(lambda: counters.adjust(request.user.id, -updated))
+    return redirect('notifications:list')
+
+
+@login_required
+@require_POST
+def mark_all_as_read(request):
+    updated = Notification.objects.filter(user=request.user, is_read=False).update(is_read=True)
+    transaction.on_commit(lambda: counters.adjust(request.user.id, -updated))
+    return redirect('notifications:list')
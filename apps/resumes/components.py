@@ -0,0 +1,158 @@
+from bisect import bisect_right
+from typing import Dict, List
+
+from spacy.language import Language
+from spacy.matcher import Matcher
+from spacy.tokens import Doc
+
+
+# Results are written to Doc extensions so a single ``nlp(text)`` or
+# ``nlp.pipe(texts)`` call performs the whole extraction.
+for _name in ('skills', 'education'):
+    if not Doc.has_extension(_name):
+        Doc.set_extension(_name, default=None)
+
+# Resume section a chunk came from (see apps.resumes.sections)
+if not Doc.has_extension('section'):
+    Doc.set_extension('section', default='general')
+
+
+TECH_SKILLS = {
+    'python', 'javascript', 'java', 'c++', 'c#', 'ruby', 'php', 'go', 'rust',
+    'react', 'angular', 'vue', 'django', 'flask', 'fastapi', 'nodejs',
+    'html', 'css', 'sass', 'tailwind', 'bootstrap',
+    'sql', 'mysql', 'postgresql', 'mongodb', 'redis',
+    'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'terraform',
+    'git', 'linux', 'bash', 'powershell',
+    'machine learning', 'ai', 'nlp', 'computer vision', 'deep learning',
+    'tensorflow', 'pytorch', 'scikit-learn', 'pandas', 'numpy'
+}
+
+# Substrings that mark a noun as technical (e.g. "webhooks", "dataset")
+TECH_INDICATORS = ('api', 'web', 'data', 'cloud', 'dev', 'code', 'script')
+
+EDUCATION_KEYWORDS = [
+    'bachelor', 'bachelors', "bachelor's", 'master', 'masters', "master's",
+    'phd', 'ph.d', 'ph.d.', 'doctorate', 'degree', 'degrees',
+    'university', 'universities', 'college',
+]
+
+# Checked in this order when a sentence mentions more than one degree
+DEGREE_PATTERNS = {
+    'PhD': [[{'LOWER': {'IN': ['phd', 'ph.d', 'ph.d.', 'doctorate']}}]],
+    'Master': [[{'LOWER': {'IN': ['master', 'masters', "master's"]}}]],
+    'Bachelor': [[{'LOWER': {'IN': ['bachelor', 'bachelors', "bachelor's"]}}]],
+    'MBA': [[{'LOWER': 'mba'}]],
+    'MS': [[{'ORTH': {'IN': ['MS', 'M.S.', 'MSc', 'M.Sc', 'M.Sc.']}}]],
+    'BS': [[{'ORTH': {'IN': ['BS', 'B.S.', 'BSc', 'B.Sc', 'B.Sc.']}}]],
+    'BA': [[{'ORTH': {'IN': ['BA', 'B.A.']}}]],
+}
+
+# Employers and project descriptions often name universities; education is
+# not looked for in these sections.
+EDUCATION_SKIP_SECTIONS = {'experience', 'skills', 'projects'}
+
+INSTITUTION_WORDS = ['university', 'college', 'institute', 'school', 'academy', 'polytechnic']
+
+INSTITUTION_PATTERNS = [
+    # "University of Lagos", "Massachusetts Institute of Technology"
+    [
+        {'IS_TITLE': True, 'OP': '*'},
+        {'LOWER': {'IN': INSTITUTION_WORDS}},
+        {'LOWER': 'of'},
+        {'IS_TITLE': True, 'OP': '+'},
+    ],
+    # "Stanford University", "Imperial College London"
+    [
+        {'IS_TITLE': True, 'OP': '+'},
+        {'LOWER': {'IN': INSTITUTION_WORDS}},
+        {'IS_TITLE': True, 'OP': '*'},
+    ],
+]
+
+
+@Language.factory('resume_skills', assigns=['doc._.skills'])
+def create_skills_component(nlp: Language, name: str):
+    return SkillsComponent()
+
+
+class SkillsComponent:
+    """Collect technical nouns and proper nouns into ``doc._.skills``."""
+
+    def __call__(self, doc: Doc) -> Doc:
+        skills = set()
+        for token in doc:
+            if token.pos_ in ('NOUN', 'PROPN') and len(token) > 2:
+                skill = token.lower_
+                if skill in TECH_SKILLS or any(indicator in skill for indicator in TECH_INDICATORS):
+                    skills.add(token.text)
+
+        doc._.skills = list(skills)
+        return doc
+
+
+@Language.factory('resume_education', assigns=['doc._.education'])
+def create_education_component(nlp: Language, name: str):
+    return EducationComponent(nlp.vocab)
+
+
+class EducationComponent:
+    """
+    Find education sentences with their degree and institution.
+
+    A single Matcher pass over the document finds education keywords,
+    degrees and institution names; matches are then grouped by sentence.
+    Writes ``doc._.education`` as a list of
+    ``{'text': ..., 'degree': ..., 'institution': ...}`` dicts.
+    """
+
+    def __init__(self, vocab):
+        self.matcher = Matcher(vocab)
+        self.matcher.add('EDUCATION', [[{'LOWER': {'IN': EDUCATION_KEYWORDS}}]])
+        for degree, patterns in DEGREE_PATTERNS.items():
+            self.matcher.add(f'DEGREE_{degree}', patterns)
+        self.matcher.add('INSTITUTION', INSTITUTION_PATTERNS, greedy='LONGEST')
+
+        strings = vocab.strings
+        self.education_id = strings['EDUCATION']
+        self.institution_id = strings['INSTITUTION']
+        self.degree_ids = {strings[f'DEGREE_{degree}']: degree for degree in DEGREE_PATTERNS}
+        self.degree_rank = {degree: rank for rank, degree in enumerate(DEGREE_PATTERNS)}
+
+    def __call__(self, doc: Doc) -> Doc:
+        if doc._.section in EDUCATION_SKIP_SECTIONS:
+            doc._.education = []
+            return doc
+
+        sentences = list(doc.sents)
+        starts = [sent.start for sent in sentences]
+        found: Dict[int, Dict] = {}
+
+        # Greedy matches are returned unsorted
+        for match_id, start, end in sorted(self.matcher(doc), key=lambda m: m[1]):
+            index = bisect_right(starts, start) - 1
+            entry = found.setdefault(index, {'education': False, 'degrees': [], 'institution': ''})
+
+            if match_id == self.education_id:
+                entry['education'] = True
+            elif match_id == self.institution_id:
+                entry['education'] = True
+                if not entry['institution']:
+                    entry['institution'] = doc[start:end].text
+            else:
+                entry['degrees'].append(self.degree_ids[match_id])
+
+        education: List[Dict] = []
+        for index in sorted(found):
+            entry = found[index]
+            if not (entry['education'] or entry['degrees']):
+                continue
+            degrees = sorted(entry['degrees'], key=self.degree_rank.get)
+            education.append({
+                'text': sentences[index].text.strip(),
+                'degree': degrees[0] if degrees else '',
+                'institution': entry['institution'],
+            })
+
+        doc._.education = education
+        return doc
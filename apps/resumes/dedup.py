@@ -0,0 +1,192 @@
+import hashlib
+import re
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Sequence
+
+
+# 128 permutations split into 16 bands of 8 rows: two resumes share at
+# least one band bucket with high probability once their Jaccard
+# similarity passes ~0.7, and rarely below it.
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 5
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+WORD_PATTERN = re.compile(r'\w+')
+
+_permutations = None
+
+
+def _get_permutations():
+    """Return the fixed (a, b) coefficients of the hash permutations."""
+    global _permutations
+    if _permutations is None:
+        import numpy as np
+        # Seeded so signatures stay comparable across processes and releases
+        rng = np.random.RandomState(1)
+        _permutations = (
+            rng.randint(1, MAX_HASH, size=NUM_PERM, dtype=np.uint64),
+            rng.randint(0, MAX_HASH, size=NUM_PERM, dtype=np.uint64),
+        )
+    return _permutations
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    """Return the set of ``size``-word shingles of normalised ``text``."""
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) <= size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash_signature(text: str) -> List[int]:
+    """
+    Return the MinHash signature of ``text`` (``NUM_PERM`` 32-bit ints).
+
+    The fraction of equal positions in two signatures estimates the
+    Jaccard similarity of the texts' shingle sets.
+    """
+    import numpy as np
+
+    tokens = shingles(text)
+    if not tokens:
+        return []
+
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(token.encode(), digest_size=4).digest(), 'little') for token in tokens),
+        dtype=np.uint64,
+        count=len(tokens),
+    )
+    a, b = _get_permutations()
+    # a, h < 2**32 so a * h + b fits in uint64 without overflow
+    permuted = (np.outer(a, hashes) + b[:, None]) % MERSENNE_PRIME
+    return (permuted.min(axis=1) & MAX_HASH).tolist()
+
+
+def similarity(first: Sequence[int], second: Sequence[int]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    if not first or len(first) != len(second):
+        return 0.0
+    return sum(1 for x, y in zip(first, second) if x == y) / len(first)
+
+
+def band_hashes(signature: Sequence[int]) -> List[str]:
+    """Return one bucket key per LSH band of ``signature``."""
+    keys = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS:(band + 1) * ROWS]
+        data = b''.join(value.to_bytes(4, 'little') for value in rows)
+        keys.append(hashlib.blake2b(data, digest_size=8).hexdigest())
+    return keys
+
+
+class LSHIndex:
+    """In-memory LSH index over MinHash signatures."""
+
+    def __init__(self):
+        self.buckets: Dict[tuple, List[Hashable]] = defaultdict(list)
+        self.signatures: Dict[Hashable, Sequence[int]] = {}
+
+    def add(self, key: Hashable, signature: Sequence[int]) -> None:
+        self.signatures[key] = signature
+        for band, bucket in enumerate(band_hashes(signature)):
+            self.buckets[(band, bucket)].append(key)
+
+    def query(self, signature: Sequence[int], threshold: float) -> List[Hashable]:
+        """Keys whose signatures share a band and reach ``threshold`` similarity."""
+        candidates = set()
+        for band, bucket in enumerate(band_hashes(signature)):
+            candidates.update(self.buckets.get((band, bucket), ()))
+        return [
+            key for key in candidates
+            if similarity(signature, self.signatures[key]) >= threshold
+        ]
+
+
+def collapse_duplicates(items: Iterable, text_of, threshold: float) -> List[List]:
+    """
+    Group near-duplicate items (e.g. resumes in one screening batch).
+
+    Args:
+        items: Objects to group
+        text_of: Callable returning the text to compare for an item
+        threshold: Minimum estimated Jaccard similarity
+
+    Returns:
+        List of groups; the first item of each group is its representative,
+        so only representatives need to be scored.
+    """
+    index = LSHIndex()
+    groups: Dict[int, List] = {}
+
+    for position, item in enumerate(items):
+        signature = minhash_signature(text_of(item))
+        if not signature:
+            groups[position] = [item]
+            continue
+
+        matches = index.query(signature, threshold)
+        if matches:
+            groups[min(matches)].append(item)
+        else:
+            index.add(position, signature)
+            groups[position] = [item]
+
+    return list(groups.values())
+
+
+def find_original(resume, signature: Sequence[int], threshold: float):
+    """
+    Return the id of the user's earliest other resume that ``resume`` nearly duplicates.
+
+    Only resumes sharing an LSH bucket are loaded and compared, so the
+    lookup cost does not grow with the number of stored resumes.
+    """
+    from django.db.models import Q
+    from .models import Resume, ResumeLSHBucket
+
+    query = Q()
+    for band, bucket in enumerate(band_hashes(signature)):
+        query |= Q(band=band, bucket=bucket)
+
+    # Only the same user's resumes: versions of one candidate, never
+    # another account's data
+    candidate_ids = (
+        ResumeLSHBucket.objects.filter(query, resume__user_id=resume.user_id)
+        .exclude(resume_id=resume.pk)
+        .values_list('resume_id', flat=True)
+        .distinct()
+    )
+    candidates = (
+        Resume.objects.filter(pk__in=list(candidate_ids))
+        .only('id', 'minhash', 'duplicate_of_id', 'uploaded_at')
+        .order_by('uploaded_at')
+    )
+    for candidate in candidates:
+        if similarity(signature, candidate.minhash) >= threshold:
+            # Link to the root of the chain so versions form one group
+            return candidate.duplicate_of_id or candidate.pk
+    return None
+
+
+def index_resume(resume) -> None:
+    """Store the signature and LSH buckets of a parsed resume and link its original."""
+    from django.conf import settings
+    from .models import ResumeLSHBucket
+
+    signature = minhash_signature(resume.parsed_text)
+    resume.minhash = signature
+    resume.duplicate_of_id = (
+        find_original(resume, signature, settings.RESUME_DUPLICATE_THRESHOLD) if signature else None
+    )
+    resume.save(update_fields=['minhash', 'duplicate_of'])
+
+    ResumeLSHBucket.objects.filter(resume=resume).delete()
+    if signature:
+        ResumeLSHBucket.objects.bulk_create([
+            ResumeLSHBucket(resume=resume, band=band, bucket=bucket)
+            for band, bucket in enumerate(band_hashes(signature))
+        ])
@@ -1,6 +1,7 @@
 from django import forms
 from django.core.exceptions import ValidationError
 from .models import Resume
+from .validators import validate_resume_file
 
 
 class ResumeUploadForm(forms.ModelForm):
@@ -45,6 +46,9 @@ class ResumeUploadForm(forms.ModelForm):
         if f'.{file_extension}' not in allowed_extensions:
             raise ValidationError('Only PDF and DOCX files are allowed.')
 
+        # Check the content matches the extension and is safe to parse
+        validate_resume_file(file)
+
         return file
 
     def save(self, commit=True):
@@ -0,0 +1,43 @@
+import re
+from typing import Optional
+
+
+# Most frequent function words per language. Function words dominate any
+# running text, so counting them over a sample is a cheap and dependable
+# detector for the languages we have pipelines for.
+STOPWORDS = {
+    'en': {'the', 'and', 'of', 'to', 'in', 'for', 'with', 'on', 'at', 'is', 'as', 'by', 'from', 'my', 'i'},
+    'es': {'el', 'la', 'de', 'que', 'y', 'en', 'los', 'las', 'del', 'con', 'para', 'por', 'una', 'un', 'como'},
+    'fr': {'le', 'la', 'les', 'de', 'des', 'et', 'en', 'du', 'un', 'une', 'pour', 'avec', 'dans', 'sur', 'au'},
+    'de': {'der', 'die', 'das', 'und', 'in', 'von', 'mit', 'für', 'den', 'im', 'auf', 'ist', 'ein', 'eine', 'zu'},
+    'pt': {'o', 'a', 'de', 'e', 'do', 'da', 'em', 'os', 'as', 'para', 'com', 'um', 'uma', 'no', 'na'},
+    'it': {'il', 'la', 'di', 'e', 'che', 'in', 'per', 'con', 'del', 'della', 'un', 'una', 'gli', 'le', 'nel'},
+    'nl': {'de', 'het', 'een', 'en', 'van', 'in', 'op', 'met', 'voor', 'is', 'bij', 'als', 'aan', 'naar', 'ik'},
+}
+
+WORD_PATTERN = re.compile(r'[^\W\d_]+')
+
+# Only the start of the text is sampled; that is plenty to decide
+SAMPLE_CHARS = 5000
+
+# Fewer stopword hits than this and the guess is not trusted
+MIN_HITS = 5
+
+
+def detect_language(text: str, default: Optional[str] = None) -> Optional[str]:
+    """
+    Return the ISO 639-1 code of the language ``text`` is written in.
+
+    Returns ``default`` when the sample has too few function words to
+    decide (e.g. a resume that is mostly a skills list).
+    """
+    scores = dict.fromkeys(STOPWORDS, 0)
+    for word in WORD_PATTERN.findall(text[:SAMPLE_CHARS].lower()):
+        for language, stopwords in STOPWORDS.items():
+            if word in stopwords:
+                scores[language] += 1
+
+    language, hits = max(scores.items(), key=lambda item: item[1])
+    if hits < MIN_HITS:
+        return default
+    return language
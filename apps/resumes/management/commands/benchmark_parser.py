@@ -0,0 +1,90 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.resumes.parsers import NLP_PROFILES, ResumeParser
+from apps.resumes.synthetic import synthetic_corpus
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark spaCy pipeline profiles on the synthetic resume corpus and '
+        'report docs/sec plus extraction agreement with a baseline profile.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--docs', type=int, default=200, help='Number of synthetic resumes.')
+        parser.add_argument('--seed', type=int, default=42, help='Corpus random seed.')
+        parser.add_argument('--batch-size', type=int, default=32, help='nlp.pipe batch size.')
+        parser.add_argument(
+            '--profiles',
+            nargs='+',
+            default=list(NLP_PROFILES),
+            help='Profiles to benchmark (default: all).',
+        )
+        parser.add_argument(
+            '--baseline',
+            default='full',
+            help='Profile whose output the others are compared against.',
+        )
+
+    def handle(self, *args, **options):
+        profiles = options['profiles']
+        baseline = options['baseline']
+        for name in set(profiles) | {baseline}:
+            if name not in NLP_PROFILES:
+                raise CommandError(f'Unknown profile "{name}". Choose from: {", ".join(NLP_PROFILES)}')
+
+        corpus = synthetic_corpus(options['docs'], options['seed'])
+        self.stdout.write(f'Corpus: {len(corpus)} docs, seed {options["seed"]}')
+
+        results = {}
+        for name in dict.fromkeys([baseline] + profiles):
+            parser = ResumeParser(profile=name)
+            if parser.nlp is None:
+                raise CommandError('spaCy model en_core_web_sm is not installed.')
+
+            # Warm up so model lazy-initialisation is not timed
+            parser._parse_text(corpus[0])
+
+            start = time.perf_counter()
+            outputs = parser.parse_texts(corpus, batch_size=options['batch_size'])
+            elapsed = time.perf_counter() - start
+
+            results[name] = {
+                'docs_per_sec': len(corpus) / elapsed,
+                'components': parser.nlp.pipe_names,
+                'outputs': outputs,
+            }
+
+        reference = results[baseline]['outputs']
+        self.stdout.write('')
+        self.stdout.write(f'{"profile":<8} {"docs/sec":>10} {"skills":>8} {"education":>10} {"experience":>11}  components')
+        for name in profiles:
+            agreement = self._agreement(results[name]['outputs'], reference)
+            self.stdout.write(
+                f'{name:<8} {results[name]["docs_per_sec"]:>10.1f} '
+                f'{agreement["skills"]:>8.1%} {agreement["education"]:>10.1%} '
+                f'{agreement["experience"]:>11.1%}  {",".join(results[name]["components"])}'
+            )
+        self.stdout.write(f'\nAgreement is measured against the "{baseline}" profile.')
+
+    def _agreement(self, outputs, reference):
+        """Return per-field agreement ratios between two result lists."""
+        skills = education = experience = 0.0
+        for got, expected in zip(outputs, reference):
+            got_skills, expected_skills = set(got['skills']), set(expected['skills'])
+            union = got_skills | expected_skills
+            skills += len(got_skills & expected_skills) / len(union) if union else 1.0
+
+            got_degrees = [(e['degree'], e['institution']) for e in got['education']]
+            expected_degrees = [(e['degree'], e['institution']) for e in expected['education']]
+            education += 1.0 if got_degrees == expected_degrees else 0.0
+
+            experience += 1.0 if got['experience_years'] == expected['experience_years'] else 0.0
+
+        count = len(reference) or 1
+        return {
+            'skills': skills / count,
+            'education': education / count,
+            'experience': experience / count,
+        }
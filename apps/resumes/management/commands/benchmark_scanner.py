@@ -0,0 +1,53 @@
+import time
+from django.core.management.base import BaseCommand
+
+from apps.resumes.scanner import scan_text
+from apps.resumes.synthetic import iter_corpus
+
+
+# Inputs that make naive contact/experience regexes backtrack
+# quadratically or worse.
+PATHOLOGICAL_INPUTS = {
+    'long word': 'a' * 100_000,
+    'repeated @': 'a@' * 50_000,
+    'dotted domain': 'a@' + 'a.' * 50_000,
+    'digit run': '1' * 100_000,
+    'spaced digits': '1 ' * 50_000,
+    'plus digits': '+1' * 50_000,
+    'years without experience': '5 years ' * 12_500,
+}
+
+
+class Command(BaseCommand):
+    help = 'Microbenchmark the single-pass contact/experience scanner on large and pathological texts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            type=int,
+            nargs='+',
+            default=[100_000, 1_000_000, 10_000_000],
+            help='Text sizes in characters.',
+        )
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per size (best is reported).')
+
+    def handle(self, *args, **options):
+        corpus = '\n\n'.join(iter_corpus(500))
+
+        self.stdout.write(f'{"input":<28} {"chars":>12} {"best ms":>10} {"MB/s":>8}')
+        for size in options['sizes']:
+            text = (corpus * (size // len(corpus) + 1))[:size]
+            self._report('synthetic resumes', text, options['repeat'])
+
+        for name, text in PATHOLOGICAL_INPUTS.items():
+            self._report(name, text, options['repeat'])
+
+    def _report(self, name, text, repeat):
+        best = min(self._time(text) for _ in range(repeat))
+        rate = len(text) / best / 1_000_000 if best else float('inf')
+        self.stdout.write(f'{name:<28} {len(text):>12,} {best * 1000:>10.1f} {rate:>8.1f}')
+
+    def _time(self, text):
+        start = time.perf_counter()
+        scan_text(text)
+        return time.perf_counter() - start
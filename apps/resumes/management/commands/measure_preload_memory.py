@@ -0,0 +1,64 @@
+import multiprocessing
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.resumes import preload
+from apps.resumes.synthetic import synthetic_corpus
+
+
+MB = 1024 * 1024
+
+
+def _parse_and_report(text):
+    """Pool task: parse one resume, then report this worker's memory."""
+    from apps.resumes.parsers import resume_parser
+    resume_parser._parse_text(text)
+    return preload.memory_report()
+
+
+def _load_in_worker():
+    """Pool initializer for the baseline: every worker loads its own model."""
+    from apps.resumes.parsers import resume_parser
+    resume_parser.models.get()
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure per-worker shared vs private memory when parser models are '
+        'loaded in each worker versus preloaded before fork with gc.freeze().'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help='Worker processes to fork.')
+
+    def handle(self, *args, **options):
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            raise CommandError('Copy-on-write sharing needs the "fork" start method (Linux/macOS).')
+
+        context = multiprocessing.get_context('fork')
+        workers = options['workers']
+        texts = synthetic_corpus(workers)
+
+        # Baseline first, while this process has not loaded any model
+        with context.Pool(workers, initializer=_load_in_worker) as pool:
+            baseline = pool.map(_parse_and_report, texts, chunksize=1)
+
+        preload.preload_parser()
+        with context.Pool(workers) as pool:
+            preloaded = pool.map(_parse_and_report, texts, chunksize=1)
+
+        self._print('Load per worker', baseline)
+        self._print('Preload + gc.freeze()', preloaded)
+
+        saved = sum(r['private'] for r in baseline) - sum(r['private'] for r in preloaded)
+        self.stdout.write(f'\nPrivate memory saved across {workers} workers: {saved / MB:.0f} MB')
+
+    def _print(self, label, reports):
+        self.stdout.write(f'\n{label}')
+        self.stdout.write(f'  {"worker":<8} {"rss MB":>8} {"pss MB":>8} {"shared MB":>10} {"private MB":>11}')
+        for number, report in enumerate(reports, start=1):
+            self.stdout.write(
+                f'  {number:<8} {report["rss"] / MB:>8.0f} {report["pss"] / MB:>8.0f} '
+                f'{report["shared"] / MB:>10.0f} {report["private"] / MB:>11.0f}'
+            )
+        total_private = sum(report['private'] for report in reports)
+        self.stdout.write(f'  total private: {total_private / MB:.0f} MB')
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from apps.resumes.preload import preload_parser
+from apps.resumes.tasks import get_parse_queue
+
+
+class Command(BaseCommand):
+    help = 'Process deferred (over-quota) resume parses from the low-priority queue.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--burst',
+            action='store_true',
+            help='Exit once the queue is empty instead of waiting for new jobs.',
+        )
+        parser.add_argument(
+            '--no-preload',
+            action='store_true',
+            help='Do not load parser models before jobs fork.',
+        )
+
+    def handle(self, *args, **options):
+        from rq import Worker
+
+        # rq forks a work horse per job; loading the models here lets every
+        # job share them instead of loading its own copy
+        if not options['no_preload']:
+            preload_parser()
+
+        queue = get_parse_queue()
+        self.stdout.write(f'Processing resume parses from "{queue.name}" ({len(queue)} queued)')
+
+        worker = Worker([queue], connection=queue.connection)
+        worker.work(burst=options['burst'])
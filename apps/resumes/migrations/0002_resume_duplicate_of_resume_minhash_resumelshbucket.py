@@ -0,0 +1,36 @@
+# Generated by Django 6.0.1 on 2026-10-19 01:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='duplicate_of',
+            field=models.ForeignKey(blank=True, help_text='Earliest near-identical resume (another version of the same candidate)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='near_duplicates', to='resumes.resume'),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='minhash',
+            field=models.JSONField(blank=True, default=list, help_text='MinHash signature of the parsed text'),
+        ),
+        migrations.CreateModel(
+            name='ResumeLSHBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField()),
+                ('bucket', models.CharField(max_length=16)),
+                ('resume', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lsh_buckets', to='resumes.resume')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['band', 'bucket'], name='resumes_res_band_651540_idx')],
+            },
+        ),
+    ]
@@ -78,6 +78,21 @@ class Resume(models.Model):
         help_text="Contact information extracted"
     )
 
+    # Near-duplicate detection (see apps.resumes.dedup)
+    minhash = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="MinHash signature of the parsed text"
+    )
+    duplicate_of = models.ForeignKey(
+        'self',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='near_duplicates',
+        help_text="Earliest near-identical resume (another version of the same candidate)"
+    )
+
     # Metadata
     uploaded_at = models.DateTimeField(default=timezone.now)
     parsed_at = models.DateTimeField(null=True, blank=True)
@@ -97,7 +112,7 @@ class Resume(models.Model):
         """Override save to handle primary resume logic."""
         if self.is_primary:
             # Ensure only one primary resume per user
-            Resume.objects.filter(user=self.user, is_primary=True).update(is_primary=False)
+            Resume.objects.filter(user=self.user, is_primary=True).exclude(pk=self.pk).update(is_primary=False)
 
         # Set file size if not set
         if self.file and not self.file_size:
@@ -136,4 +151,24 @@ class Resume(models.Model):
 
     def get_education_list(self):
         """Get education as a list of dicts."""
-        return self.education if isinstance(self.education, list) else []
\ No newline at end of file
+        return self.education if isinstance(self.education, list) else []
+
+
+class ResumeLSHBucket(models.Model):
+    """LSH band bucket of a resume's MinHash signature, for near-duplicate lookup."""
+
+    resume = models.ForeignKey(
+        Resume,
+        on_delete=models.CASCADE,
+        related_name='lsh_buckets'
+    )
+    band = models.PositiveSmallIntegerField()
+    bucket = models.CharField(max_length=16)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['band', 'bucket']),
+        ]
+
+    def __str__(self):
+        return f"Resume {self.resume_id} band {self.band}: {self.bucket}"
@@ -0,0 +1,148 @@
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+# spaCy pipeline profiles. Extraction only needs sentence boundaries and
+# part-of-speech tags; "fast" swaps the dependency parser for the much
+# cheaper senter and drops NER and the lemmatizer. attribute_ruler stays
+# because it maps tagger output to ``pos_``.
+NLP_PROFILES = {
+    'fast': {
+        'exclude': ['parser', 'ner', 'lemmatizer'],
+        'enable': ['senter'],
+    },
+    'full': {
+        'exclude': [],
+        'enable': [],
+    },
+}
+
+
+def load_pipeline(model_name: str, profile: str):
+    """Load ``model_name`` with the components of ``profile`` plus our extractors."""
+    # spaCy takes seconds to import; only pay for it when a model is needed
+    import spacy
+    from . import components as _factories  # noqa: F401 - registers the spaCy factories
+
+    components = NLP_PROFILES[profile]
+    nlp = spacy.load(model_name, exclude=components['exclude'])
+    for name in components['enable']:
+        if name in nlp.disabled:
+            nlp.enable_pipe(name)
+
+    # Not every language ships a senter; without the parser, fall back to
+    # rule-based sentence boundaries
+    if not nlp.has_pipe('parser') and not nlp.has_pipe('senter'):
+        nlp.add_pipe('sentencizer', first=True)
+
+    # Extraction components registered in apps.resumes.components
+    nlp.add_pipe('resume_skills')
+    nlp.add_pipe('resume_education')
+    return nlp
+
+
+def estimate_pipeline_size(model_name: str) -> int:
+    """
+    Estimate a pipeline's memory footprint in bytes from its package size.
+
+    Vectors, weights and lookup tables dominate a loaded pipeline and are
+    held in memory at roughly their on-disk size.
+    """
+    import spacy
+
+    try:
+        path = spacy.util.get_package_path(model_name)
+    except Exception:
+        return 0
+
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            total += os.path.getsize(os.path.join(root, name))
+    return total
+
+
+class ModelRegistry:
+    """
+    Per-language spaCy pipelines loaded on demand.
+
+    Loaded pipelines are kept in an LRU cache. When their combined
+    estimated size exceeds ``RESUME_NLP_MEMORY_BUDGET_MB`` the least
+    recently used ones are evicted, so a worker can serve many languages
+    without holding every model at once.
+    """
+
+    def __init__(self, profile: str, models: Optional[Dict[str, str]] = None,
+                 default_language: Optional[str] = None, budget_bytes: Optional[int] = None):
+        self.profile = profile
+        self.models = models or settings.RESUME_NLP_MODELS
+        self.default_language = default_language or settings.RESUME_DEFAULT_LANGUAGE
+        self.budget_bytes = budget_bytes or settings.RESUME_NLP_MEMORY_BUDGET_MB * 1024 * 1024
+
+        self._pipelines = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._unavailable = set()
+        self._lock = threading.Lock()
+
+    def get(self, language: Optional[str] = None):
+        """
+        Return the pipeline for ``language``.
+
+        Falls back to the default language when no model is configured or
+        installed for ``language``, and returns None only when the default
+        model is missing too.
+        """
+        language = language or self.default_language
+        nlp = self._get(language)
+        if nlp is None and language != self.default_language:
+            logger.warning("No spaCy pipeline for '%s', using '%s'", language, self.default_language)
+            nlp = self._get(self.default_language)
+        return nlp
+
+    def _get(self, language: str):
+        """Return a cached pipeline, loading it on a miss."""
+        with self._lock:
+            if language in self._pipelines:
+                self._pipelines.move_to_end(language)
+                return self._pipelines[language]
+
+            model_name = self.models.get(language)
+            if model_name is None or model_name in self._unavailable:
+                return None
+
+            try:
+                nlp = load_pipeline(model_name, self.profile)
+            except OSError:
+                logger.warning("spaCy model '%s' is not installed", model_name)
+                self._unavailable.add(model_name)
+                return None
+
+            self._pipelines[language] = nlp
+            self._sizes[language] = estimate_pipeline_size(model_name)
+            self._evict(keep=language)
+            return nlp
+
+    def _evict(self, keep: str):
+        """Drop least recently used pipelines until back under budget."""
+        while self.memory_usage() > self.budget_bytes and len(self._pipelines) > 1:
+            language = next(iter(self._pipelines))
+            if language == keep:
+                break
+            del self._pipelines[language]
+            size = self._sizes.pop(language)
+            logger.info("Evicted spaCy pipeline '%s' (%.0f MB)", language, size / 1024 / 1024)
+
+    def memory_usage(self) -> int:
+        """Estimated bytes held by loaded pipelines."""
+        return sum(self._sizes.values())
+
+    def loaded_languages(self):
+        """Languages currently loaded, least recently used first."""
+        return list(self._pipelines)
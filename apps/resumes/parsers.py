@@ -1,35 +1,51 @@
-import re
-import spacy
-from typing import Dict, List, Optional
+import io
+import os
+from collections import defaultdict
+from typing import BinaryIO, Dict, List, Optional, Union
 from django.conf import settings
-import fitz  # PyMuPDF for PDF parsing
-from docx import Document  # python-docx for DOCX parsing
+
+from apps.monitoring.metrics import parse_stage
+from .language import detect_language
+from .nlp import NLP_PROFILES, ModelRegistry  # noqa: F401 - NLP_PROFILES re-exported
+from .scanner import scan_text
+from .sections import PAGE_BREAK, split_sections
+
+
+# A resume can be handed to the parser as a filesystem path, raw bytes or
+# any readable file-like object (Django ``UploadedFile``, storage ``File``).
+ResumeSource = Union[str, os.PathLike, bytes, bytearray, memoryview, BinaryIO]
 
 
 class ResumeParser:
     """AI-powered resume parser using spaCy."""
 
-    def __init__(self):
-        # Load spaCy model
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except OSError:
-            # Fallback if model not available
-            self.nlp = None
+    def __init__(self, profile: Optional[str] = None):
+        self.profile = profile or settings.RESUME_NLP_PROFILE
+
+        # Pipelines are loaded per language on first use
+        self.models = ModelRegistry(self.profile)
+
+    @property
+    def nlp(self):
+        """Pipeline for the default language, or None if it is not installed."""
+        return self.models.get()
 
-    def parse_file(self, file_path: str, filename: str) -> Dict:
+    def parse_file(self, source: ResumeSource, filename: str) -> Dict:
         """
         Parse resume file and extract structured data.
 
         Args:
-            file_path: Path to the uploaded file
+            source: Path, bytes/memoryview or readable file-like object
+                holding the resume. Passing the upload itself avoids a
+                second round-trip to storage and works with any backend.
             filename: Original filename
 
         Returns:
             Dict containing parsed data
         """
         # Extract text from file
-        text = self._extract_text(file_path, filename)
+        with parse_stage('extract'):
+            text = self._extract_text(source, filename)
 
         if not text:
             return {
@@ -46,179 +62,153 @@ class ResumeParser:
             **parsed_data
         }
 
-    def _extract_text(self, file_path: str, filename: str) -> str:
+    def _extract_text(self, source: ResumeSource, filename: str) -> str:
         """Extract text from PDF or DOCX file."""
         file_extension = filename.lower().split('.')[-1]
 
         try:
             if file_extension == 'pdf':
-                return self._extract_pdf_text(file_path)
+                return self._extract_pdf_text(source)
             elif file_extension == 'docx':
-                return self._extract_docx_text(file_path)
+                return self._extract_docx_text(source)
             else:
                 return ""
         except Exception as e:
             print(f"Error extracting text: {e}")
             return ""
 
-    def _extract_pdf_text(self, file_path: str) -> str:
+    def _extract_pdf_text(self, source: ResumeSource) -> str:
         """Extract text from PDF file."""
-        text = ""
-        with fitz.open(file_path) as doc:
-            for page in doc:
-                text += page.get_text()
-        return text
+        import fitz  # PyMuPDF; imported here to keep URL loading fast
 
-    def _extract_docx_text(self, file_path: str) -> str:
+        if isinstance(source, (str, os.PathLike)):
+            document = fitz.open(source)
+        else:
+            document = fitz.open(stream=self._read_bytes(source), filetype='pdf')
+
+        # Upload validation checks the declared page count; cap here as well
+        # for PDFs whose page tree is hidden in compressed object streams
+        with document as doc:
+            page_count = min(doc.page_count, settings.RESUME_MAX_PDF_PAGES)
+            # Page breaks let section splitting recognise running headers/footers
+            return PAGE_BREAK.join(doc[number].get_text() for number in range(page_count))
+
+    def _extract_docx_text(self, source: ResumeSource) -> str:
         """Extract text from DOCX file."""
-        doc = Document(file_path)
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text
+        from docx import Document  # python-docx; imported here to keep URL loading fast
 
-    def _parse_text(self, text: str) -> Dict:
-        """Parse text using NLP to extract structured data."""
-        if not self.nlp:
-            return self._parse_text_fallback(text)
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            source = io.BytesIO(source)
+        elif hasattr(source, 'seek'):
+            source.seek(0)
+
+        doc = Document(source)
+        return "".join(paragraph.text + "\n" for paragraph in doc.paragraphs)
+
+    def _read_bytes(self, source: ResumeSource) -> bytes:
+        """
+        Return the contents of an in-memory or file-like source.
+
+        In-memory uploads are backed by a ``BytesIO``; its buffer is used
+        directly instead of being re-read through the storage backend.
+        """
+        if isinstance(source, bytes):
+            return source
+        if isinstance(source, (bytearray, memoryview)):
+            return bytes(source)
 
-        doc = self.nlp(text)
+        # Django wraps the real buffer in ``UploadedFile.file``
+        buffer = getattr(source, 'file', source)
+        if isinstance(buffer, io.BytesIO):
+            return buffer.getvalue()
 
-        # Extract skills
-        skills = self._extract_skills(doc)
+        source.seek(0)
+        return source.read()
 
-        # Extract experience
-        experience_years = self._extract_experience_years(text)
+    def _parse_text(self, text: str) -> Dict:
+        """Parse text using NLP to extract structured data."""
+        return self.parse_texts([text])[0]
 
-        # Extract education
-        education = self._extract_education(doc)
+    def parse_texts(self, texts: List[str], batch_size: int = 32, n_process: int = 1) -> List[Dict]:
+        """
+        Parse many already-extracted texts in one batched ``nlp.pipe`` run.
+
+        Each text is split into section-aware chunks (see
+        ``apps.resumes.sections``) so no ``Doc`` is larger than
+        ``RESUME_NLP_CHUNK_SIZE`` characters; per-chunk results are merged
+        back per resume. Skill and education extraction run as pipeline
+        components, so batching and ``n_process`` worker processes cover
+        the whole extraction rather than just tagging.
+        """
+        # Group texts by detected language so each pipeline runs once
+        by_language = defaultdict(list)
+        with parse_stage('language'):
+            for index, text in enumerate(texts):
+                by_language[detect_language(text, default=self.models.default_language)].append(index)
+
+        # Dicts keep first-seen skill order while dropping duplicates
+        skills = [{} for _ in texts]
+        education = [[] for _ in texts]
+        languages = [None] * len(texts)
+        results = [None] * len(texts)
+
+        for language, indexes in by_language.items():
+            with parse_stage('load_model'):
+                nlp = self.models.get(language)
+            if nlp is None:
+                for index in indexes:
+                    results[index] = self._parse_text_fallback(texts[index])
+                continue
+
+            chunks = (
+                (self._make_chunk_doc(nlp, section, chunk), index)
+                for index in indexes
+                for section, chunk in split_sections(texts[index], settings.RESUME_NLP_CHUNK_SIZE)
+            )
+            with parse_stage('nlp'):
+                for doc, index in nlp.pipe(chunks, as_tuples=True, batch_size=batch_size, n_process=n_process):
+                    skills[index].update(dict.fromkeys(doc._.skills))
+                    education[index].extend(doc._.education)
+
+            for index in indexes:
+                languages[index] = language
+
+        return [
+            results[index] or self._build_result(text, list(skills[index]), education[index], languages[index])
+            for index, text in enumerate(texts)
+        ]
 
-        # Extract contact info
-        contact_info = self._extract_contact_info(text)
+    def _make_chunk_doc(self, nlp, section: str, chunk: str):
+        """Tokenize a chunk and tag it with its section for the components."""
+        doc = nlp.make_doc(chunk)
+        doc._.section = section
+        return doc
 
+    def _build_result(self, text: str, skills: List[str], education: List[Dict], language: str) -> Dict:
+        """Combine pipeline output with the regex scanner."""
+        scanned = self._scan(text)
         return {
             'skills': skills,
-            'experience_years': experience_years,
+            'experience_years': scanned['experience_years'],
             'education': education,
-            'contact_info': contact_info,
-        }
-
-    def _extract_skills(self, doc) -> List[str]:
-        """Extract skills from parsed document."""
-        skills = []
-
-        # Common tech skills to look for
-        tech_skills = {
-            'python', 'javascript', 'java', 'c++', 'c#', 'ruby', 'php', 'go', 'rust',
-            'react', 'angular', 'vue', 'django', 'flask', 'fastapi', 'nodejs',
-            'html', 'css', 'sass', 'tailwind', 'bootstrap',
-            'sql', 'mysql', 'postgresql', 'mongodb', 'redis',
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'terraform',
-            'git', 'linux', 'bash', 'powershell',
-            'machine learning', 'ai', 'nlp', 'computer vision', 'deep learning',
-            'tensorflow', 'pytorch', 'scikit-learn', 'pandas', 'numpy'
+            'contact_info': scanned['contact_info'],
+            'language': language,
         }
 
-        # Extract nouns and proper nouns as potential skills
-        for token in doc:
-            if token.pos_ in ['NOUN', 'PROPN'] and len(token.text) > 2:
-                skill = token.text.lower()
-                if skill in tech_skills or self._is_technical_skill(skill):
-                    skills.append(token.text)
-
-        # Remove duplicates and sort
-        return list(set(skills))
-
-    def _is_technical_skill(self, word: str) -> bool:
-        """Check if a word looks like a technical skill."""
-        # Simple heuristic: contains programming-related keywords
-        tech_indicators = ['api', 'web', 'data', 'cloud', 'dev', 'code', 'script']
-        return any(indicator in word for indicator in tech_indicators)
-
-    def _extract_experience_years(self, text: str) -> Optional[float]:
-        """Extract years of experience from text."""
-        # Look for patterns like "5 years", "3+ years", etc.
-        patterns = [
-            r'(\d+(?:\.\d+)?)\s*(?:\+?\s*)?years?\s*(?:of\s*)?experience',
-            r'experience\s*(?:of\s*)?(\d+(?:\.\d+)?)\s*(?:\+?\s*)?years?',
-        ]
-
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                # Take the highest number found
-                years = max(float(match) for match in matches)
-                return years
-
-        return None
-
-    def _extract_education(self, doc) -> List[Dict]:
-        """Extract education information."""
-        education = []
-
-        # Look for education keywords
-        education_keywords = ['bachelor', 'master', 'phd', 'degree', 'university', 'college']
-
-        for sent in doc.sents:
-            sent_text = sent.text.lower()
-            if any(keyword in sent_text for keyword in education_keywords):
-                education.append({
-                    'text': sent.text.strip(),
-                    'degree': self._extract_degree(sent.text),
-                    'institution': self._extract_institution(sent.text)
-                })
-
-        return education
-
-    def _extract_degree(self, text: str) -> str:
-        """Extract degree from education text."""
-        degrees = ['PhD', 'Master', 'Bachelor', 'MBA', 'MS', 'BS', 'BA']
-        for degree in degrees:
-            if degree.lower() in text.lower():
-                return degree
-        return ""
-
-    def _extract_institution(self, text: str) -> str:
-        """Extract institution name from education text."""
-        # Simple extraction - look for capitalized words after degree
-        words = text.split()
-        institutions = []
-        for i, word in enumerate(words):
-            if word[0].isupper() and len(word) > 3:
-                institutions.append(word)
-        return " ".join(institutions)
-
-    def _extract_contact_info(self, text: str) -> Dict:
-        """Extract contact information."""
-        contact_info = {}
-
-        # Email regex
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
-        if emails:
-            contact_info['email'] = emails[0]
-
-        # Phone regex (simple)
-        phone_pattern = r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'
-        phones = re.findall(phone_pattern, text)
-        if phones:
-            contact_info['phone'] = phones[0]
-
-        # LinkedIn URL
-        linkedin_pattern = r'linkedin\.com/in/[^\s]+'
-        linkedin = re.findall(linkedin_pattern, text, re.IGNORECASE)
-        if linkedin:
-            contact_info['linkedin'] = linkedin[0]
-
-        return contact_info
+    def _scan(self, text: str) -> Dict:
+        """Extract contact info and experience in one regex pass."""
+        with parse_stage('scan'):
+            return scan_text(text, default_calling_code=settings.RESUME_DEFAULT_CALLING_CODE)
 
     def _parse_text_fallback(self, text: str) -> Dict:
         """Fallback parsing without spaCy."""
+        scanned = self._scan(text)
         return {
             'skills': [],
-            'experience_years': None,
+            'experience_years': scanned['experience_years'],
             'education': [],
-            'contact_info': self._extract_contact_info(text),
+            'contact_info': scanned['contact_info'],
+            'language': detect_language(text),
         }
 
 
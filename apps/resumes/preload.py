@@ -0,0 +1,126 @@
+"""
+Preload resume parsing models before worker processes fork.
+
+Loading spaCy pipelines once in the parent and freezing the garbage
+collector lets forked workers share the model pages copy-on-write instead
+of each holding a private copy.
+
+gunicorn (see ``gunicorn.conf.py``)::
+
+    preload_app = True
+    when_ready = preload.when_ready
+    post_fork = preload.post_fork
+
+multiprocessing / worker pools::
+
+    preload_parser()
+    pool = multiprocessing.get_context('fork').Pool(initializer=init_worker)
+"""
+import gc
+import logging
+import os
+from typing import Dict, Iterable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+_preloaded = False
+
+
+def preload_parser(languages: Optional[Iterable[str]] = None) -> None:
+    """
+    Load parser pipelines in the current (parent) process and freeze the heap.
+
+    Args:
+        languages: Languages to load. Defaults to RESUME_PRELOAD_LANGUAGES.
+    """
+    global _preloaded
+    from django.conf import settings
+    from .parsers import resume_parser
+
+    for language in languages or settings.RESUME_PRELOAD_LANGUAGES:
+        nlp = resume_parser.models.get(language)
+        if nlp is not None:
+            # Run once so lazily-built tables and caches exist before fork
+            nlp('Warm up the pipeline before forking.')
+
+    # Everything allocated so far moves to the permanent generation: the
+    # collector no longer traverses (and so never writes to) those objects,
+    # which keeps their pages shared with the children.
+    gc.collect()
+    gc.freeze()
+    _preloaded = True
+
+    logger.info(
+        "Preloaded resume parser (%s) and froze %d objects",
+        ', '.join(resume_parser.models.loaded_languages()) or 'no models',
+        gc.get_freeze_count(),
+    )
+
+
+def memory_report(pid: Optional[int] = None) -> Dict[str, int]:
+    """
+    Return shared vs private memory in bytes for a process (default: self).
+
+    Reads ``/proc/<pid>/smaps_rollup`` on Linux and falls back to psutil.
+    """
+    path = f"/proc/{pid or 'self'}/smaps_rollup"
+    if os.path.exists(path):
+        values = {}
+        with open(path) as smaps:
+            for line in smaps:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == 'kB':
+                    values[parts[0].rstrip(':')] = int(parts[1]) * 1024
+        return {
+            'rss': values.get('Rss', 0),
+            'pss': values.get('Pss', 0),
+            'shared': values.get('Shared_Clean', 0) + values.get('Shared_Dirty', 0),
+            'private': values.get('Private_Clean', 0) + values.get('Private_Dirty', 0),
+        }
+
+    import psutil
+    info = psutil.Process(pid).memory_full_info()
+    return {
+        'rss': info.rss,
+        'pss': getattr(info, 'pss', 0),
+        'shared': getattr(info, 'shared', 0),
+        'private': info.uss,
+    }
+
+
+def log_memory(label: str) -> Dict[str, int]:
+    """Log this process's shared/private memory split."""
+    report = memory_report()
+    logger.info(
+        "%s pid=%d rss=%.0fMB shared=%.0fMB private=%.0fMB",
+        label, os.getpid(),
+        report['rss'] / 1024 / 1024,
+        report['shared'] / 1024 / 1024,
+        report['private'] / 1024 / 1024,
+    )
+    return report
+
+
+def init_worker() -> None:
+    """
+    Worker pool initializer.
+
+    Under the ``fork`` start method the preloaded models are inherited;
+    under ``spawn`` nothing was inherited, so load them here instead.
+    """
+    if not _preloaded:
+        from .parsers import resume_parser
+        resume_parser.models.get()
+    log_memory('Parse worker started')
+
+
+def when_ready(server) -> None:
+    """gunicorn hook: runs in the master after the app is loaded, before forking."""
+    preload_parser()
+
+
+def post_fork(server, worker) -> None:
+    """gunicorn hook: report each worker's memory split right after fork."""
+    log_memory(f'gunicorn worker {worker.age}')
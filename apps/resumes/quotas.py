@@ -0,0 +1,108 @@
+import logging
+import time
+from django.conf import settings
+
+from utils.helpers import get_redis_connection
+
+
+logger = logging.getLogger(__name__)
+
+
+# Refill every bucket in KEYS, then take ARGV[2] tokens from all of them or
+# from none. ARGV[1] is the current time; each key is followed in ARGV by
+# its capacity and refill rate (tokens per second).
+TOKEN_BUCKET_SCRIPT = """
+local now = tonumber(ARGV[1])
+local cost = tonumber(ARGV[2])
+local levels = {}
+local allowed = 1
+
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[1 + i * 2])
+    local rate = tonumber(ARGV[2 + i * 2])
+    local bucket = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(bucket[1]) or capacity
+    local ts = tonumber(bucket[2]) or now
+
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    levels[i] = tokens
+    if tokens < cost then
+        allowed = 0
+    end
+end
+
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[1 + i * 2])
+    local rate = tonumber(ARGV[2 + i * 2])
+    local tokens = levels[i]
+    if allowed == 1 then
+        tokens = tokens - cost
+    end
+    redis.call('HSET', key, 'tokens', tokens, 'ts', now)
+    -- An untouched bucket is full again after capacity / rate seconds
+    redis.call('EXPIRE', key, math.ceil(capacity / rate) + 60)
+end
+
+return allowed
+"""
+
+
+class ParseQuota:
+    """
+    Token-bucket quota on resume parsing work.
+
+    Each parse draws from a per-user bucket and, for recruiter accounts, a
+    per-company bucket. Buckets are kept per scope in RESUME_PARSE_QUOTAS.
+    """
+
+    KEY_PREFIX = 'parse_quota'
+
+    def __init__(self):
+        self._script = None
+
+    def consume(self, user, scope='interactive', cost=1):
+        """
+        Take ``cost`` tokens for ``user`` in ``scope``.
+
+        Returns:
+            True if the parse may run now, False if it should be deferred
+        """
+        buckets = self._buckets_for(user, scope)
+
+        keys = []
+        args = [time.time(), cost]
+        for key, limits in buckets:
+            keys.append(key)
+            args.extend([limits['capacity'], limits['refill_per_hour'] / 3600.0])
+
+        try:
+            return bool(self._get_script()(keys=keys, args=args))
+        except Exception as e:
+            # Quotas protect latency, not correctness; never block uploads
+            # because Redis is unavailable.
+            logger.warning("Parse quota check failed, allowing parse: %s", e)
+            return True
+
+    def _buckets_for(self, user, scope):
+        """Return (key, limits) pairs for every bucket the user draws from."""
+        limits = settings.RESUME_PARSE_QUOTAS[scope]
+        buckets = [(f"{self.KEY_PREFIX}:{scope}:user:{user.pk}", limits['user'])]
+
+        if user.account_type == 'company':
+            company = getattr(user, 'company_profile', None)
+            if company is not None:
+                buckets.append(
+                    (f"{self.KEY_PREFIX}:{scope}:company:{company.pk}", limits['company'])
+                )
+
+        return buckets
+
+    def _get_script(self):
+        """Register the Lua script once; redis-py caches it by SHA."""
+        if self._script is None:
+            self._script = get_redis_connection().register_script(TOKEN_BUCKET_SCRIPT)
+        return self._script
+
+
+# Global quota instance
+parse_quota = ParseQuota()
@@ -0,0 +1,152 @@
+import re
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+
+# Every repetition below is bounded so no input can trigger catastrophic
+# backtracking: the work per start position is capped by the bounds, and a
+# scan stays linear in the length of the text.
+MONTH = (
+    r'(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|'
+    r'aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?'
+)
+YEAR = r'(?:19|20)\d{2}'
+RANGE_POINT = rf'(?:{MONTH}\s{{0,3}}{YEAR}|\d{{1,2}}/{YEAR}|{YEAR})'
+RANGE_END = rf'(?:{RANGE_POINT}|present|current|now|date)'
+
+CONTACT_AND_EXPERIENCE_PATTERN = re.compile(
+    '|'.join([
+        # john.doe@example.com (RFC 5321 length limits)
+        r'(?P<email>(?<![\w.%+-])[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9-]{1,63}'
+        r'(?:\.[A-Za-z0-9-]{1,63}){0,8}\.[A-Za-z]{2,24}(?![\w-]))',
+        # linkedin.com/in/handle, www.linkedin.com/in/handle
+        r'(?P<linkedin>(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/in/[\w%-]{1,100}/?)',
+        # github.com/handle
+        r'(?P<github>(?:https?://)?(?:www\.)?github\.com/[A-Za-z0-9-]{1,39}(?![A-Za-z0-9-]))',
+        # Jan 2018 - Mar 2021, 03/2015 to present, 2012 – 2016
+        rf'(?P<date_range>(?<![\w/])(?P<range_start>{RANGE_POINT})\s{{0,3}}'
+        rf'(?:-|–|—|to|until)\s{{0,3}}(?P<range_end>{RANGE_END})(?!\w))',
+        # 5 years of experience, 3+ years' experience
+        r'(?P<stated_years>(?<![\d.])(?P<years_before>\d{1,2}(?:\.\d{1,2})?)\s{0,3}\+?\s{0,3}'
+        r"years?'?\s{0,3}(?:of\s{1,3})?(?:professional\s{1,3}|relevant\s{1,3}|work\s{1,3})?experience)",
+        # experience of 5 years
+        r'(?P<stated_years_after>experience\s{0,3}(?:of\s{1,3})?'
+        r'(?P<years_after>\d{1,2}(?:\.\d{1,2})?)\s{0,3}\+?\s{0,3}years?)',
+        # +234 803 123 4567, +44 (20) 7946 0958
+        r'(?P<intl_phone>(?<![\w+])\+\d{1,3}(?:[\s.-]{0,2}\(?\d{1,4}\)?){2,5}(?!\d))',
+        # (555) 123-4567, 555.123.4567
+        r'(?P<phone>(?<![\w+])\(?\d{3}\)?[\s.-]{0,2}\d{3}[\s.-]{0,2}\d{4}(?!\d))',
+    ]),
+    re.IGNORECASE,
+)
+
+MONTH_NUMBERS = {
+    month: number for number, month in enumerate(
+        ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'],
+        start=1,
+    )
+}
+YEAR_PATTERN = re.compile(YEAR)
+PRESENT_WORDS = {'present', 'current', 'now', 'date'}
+
+
+def normalize_phone(raw: str, default_calling_code: str = '1') -> Optional[str]:
+    """
+    Return ``raw`` as an E.164 number (``+<country><subscriber>``).
+
+    Numbers without a ``+`` prefix are assumed to be local to
+    ``default_calling_code``. Returns None for digit counts E.164 rejects.
+    """
+    digits = ''.join(char for char in raw if char.isdigit())
+    if raw.lstrip().startswith('+'):
+        number = digits
+    elif len(digits) == 10:
+        number = default_calling_code + digits
+    elif len(digits) == 11 and digits.startswith(default_calling_code):
+        number = digits
+    else:
+        return None
+
+    if not 8 <= len(number) <= 15:
+        return None
+    return f'+{number}'
+
+
+def _month_index(point: str, today: date) -> int:
+    """Return a range endpoint as a month count (year * 12 + month)."""
+    lowered = point.lower()
+    if lowered in PRESENT_WORDS:
+        return today.year * 12 + today.month - 1
+
+    year = int(YEAR_PATTERN.search(point).group())
+    if '/' in point:
+        month = int(point.split('/')[0])
+    else:
+        month = MONTH_NUMBERS.get(lowered[:3], 1)
+    return year * 12 + min(max(month, 1), 12) - 1
+
+
+def _merged_years(ranges: List[Tuple[int, int]]) -> float:
+    """Total years covered by month ranges, counting overlaps once."""
+    total = 0
+    current_start = current_end = None
+    for start, end in sorted(ranges):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return round(total / 12, 1)
+
+
+def scan_text(text: str, default_calling_code: str = '1', today: Optional[date] = None) -> Dict:
+    """
+    Extract contact details and experience from ``text`` in a single pass.
+
+    Returns:
+        Dict with ``contact_info`` (email, phone in E.164, linkedin, github)
+        and ``experience_years``. Explicitly stated years of experience take
+        precedence; otherwise employment date ranges are merged and summed.
+    """
+    today = today or date.today()
+    contact_info: Dict[str, str] = {}
+    stated_years: List[float] = []
+    ranges: List[Tuple[int, int]] = []
+
+    for match in CONTACT_AND_EXPERIENCE_PATTERN.finditer(text):
+        kind = match.lastgroup
+
+        if kind in ('email', 'linkedin', 'github'):
+            contact_info.setdefault(kind, match.group(kind))
+        elif kind in ('phone', 'intl_phone'):
+            if 'phone' not in contact_info:
+                phone = normalize_phone(match.group(kind), default_calling_code)
+                if phone:
+                    contact_info['phone'] = phone
+        elif kind == 'stated_years':
+            stated_years.append(float(match.group('years_before')))
+        elif kind == 'stated_years_after':
+            stated_years.append(float(match.group('years_after')))
+        elif kind == 'date_range':
+            start = _month_index(match.group('range_start'), today)
+            end = _month_index(match.group('range_end'), today)
+            if YEAR_PATTERN.fullmatch(match.group('range_end')) is None:
+                # Month-precise ends are inclusive ("Jan - Jan 2020" is a month)
+                end += 1
+            if start < end:
+                ranges.append((start, end))
+
+    if stated_years:
+        experience_years = max(stated_years)
+    elif ranges:
+        experience_years = _merged_years(ranges)
+    else:
+        experience_years = None
+
+    return {
+        'contact_info': contact_info,
+        'experience_years': experience_years,
+    }
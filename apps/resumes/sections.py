@@ -0,0 +1,143 @@
+import re
+from collections import Counter
+from typing import Iterator, List, Tuple
+
+
+# Header line -> canonical section name. Text before the first recognised
+# header belongs to the "general" section.
+SECTION_HEADERS = {
+    'experience': [
+        'experience', 'work experience', 'professional experience', 'employment',
+        'employment history', 'work history', 'career history',
+    ],
+    'education': [
+        'education', 'academic background', 'academic history', 'qualifications',
+        'education and training',
+    ],
+    'skills': [
+        'skills', 'technical skills', 'core competencies', 'competencies',
+        'key skills', 'technologies', 'tools',
+    ],
+    'summary': ['summary', 'professional summary', 'profile', 'objective', 'about me'],
+    'projects': ['projects', 'personal projects', 'selected projects'],
+    'certifications': ['certifications', 'certificates', 'licenses', 'awards'],
+    'other': ['languages', 'interests', 'hobbies', 'references', 'volunteering'],
+}
+
+HEADER_LOOKUP = {
+    header: section for section, headers in SECTION_HEADERS.items() for header in headers
+}
+
+# Headers are short lines, optionally followed by a colon
+HEADER_PATTERN = re.compile(r'^\s*([A-Za-z][A-Za-z &]{1,40}?)\s*:?\s*$')
+
+# Extracted PDF text separates pages with a form feed. Page headers and
+# footers are looked for among this many non-blank lines at the top and
+# bottom of each page.
+PAGE_BREAK = '\f'
+PAGE_EDGE_LINES = 3
+
+DIGITS = re.compile(r'\d+')
+
+
+def detect_header(line: str):
+    """Return the canonical section for a header line, else None."""
+    match = HEADER_PATTERN.match(line)
+    if not match:
+        return None
+    return HEADER_LOOKUP.get(' '.join(match.group(1).lower().split()))
+
+
+def _edge_key(line: str) -> str:
+    """Compare header/footer lines ignoring spacing and page numbers."""
+    return DIGITS.sub('#', ' '.join(line.split()))
+
+
+def _edge_indexes(lines: List[str]) -> List[int]:
+    """Indexes of the top and bottom PAGE_EDGE_LINES non-blank lines of a page."""
+    filled = [index for index, line in enumerate(lines) if line.strip()]
+    return sorted(set(filled[:PAGE_EDGE_LINES] + filled[-PAGE_EDGE_LINES:]))
+
+
+def _drop_boilerplate(text: str) -> List[str]:
+    """
+    Split ``text`` into lines without repeated page headers and footers.
+
+    A line is a header or footer when it sits at the top or bottom of more
+    than half the pages. Its first occurrence is kept; the same text in the
+    body of a page, or in text without page breaks, is never dropped.
+    """
+    pages = [page.splitlines() for page in text.split(PAGE_BREAK)]
+    if len(pages) < 2:
+        return pages[0]
+
+    edges = [_edge_indexes(lines) for lines in pages]
+    counts = Counter()
+    for lines, indexes in zip(pages, edges):
+        counts.update({_edge_key(lines[index]) for index in indexes})
+    boilerplate = {key for key, count in counts.items() if count * 2 > len(pages)}
+
+    seen = set()
+    kept = []
+    for lines, indexes in zip(pages, edges):
+        indexes = set(indexes)
+        for index, line in enumerate(lines):
+            if index in indexes:
+                key = _edge_key(line)
+                if key in boilerplate:
+                    if key in seen:
+                        continue
+                    seen.add(key)
+            kept.append(line)
+    return kept
+
+
+def _chunk_lines(lines: List[str], chunk_size: int) -> Iterator[str]:
+    """Group lines into chunks of at most ``chunk_size`` characters."""
+    chunk: List[str] = []
+    length = 0
+    for line in lines:
+        # A single oversized line (no newlines in the source) is cut at spaces
+        while len(line) > chunk_size:
+            cut = line.rfind(' ', 0, chunk_size)
+            cut = cut if cut > 0 else chunk_size
+            if chunk:
+                yield '\n'.join(chunk)
+                chunk, length = [], 0
+            yield line[:cut]
+            line = line[cut:].lstrip()
+
+        if chunk and length + len(line) + 1 > chunk_size:
+            yield '\n'.join(chunk)
+            chunk, length = [], 0
+        chunk.append(line)
+        length += len(line) + 1
+
+    if chunk:
+        yield '\n'.join(chunk)
+
+
+def split_sections(text: str, chunk_size: int) -> Iterator[Tuple[str, str]]:
+    """
+    Split resume text into ``(section, chunk)`` pairs.
+
+    Chunks follow section boundaries and never exceed ``chunk_size``
+    characters, so the NLP pipeline's peak memory is bounded by the chunk
+    size rather than the length of the whole resume.
+    """
+    section = 'general'
+    lines: List[str] = []
+
+    for line in _drop_boilerplate(text):
+        header = detect_header(line)
+        if header:
+            if any(existing.strip() for existing in lines):
+                for chunk in _chunk_lines(lines, chunk_size):
+                    yield section, chunk
+            section, lines = header, [line]
+        else:
+            lines.append(line)
+
+    if any(existing.strip() for existing in lines):
+        for chunk in _chunk_lines(lines, chunk_size):
+            yield section, chunk
@@ -0,0 +1,123 @@
+"""
+Synthetic resume corpus for parser benchmarks and scale testing.
+
+Texts are generated from a seeded ``random.Random`` so every run of a
+benchmark sees exactly the same corpus.
+"""
+import random
+from typing import Iterator, List
+
+
+FIRST_NAMES = [
+    'Ada', 'Chinedu', 'Maria', 'Kenji', 'Fatima', 'Liam', 'Priya', 'Olu',
+    'Sofia', 'Ethan', 'Amara', 'Lucas', 'Yuki', 'Noah', 'Zara', 'Tunde',
+]
+LAST_NAMES = [
+    'Okafor', 'Smith', 'Garcia', 'Tanaka', 'Bello', 'Murphy', 'Patel',
+    'Adeyemi', 'Rossi', 'Nguyen', 'Eze', 'Schmidt', 'Kowalski', 'Silva',
+]
+ROLES = [
+    'Software Engineer', 'Backend Developer', 'Data Scientist', 'DevOps Engineer',
+    'Frontend Developer', 'Machine Learning Engineer', 'Product Manager',
+    'Site Reliability Engineer', 'Full Stack Developer', 'Data Engineer',
+]
+COMPANIES = [
+    'Acme Corp', 'Globex', 'Initech', 'Umbrella Labs', 'Stark Industries',
+    'Wayne Enterprises', 'Hooli', 'Pied Piper', 'Cyberdyne Systems', 'Soylent',
+]
+SKILLS = [
+    'Python', 'JavaScript', 'Java', 'Go', 'Rust', 'React', 'Angular', 'Vue',
+    'Django', 'Flask', 'FastAPI', 'SQL', 'PostgreSQL', 'MongoDB', 'Redis',
+    'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'Terraform', 'Git',
+    'Linux', 'Bash', 'TensorFlow', 'PyTorch', 'Pandas', 'NumPy', 'NLP',
+]
+DEGREES = [
+    'Bachelor of Science in Computer Science',
+    'Bachelor of Arts in Economics',
+    'Master of Science in Data Science',
+    'MBA in Technology Management',
+    'PhD in Machine Learning',
+    'BS in Software Engineering',
+    'MS in Electrical Engineering',
+]
+INSTITUTIONS = [
+    'University of Lagos', 'Stanford University', 'Imperial College London',
+    'University of Toronto', 'Massachusetts Institute of Technology',
+    'Covenant University', 'Technical University of Munich', 'Kyoto University',
+]
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+DUTIES = [
+    'Designed and built REST APIs serving millions of requests per day.',
+    'Led migration of legacy services to containerised cloud infrastructure.',
+    'Improved data pipeline throughput by optimising batch processing jobs.',
+    'Mentored junior developers and ran weekly code review sessions.',
+    'Built dashboards and reporting tools used by the operations team.',
+    'Owned on-call rotation and reduced incident response time.',
+    'Developed machine learning models for ranking and recommendation.',
+]
+
+
+def _phone(rng: random.Random) -> str:
+    """Return a phone number in one of several local/international formats."""
+    formats = [
+        '{a}-{b}-{c}',
+        '({a}) {b}-{c}',
+        '+1 {a} {b} {c}',
+        '+234 80{d} {b} {c}',
+        '+44 20 {c} {c}',
+    ]
+    return rng.choice(formats).format(
+        a=rng.randint(200, 999), b=rng.randint(200, 999),
+        c=rng.randint(1000, 9999), d=rng.randint(1, 9),
+    )
+
+
+def generate_resume_text(rng: random.Random) -> str:
+    """Return one plausible plain-text resume."""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    handle = f"{first}{last}".lower()
+    years = rng.randint(1, 20)
+
+    lines = [
+        f"{first} {last}",
+        rng.choice(ROLES),
+        f"Email: {handle}@example.com | Phone: {_phone(rng)}",
+        f"linkedin.com/in/{handle} | github.com/{handle}",
+        "",
+        "SUMMARY",
+        f"{rng.choice(ROLES)} with {years}+ years of experience building "
+        f"reliable software with {rng.choice(SKILLS)} and {rng.choice(SKILLS)}.",
+        "",
+        "EXPERIENCE",
+    ]
+
+    end_year = 2026
+    for _ in range(rng.randint(1, 4)):
+        start_year = end_year - rng.randint(1, 5)
+        end = 'Present' if end_year == 2026 else f"{rng.choice(MONTHS)} {end_year}"
+        lines.append(f"{rng.choice(ROLES)}, {rng.choice(COMPANIES)}")
+        lines.append(f"{rng.choice(MONTHS)} {start_year} - {end}")
+        lines.extend(rng.sample(DUTIES, 2))
+        lines.append("")
+        end_year = start_year
+
+    lines.append("EDUCATION")
+    for _ in range(rng.randint(1, 2)):
+        lines.append(
+            f"{rng.choice(DEGREES)}, {rng.choice(INSTITUTIONS)}, {rng.randint(1995, 2022)}."
+        )
+
+    lines.extend(["", "SKILLS", ", ".join(rng.sample(SKILLS, rng.randint(5, 12)))])
+    return "\n".join(lines)
+
+
+def iter_corpus(size: int, seed: int = 42) -> Iterator[str]:
+    """Yield ``size`` resume texts generated from ``seed``."""
+    rng = random.Random(seed)
+    for _ in range(size):
+        yield generate_resume_text(rng)
+
+
+def synthetic_corpus(size: int, seed: int = 42) -> List[str]:
+    """Return a list of ``size`` resume texts generated from ``seed``."""
+    return list(iter_corpus(size, seed))
@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.utils import timezone
+
+from utils.helpers import get_redis_connection
+from .dedup import index_resume
+from .models import Resume
+from .parsers import resume_parser
+
+
+def parse_resume(resume, source=None):
+    """
+    Parse a resume and store the extracted data on it.
+
+    Args:
+        resume: Resume instance to parse
+        source: Upload buffer to parse from. When omitted the stored file is
+            read through the storage backend.
+
+    Returns:
+        The parser result dict
+    """
+    try:
+        if source is None:
+            with resume.file.open('rb') as stored:
+                result = resume_parser.parse_file(stored, resume.original_filename)
+        else:
+            result = resume_parser.parse_file(source, resume.original_filename)
+    except Exception as e:
+        result = {'success': False, 'error': str(e)}
+
+    if result['success']:
+        resume.parsed_text = result['text']
+        resume.skills = result.get('skills', [])
+        resume.experience_years = result.get('experience_years')
+        resume.education = result.get('education', [])
+        resume.contact_info = result.get('contact_info', {})
+        resume.status = 'parsed'
+        resume.parsed_at = timezone.now()
+    else:
+        resume.status = 'failed'
+        resume.error_message = result.get('error', 'Unknown parsing error')
+
+    resume.save()
+
+    if result['success']:
+        index_resume(resume)
+
+    return result
+
+
+def parse_resume_job(resume_id):
+    """Queue entry point: parse a stored resume by primary key."""
+    try:
+        resume = Resume.objects.get(pk=resume_id)
+    except Resume.DoesNotExist:
+        # Deleted while waiting in the queue
+        return
+
+    parse_resume(resume)
+
+
+def get_parse_queue():
+    """Return the low-priority queue for deferred (over-quota) parses."""
+    from rq import Queue
+    return Queue(settings.RESUME_PARSE_QUEUE, connection=get_redis_connection())
+
+
+def enqueue_parse(resume):
+    """Defer parsing of a stored resume to the low-priority queue."""
+    return get_parse_queue().enqueue(parse_resume_job, resume.pk)
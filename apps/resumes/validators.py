@@ -0,0 +1,211 @@
+import re
+import zipfile
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.utils.translation import gettext as _
+
+
+PDF_MAGIC = b'%PDF-'
+ZIP_MAGIC = b'PK\x03\x04'
+
+# PDF allows junk before the header and after %%EOF; readers look for
+# both markers within the first/last 1KB.
+SNIFF_WINDOW = 1024
+
+# The page total comes from the root page tree node, found by following
+# trailer /Root -> catalog /Pages through the cross-reference table, so
+# only a few small chunks of the file are read. /Count elsewhere (e.g.
+# outline dictionaries) is never consulted.
+STARTXREF_PATTERN = re.compile(rb'startxref\s+(\d+)')
+ROOT_PATTERN = re.compile(rb'/Root\s+(\d+)\s+\d+\s+R')
+PREV_PATTERN = re.compile(rb'/Prev\s+(\d+)')
+PAGES_PATTERN = re.compile(rb'/Pages\s+(\d+)\s+\d+\s+R')
+COUNT_PATTERN = re.compile(rb'/Count\s+(\d+)')
+XREF_PATTERN = re.compile(rb'\s*xref\s+')
+XREF_SUBSECTION_PATTERN = re.compile(rb'\s*(\d+)[ \t]+(\d+)[ \t]*\r?\n')
+XREF_ENTRY_PATTERN = re.compile(rb'(\d{10}) \d{5} ([nf])')
+XREF_ENTRY_SIZE = 20
+MAX_XREF_SECTIONS = 16
+OBJECT_WINDOW = 16 * 1024
+
+DOCX_REQUIRED_ENTRIES = ('[Content_Types].xml', 'word/document.xml')
+
+
+def validate_resume_file(file):
+    """
+    Check that an uploaded resume really is the PDF or DOCX its name claims.
+
+    Only the magic bytes, the PDF header/trailer and the DOCX zip central
+    directory are inspected, so legitimate files cost next to nothing while
+    zip bombs and renamed binaries are rejected before they are stored or
+    handed to the parser.
+    """
+    extension = file.name.lower().split('.')[-1]
+
+    file.seek(0)
+    head = file.read(SNIFF_WINDOW)
+
+    try:
+        if extension == 'pdf':
+            _validate_pdf(file, head)
+        elif extension == 'docx':
+            _validate_docx(file, head)
+    finally:
+        file.seek(0)
+
+
+def _validate_pdf(file, head):
+    """Validate PDF header, trailer and declared page count."""
+    if PDF_MAGIC not in head:
+        raise ValidationError(
+            _("This file is not a valid PDF document."),
+            code='invalid_pdf',
+        )
+
+    tail = _read_at(file, max(file.size - SNIFF_WINDOW, 0), SNIFF_WINDOW)
+    if b'%%EOF' not in tail:
+        raise ValidationError(
+            _("This PDF appears to be truncated or corrupted."),
+            code='truncated_pdf',
+        )
+
+    # When the page tree cannot be located cheaply (e.g. it sits in a
+    # compressed object stream) the parser's own page cap applies instead.
+    pages = _pdf_page_count(file, tail, base=head.find(PDF_MAGIC))
+    if pages is not None and pages > settings.RESUME_MAX_PDF_PAGES:
+        raise ValidationError(
+            _("PDF resumes may have at most %(pages)d pages.") % {
+                'pages': settings.RESUME_MAX_PDF_PAGES,
+            },
+            code='too_many_pages',
+        )
+
+
+def _read_at(file, offset, size):
+    file.seek(offset)
+    return file.read(size)
+
+
+def _last_match(pattern, data):
+    matches = list(pattern.finditer(data))
+    return int(matches[-1].group(1)) if matches else None
+
+
+def _pdf_page_count(file, tail, base=0):
+    """
+    Return /Count of the root page tree node, or None if it cannot be found.
+
+    ``base`` is the position of the ``%PDF-`` header; PDF offsets are
+    relative to it when junk precedes the header.
+    """
+    xref_offset = _last_match(STARTXREF_PATTERN, tail)
+    root = _last_match(ROOT_PATTERN, tail)
+    if xref_offset is None or root is None:
+        return None
+
+    catalog = _pdf_object(file, base, xref_offset, root)
+    pages = _last_match(PAGES_PATTERN, catalog) if catalog else None
+    if pages is None:
+        return None
+
+    page_tree = _pdf_object(file, base, xref_offset, pages)
+    match = COUNT_PATTERN.search(page_tree) if page_tree else None
+    return int(match.group(1)) if match else None
+
+
+def _pdf_object(file, base, xref_offset, number):
+    """Return the start of object ``number``'s body, or None."""
+    offset = _xref_lookup(file, base, xref_offset, number)
+    if offset is None or base + offset >= file.size:
+        return None
+    body = _read_at(file, base + offset, OBJECT_WINDOW)
+    if not body.startswith(b'%d ' % number):
+        return None
+    return body.split(b'endobj', 1)[0]
+
+
+def _xref_lookup(file, base, xref_offset, number):
+    """
+    Byte offset of object ``number`` from a classic cross-reference table,
+    following /Prev into earlier sections; None for cross-reference streams.
+
+    Only subsection headers and the one matching 20-byte entry are read.
+    """
+    for _section in range(MAX_XREF_SECTIONS):
+        header = XREF_PATTERN.match(_read_at(file, base + xref_offset, 64))
+        if header is None:
+            return None
+
+        position = base + xref_offset + header.end()
+        while True:
+            subsection = XREF_SUBSECTION_PATTERN.match(_read_at(file, position, 64))
+            if subsection is None:
+                break
+            first, count = int(subsection.group(1)), int(subsection.group(2))
+            entries = position + subsection.end()
+            if first <= number < first + count:
+                entry = XREF_ENTRY_PATTERN.match(
+                    _read_at(file, entries + (number - first) * XREF_ENTRY_SIZE, XREF_ENTRY_SIZE)
+                )
+                if entry is None or entry.group(2) != b'n':
+                    return None
+                return int(entry.group(1))
+            position = entries + count * XREF_ENTRY_SIZE
+
+        # Not in this section: the trailer after it may point to an older one
+        previous = PREV_PATTERN.search(_read_at(file, position, SNIFF_WINDOW))
+        if previous is None:
+            return None
+        xref_offset = int(previous.group(1))
+    return None
+
+
+def _validate_docx(file, head):
+    """Validate DOCX zip structure from its central directory only."""
+    if not head.startswith(ZIP_MAGIC):
+        raise ValidationError(
+            _("This file is not a valid DOCX document."),
+            code='invalid_docx',
+        )
+
+    try:
+        # ZipFile reads the central directory at the end of the archive;
+        # no entry is decompressed here.
+        with zipfile.ZipFile(file) as archive:
+            entries = archive.infolist()
+    except zipfile.BadZipFile:
+        raise ValidationError(
+            _("This DOCX file is corrupted."),
+            code='invalid_docx',
+        )
+
+    if len(entries) > settings.RESUME_MAX_DOCX_ENTRIES:
+        raise ValidationError(
+            _("This DOCX file contains too many parts."),
+            code='too_many_entries',
+        )
+
+    names = {entry.filename for entry in entries}
+    if not all(name in names for name in DOCX_REQUIRED_ENTRIES):
+        raise ValidationError(
+            _("This file is not a valid DOCX document."),
+            code='invalid_docx',
+        )
+
+    # zipfile never inflates an entry past its declared size, so the
+    # central directory totals bound the work the parser can be made to do.
+    uncompressed_size = 0
+    for entry in entries:
+        uncompressed_size += entry.file_size
+        ratio = entry.file_size / max(entry.compress_size, 1)
+        if ratio > settings.RESUME_MAX_COMPRESSION_RATIO:
+            raise ValidationError(
+                _("This DOCX file is not allowed (suspicious compression)."),
+                code='zip_bomb',
+            )
+
+    if uncompressed_size > settings.RESUME_MAX_DOCX_UNCOMPRESSED_SIZE:
+        raise ValidationError(
+            _("This DOCX file is too large when decompressed."),
+            code='zip_bomb',
+        )
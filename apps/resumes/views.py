@@ -2,15 +2,15 @@ import os
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.views.generic import ListView, CreateView, UpdateView, DeleteView
+from django.views.generic import ListView, CreateView, DetailView, UpdateView, DeleteView
 from django.urls import reverse_lazy
 from django.http import HttpResponse, Http404
 from django.core.files.storage import default_storage
-from django.utils import timezone
 
 from .models import Resume
 from .forms import ResumeUploadForm, ResumeEditForm
-from .parsers import resume_parser
+from .quotas import parse_quota
+from .tasks import parse_resume, enqueue_parse
 
 
 class ResumeListView(LoginRequiredMixin, ListView):
@@ -41,38 +41,21 @@ class ResumeUploadView(LoginRequiredMixin, CreateView):
         """Handle successful form submission."""
         resume = form.save()
 
-        # Start parsing in background (for now, do it synchronously)
-        try:
-            # Parse the resume
-            result = resume_parser.parse_file(
-                resume.file.path,
-                resume.original_filename
-            )
+        # Heavy uploaders are parsed later from the low-priority queue so
+        # they cannot starve everyone else's parse latency
+        if not parse_quota.consume(self.request.user, scope='interactive'):
+            enqueue_parse(resume)
+            messages.info(self.request, 'Resume uploaded! Parsing has been queued and will complete shortly.')
+            return super().form_valid(form)
+
+        # Parse straight from the upload buffer rather than re-reading
+        # the stored copy (``file.path`` does not exist on S3 storage)
+        result = parse_resume(resume, form.cleaned_data['file'])
 
-            if result['success']:
-                resume.parsed_text = result['text']
-                resume.skills = result.get('skills', [])
-                resume.experience_years = result.get('experience_years')
-                resume.education = result.get('education', [])
-                resume.contact_info = result.get('contact_info', {})
-                resume.status = 'parsed'
-                resume.parsed_at = timezone.now()
-            else:
-                resume.status = 'failed'
-                resume.error_message = result.get('error', 'Unknown parsing error')
-
-            resume.save()
-
-            if result['success']:
-                messages.success(self.request, 'Resume uploaded and parsed successfully!')
-            else:
-                messages.warning(self.request, f'Resume uploaded but parsing failed: {resume.error_message}')
-
-        except Exception as e:
-            resume.status = 'failed'
-            resume.error_message = str(e)
-            resume.save()
-            messages.warning(self.request, f'Resume uploaded but parsing failed: {str(e)}')
+        if result['success']:
+            messages.success(self.request, 'Resume uploaded and parsed successfully!')
+        else:
+            messages.warning(self.request, f'Resume uploaded but parsing failed: {resume.error_message}')
 
         return super().form_valid(form)
 
@@ -177,7 +160,7 @@ class SetPrimaryResumeView(LoginRequiredMixin, UpdateView):
         return redirect('resumes:list')
 
 
-class ResumePreviewView(LoginRequiredMixin, UpdateView):
+class ResumePreviewView(LoginRequiredMixin, DetailView):
     """Preview parsed resume content."""
     model = Resume
     template_name = 'resumes/resume_preview.html'
@@ -0,0 +1,318 @@
+"""
+CPU embedding service for screening and search.
+
+Texts are embedded in length-sorted batches capped by a token budget,
+through a sentence-transformers model whose Linear layers are dynamically
+quantized to int8. Vectors are cached in a memory-mapped float16 store
+keyed by content hash, so a text is never embedded twice.
+"""
+import hashlib
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Sequence
+
+from django.conf import settings
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+
+# Rough characters-per-token ratio of English resume text, used to size
+# batches and section chunks without running the tokenizer
+CHARS_PER_TOKEN = 4
+
+
+def content_key(text: str) -> str:
+    """Return the store key of ``text``."""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+@contextmanager
+def _exclusive_lock(file):
+    """Hold an exclusive lock on ``file`` across processes, where the OS has flock."""
+    try:
+        import fcntl
+    except ImportError:
+        # No flock (Windows): appends are serialised within this process only
+        yield
+        return
+
+    fcntl.flock(file, fcntl.LOCK_EX)
+    try:
+        yield
+    finally:
+        fcntl.flock(file, fcntl.LOCK_UN)
+
+
+class EmbeddingStore:
+    """
+    Append-only float16 vector store on disk.
+
+    ``vectors.f16`` holds one row per embedded text and is read through a
+    memory map, so workers share the page cache instead of each loading
+    the store. ``keys.txt`` holds the content hash of each row in order,
+    and ``dimension`` the vector size, so a warm store is usable without
+    loading the model.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._vectors_path = self.path / 'vectors.f16'
+        self._keys_path = self.path / 'keys.txt'
+        self._dimension_path = self.path / 'dimension'
+        self.dimension: Optional[int] = None
+        self._keys: List[str] = []
+        self._keys_offset = 0
+        self._rows: Dict[str, int] = {}
+        self._vectors = None
+        self._lock = threading.Lock()
+        self._reload()
+
+    @property
+    def _row_bytes(self) -> int:
+        return self.dimension * 2
+
+    def _reload(self):
+        """Pick up rows appended since the last load (possibly by other processes)."""
+        import numpy as np
+
+        if self.dimension is None:
+            if not self._dimension_path.exists():
+                # Nothing has been stored yet
+                return
+            self.dimension = int(self._dimension_path.read_text())
+
+        # keys.txt only grows, so read just what was appended since last time,
+        # up to the last complete line in case a writer is mid-append
+        with open(self._keys_path, 'rb') as keys_file:
+            keys_file.seek(self._keys_offset)
+            appended = keys_file.read()
+        end = appended.rfind(b'\n') + 1
+        self._keys.extend(appended[:end].decode('ascii').split())
+        self._keys_offset += end
+
+        # Vectors are written before keys, so a row whose key exists is complete
+        count = min(len(self._keys), os.path.getsize(self._vectors_path) // self._row_bytes)
+        if count == len(self._rows):
+            return
+        for row in range(len(self._rows), count):
+            self._rows[self._keys[row]] = row
+        self._vectors = np.memmap(
+            self._vectors_path, dtype=np.float16, mode='r', shape=(count, self.dimension)
+        )
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, 'np.ndarray']:
+        """Return the stored vectors (as float32) for the keys that are present."""
+        import numpy as np
+
+        with self._lock:
+            if any(key not in self._rows for key in keys):
+                self._reload()
+            return {
+                key: np.asarray(self._vectors[self._rows[key]], dtype=np.float32)
+                for key in keys if key in self._rows
+            }
+
+    def put_many(self, items: Dict[str, 'np.ndarray']) -> None:
+        """Append vectors for keys not stored yet."""
+        import numpy as np
+
+        with self._lock, open(self._keys_path, 'a') as keys_file, _exclusive_lock(keys_file):
+            # Serialise appends across worker processes
+            self._reload()
+            new = [(key, vector) for key, vector in items.items() if key not in self._rows]
+            if not new:
+                return
+
+            block = np.stack([vector for _key, vector in new]).astype(np.float16)
+            if self.dimension is None:
+                # First write; also discards files left by a store without
+                # a dimension record, whose rows cannot be read back
+                keys_file.truncate(0)
+                self._vectors_path.write_bytes(b'')
+                self.dimension = block.shape[1]
+                self._dimension_path.write_text(f'{self.dimension}\n')
+            elif block.shape[1] != self.dimension:
+                raise ValueError(
+                    f'Vectors have {block.shape[1]} dimensions, the store holds {self.dimension}'
+                )
+
+            with open(self._vectors_path, 'r+b') as vectors_file:
+                # Drop any partial row left by an interrupted writer
+                vectors_file.truncate(len(self._rows) * self._row_bytes)
+                vectors_file.seek(0, os.SEEK_END)
+                vectors_file.write(block.tobytes())
+            keys_file.write(''.join(f'{key}\n' for key, _vector in new))
+            keys_file.flush()
+            self._reload()
+
+
+class EmbeddingService:
+    """
+    Sentence embeddings on CPU.
+
+    The model loads on first use. Long resumes are split by section,
+    each chunk is truncated to the model's sequence length, and the chunk
+    vectors are mean-pooled (weighted by length) into one resume vector.
+    """
+
+    def __init__(self, model_name: Optional[str] = None, threads: Optional[int] = None,
+                 quantize: Optional[bool] = None, batch_tokens: Optional[int] = None,
+                 max_tokens: Optional[int] = None, use_store: bool = True, store_dir=None):
+        self.model_name = model_name or settings.EMBEDDING_MODEL
+        self.threads = threads or settings.EMBEDDING_THREADS
+        self.quantize = settings.EMBEDDING_QUANTIZE if quantize is None else quantize
+        self.batch_tokens = batch_tokens or settings.EMBEDDING_BATCH_TOKENS
+        self.max_tokens = max_tokens or settings.EMBEDDING_MAX_TOKENS
+        self.use_store = use_store
+        self.store_dir = Path(store_dir or settings.EMBEDDING_STORE_DIR)
+
+        self._model = None
+        self._store = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        """The loaded (and optionally quantized) sentence-transformers model."""
+        with self._lock:
+            if self._model is None:
+                self._model = self._load_model()
+            return self._model
+
+    def _load_model(self):
+        # torch and sentence-transformers add seconds to startup; import on use
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        torch.set_num_threads(self.threads)
+        model = SentenceTransformer(self.model_name, device='cpu')
+        model.max_seq_length = self.max_tokens
+        model.eval()
+        if self.quantize:
+            # int8 weights for every Linear layer; activations are quantized
+            # on the fly, so no calibration data is needed
+            torch.ao.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+            )
+        logger.info(
+            "Loaded embedding model %s (%s, %d threads)",
+            self.model_name, 'int8' if self.quantize else 'fp32', self.threads,
+        )
+        return model
+
+    @property
+    def store(self) -> Optional[EmbeddingStore]:
+        """Vector store for this model and precision, or None when disabled."""
+        if not self.use_store:
+            return None
+        if self._store is None:
+            variant = f"{self.model_name.replace('/', '__')}-{'int8' if self.quantize else 'fp32'}"
+            self._store = EmbeddingStore(self.store_dir / variant)
+        return self._store
+
+    @property
+    def dimension(self) -> int:
+        """Embedding size, read from the store when it has one so the model is not loaded."""
+        store = self.store
+        if store is not None and store.dimension is not None:
+            return store.dimension
+        return self.model.get_sentence_embedding_dimension()
+
+    def _batches(self, texts: List[str]) -> Iterator[List[int]]:
+        """
+        Yield index batches of ``texts`` sorted by length.
+
+        Similar lengths keep padding low, and each batch is capped at
+        ``batch_tokens`` padded tokens so short texts go in large batches
+        and long ones in small batches.
+        """
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        batch: List[int] = []
+        for index in order:
+            tokens = min(len(texts[index]) // CHARS_PER_TOKEN + 1, self.max_tokens)
+            # Sorted ascending, so the newest text is the longest in the batch
+            if batch and (len(batch) + 1) * tokens > self.batch_tokens:
+                yield batch
+                batch = []
+            batch.append(index)
+        if batch:
+            yield batch
+
+    def embed_texts(self, texts: Sequence[str]) -> 'np.ndarray':
+        """
+        Return L2-normalised float32 embeddings, one row per text.
+
+        Texts already in the store are not re-embedded, and duplicates
+        within ``texts`` are embedded once.
+        """
+        import numpy as np
+
+        if not texts:
+            return np.empty((0, self.dimension), dtype=np.float32)
+
+        keys = [content_key(text) for text in texts]
+        store = self.store
+        vectors = store.get_many(keys) if store is not None else {}
+
+        pending = {key: text for key, text in zip(keys, texts) if key not in vectors}
+        if pending:
+            pending_keys = list(pending)
+            pending_texts = [pending[key] for key in pending_keys]
+            computed = {}
+            for batch in self._batches(pending_texts):
+                encoded = self.model.encode(
+                    [pending_texts[i] for i in batch],
+                    batch_size=len(batch),
+                    convert_to_numpy=True,
+                    normalize_embeddings=True,
+                )
+                for i, vector in zip(batch, encoded):
+                    computed[pending_keys[i]] = vector
+            if store is not None:
+                store.put_many(computed)
+            vectors.update(computed)
+
+        return np.stack([vectors[key] for key in keys]).astype(np.float32)
+
+    def _resume_chunks(self, text: str) -> List[str]:
+        """Split a resume into section chunks that fit the model's window."""
+        from apps.resumes.sections import split_sections
+
+        chunk_size = self.max_tokens * CHARS_PER_TOKEN
+        return [chunk for _section, chunk in split_sections(text, chunk_size) if chunk.strip()]
+
+    def embed_resumes(self, texts: Sequence[str]) -> 'np.ndarray':
+        """Return one pooled, L2-normalised embedding per resume text."""
+        import numpy as np
+
+        chunks_per_resume = [self._resume_chunks(text) or [text] for text in texts]
+        flat = [chunk for chunks in chunks_per_resume for chunk in chunks]
+        vectors = self.embed_texts(flat)
+
+        pooled = []
+        start = 0
+        for chunks in chunks_per_resume:
+            block = vectors[start:start + len(chunks)]
+            start += len(chunks)
+            weights = np.array([len(chunk) for chunk in chunks], dtype=np.float32)
+            vector = (block * weights[:, None]).sum(axis=0) / weights.sum()
+            norm = np.linalg.norm(vector)
+            pooled.append(vector / norm if norm else vector)
+        return np.stack(pooled) if pooled else vectors
+
+    def embed_resume(self, text: str) -> 'np.ndarray':
+        """Return the pooled embedding of a single resume."""
+        return self.embed_resumes([text])[0]
+
+
+embedding_service = EmbeddingService()
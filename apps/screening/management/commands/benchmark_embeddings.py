@@ -0,0 +1,95 @@
+import multiprocessing
+import tempfile
+import time
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.resumes import preload
+from apps.resumes.synthetic import synthetic_corpus
+
+
+MB = 1024 * 1024
+
+
+def _run_config(config, texts):
+    """Child process task: load one configuration and time it on ``texts``."""
+    from apps.screening.embeddings import EmbeddingService
+
+    before = preload.memory_report()['rss']
+    with tempfile.TemporaryDirectory() as store_dir:
+        service = EmbeddingService(
+            threads=config['threads'],
+            quantize=config['quantize'],
+            batch_tokens=config['batch_tokens'],
+            store_dir=store_dir,
+        )
+        # Warm up so model loading and first-call allocation are not timed
+        service.embed_texts(['warm up'])
+        loaded = preload.memory_report()['rss']
+
+        start = time.perf_counter()
+        service.embed_resumes(texts)
+        cold = time.perf_counter() - start
+
+        # Every chunk is now in the store: this pass measures cache hits
+        start = time.perf_counter()
+        service.embed_resumes(texts)
+        cached = time.perf_counter() - start
+
+    return {
+        'texts_per_sec': len(texts) / cold,
+        'cached_per_sec': len(texts) / cached,
+        'model_mb': (loaded - before) / MB,
+        'rss_mb': preload.memory_report()['rss'] / MB,
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the embedding service on the synthetic resume corpus and '
+        'report texts/sec and memory per precision, thread count and batch size.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--docs', type=int, default=200, help='Number of synthetic resumes.')
+        parser.add_argument('--seed', type=int, default=42, help='Corpus random seed.')
+        parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4], help='torch thread counts.')
+        parser.add_argument(
+            '--batch-tokens',
+            type=int,
+            nargs='+',
+            default=[4096, 8192],
+            help='Padded tokens per inference batch.',
+        )
+        parser.add_argument('--no-fp32', action='store_true', help='Skip the unquantized baseline.')
+
+    def handle(self, *args, **options):
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            raise CommandError('The benchmark runs each configuration in a forked process (Linux/macOS).')
+
+        corpus = synthetic_corpus(options['docs'], options['seed'])
+        self.stdout.write(f'Corpus: {len(corpus)} docs, seed {options["seed"]}')
+
+        precisions = [True] if options['no_fp32'] else [False, True]
+        configs = [
+            {'quantize': quantize, 'threads': threads, 'batch_tokens': batch_tokens}
+            for quantize in precisions
+            for threads in options['threads']
+            for batch_tokens in options['batch_tokens']
+        ]
+
+        # A fresh process per configuration so memory figures do not include
+        # models loaded by earlier runs
+        context = multiprocessing.get_context('fork')
+        self.stdout.write('')
+        self.stdout.write(
+            f'{"precision":<10} {"threads":>7} {"batch tok":>10} {"texts/sec":>10} '
+            f'{"cached/sec":>11} {"model MB":>9} {"rss MB":>8}'
+        )
+        for config in configs:
+            with context.Pool(1) as pool:
+                result = pool.apply(_run_config, (config, corpus))
+            self.stdout.write(
+                f'{"int8" if config["quantize"] else "fp32":<10} {config["threads"]:>7} '
+                f'{config["batch_tokens"]:>10} {result["texts_per_sec"]:>10.1f} '
+                f'{result["cached_per_sec"]:>11.1f} {result["model_mb"]:>9.0f} {result["rss_mb"]:>8.0f}'
+            )
@@ -0,0 +1,46 @@
+# gunicorn configuration for HireSight
+#   gunicorn -c gunicorn.conf.py hiresight.wsgi
+#
+# The app and the resume parser models are loaded once in the master and
+# shared copy-on-write by every worker (see apps/resumes/preload.py).
+import multiprocessing
+import os
+import shutil
+
+from decouple import config
+
+bind = config('GUNICORN_BIND', default='127.0.0.1:8000')
+workers = config('GUNICORN_WORKERS', default=multiprocessing.cpu_count() * 2 + 1, cast=int)
+preload_app = True
+
+# Workers write metric values here and /metrics merges them; must be set
+# before prometheus_client is imported (i.e. before the app loads)
+os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR',
+    config('PROMETHEUS_MULTIPROC_DIR', default='/tmp/hiresight-metrics'),
+)
+
+
+def on_starting(server):
+    # Values from a previous run would otherwise be merged into this one
+    metrics_dir = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir)
+
+
+def when_ready(server):
+    from apps.resumes import preload
+    preload.when_ready(server)
+
+
+def post_fork(server, worker):
+    from apps.monitoring.sampler import start_sampler
+    from apps.resumes import preload
+    preload.post_fork(server, worker)
+    # Sampler threads do not survive fork; each worker runs its own
+    start_sampler()
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
@@ -62,16 +62,20 @@ INSTALLED_APPS = [
     'apps.messages',
     'apps.following',
     'apps.analytics',
+    'apps.monitoring',
 ]
 
 MIDDLEWARE = [
+    'apps.monitoring.middleware.RequestIDMiddleware',
+    'apps.monitoring.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'csp.middleware.CSPMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.accounts.middleware.CachedAuthenticationMiddleware',
     'axes.middleware.AxesMiddleware',
+    'apps.monitoring.middleware.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -186,9 +190,14 @@ CONTENT_SECURITY_POLICY = {
 # Authentication backends
 AUTHENTICATION_BACKENDS = [
     'axes.backends.AxesStandaloneBackend',
+    'apps.accounts.backends.ProfileModelBackend',
+    # Kept so sessions logged in before ProfileModelBackend stay valid
     'django.contrib.auth.backends.ModelBackend',
 ]
 
+# Logged-in users (with their profile) are cached per session for this many seconds
+AUTH_USER_CACHE_TTL = config('AUTH_USER_CACHE_TTL', default=300, cast=int)
+
 # Django Axes (Account Lockout)
 AXES_FAILURE_LIMIT = 5  # Number of login attempts before lockout
 AXES_COOLOFF_TIME = 1  # Hours to wait after lockout
@@ -197,15 +206,22 @@ AXES_RESET_ON_SUCCESS = True
 AXES_LOCKOUT_PARAMETERS = ['username', 'ip_address']
 
 # Cache configuration for django-ratelimit
+REDIS_URL = config('REDIS_URL', default='redis://127.0.0.1:6379/1')
+
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
-        'LOCATION': config('REDIS_URL', default='redis://127.0.0.1:6379/1'),
+        'BACKEND': 'apps.monitoring.cache.InstrumentedRedisCache',
+        'LOCATION': REDIS_URL,
     }
 }
 
 # Rate Limiting
+# Set RATELIMIT_ENABLE=False only for local load tests (monitoring/loadtest.py)
+RATELIMIT_ENABLE = config('RATELIMIT_ENABLE', default=True, cast=bool)
 RATELIMIT_VIEW = 'accounts.views.ratelimit_view'
+# InstrumentedRedisCache is a RedisCache subclass, so counters are still shared
+# between workers; django_ratelimit only recognises the stock backend paths
+SILENCED_SYSTEM_CHECKS = ['django_ratelimit.W001']
 
 # Password Validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -239,10 +255,109 @@ EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='noreply@hiresight.com')
 
 # Session Settings
-SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+# Sessions live in the Redis cache; write-through also keeps them in django_session.
+# Expiry is pushed forward at most once per SESSION_REFRESH_INTERVAL seconds.
+SESSION_ENGINE = 'apps.accounts.sessions'
+SESSION_CACHE_ALIAS = 'default'
+SESSION_DB_WRITE_THROUGH = config('SESSION_DB_WRITE_THROUGH', default=False, cast=bool)
+SESSION_REFRESH_INTERVAL = config('SESSION_REFRESH_INTERVAL', default=300, cast=int)
 SESSION_COOKIE_AGE = 1209600  # 2 weeks
 SESSION_EXPIRE_AT_BROWSER_CLOSE = False
-SESSION_SAVE_EVERY_REQUEST = True
+SESSION_SAVE_EVERY_REQUEST = False
+
+# Cached unread notification counts are rebuilt from the database after this many seconds
+NOTIFICATION_UNREAD_CACHE_TTL = config('NOTIFICATION_UNREAD_CACHE_TTL', default=3600, cast=int)
+
+# Resume Upload Limits (enforced before the file is stored or parsed)
+RESUME_MAX_PDF_PAGES = config('RESUME_MAX_PDF_PAGES', default=30, cast=int)
+RESUME_MAX_DOCX_ENTRIES = config('RESUME_MAX_DOCX_ENTRIES', default=500, cast=int)
+RESUME_MAX_DOCX_UNCOMPRESSED_SIZE = config('RESUME_MAX_DOCX_UNCOMPRESSED_SIZE', default=50 * 1024 * 1024, cast=int)
+RESUME_MAX_COMPRESSION_RATIO = config('RESUME_MAX_COMPRESSION_RATIO', default=200, cast=int)
+
+# Resume Parsing
+# spaCy pipeline profile: 'fast' (tagger + senter) or 'full' (every component)
+RESUME_NLP_PROFILE = config('RESUME_NLP_PROFILE', default='fast')
+# spaCy pipeline per detected resume language, loaded on first use. Texts
+# in other languages (or without an installed model) use the default.
+RESUME_NLP_MODELS = {
+    'en': 'en_core_web_sm',
+    'es': 'es_core_news_sm',
+    'fr': 'fr_core_news_sm',
+    'de': 'de_core_news_sm',
+    'pt': 'pt_core_news_sm',
+    'it': 'it_core_news_sm',
+    'nl': 'nl_core_news_sm',
+}
+RESUME_DEFAULT_LANGUAGE = config('RESUME_DEFAULT_LANGUAGE', default='en')
+# Loaded pipelines are evicted least-recently-used first above this total
+RESUME_NLP_MEMORY_BUDGET_MB = config('RESUME_NLP_MEMORY_BUDGET_MB', default=512, cast=int)
+# Languages whose pipelines are loaded before workers fork (gunicorn
+# when_ready hook, run_parse_worker) so they are shared copy-on-write
+RESUME_PRELOAD_LANGUAGES = config('RESUME_PRELOAD_LANGUAGES', default='en', cast=lambda v: [s.strip() for s in v.split(',') if s.strip()])
+# Resume text is fed to spaCy in section-aware chunks of at most this many
+# characters, bounding peak memory per Doc
+RESUME_NLP_CHUNK_SIZE = config('RESUME_NLP_CHUNK_SIZE', default=20000, cast=int)
+# Country calling code assumed for phone numbers written without a "+"
+RESUME_DEFAULT_CALLING_CODE = config('RESUME_DEFAULT_CALLING_CODE', default='1')
+
+# Estimated Jaccard similarity above which two resumes are near-duplicates
+RESUME_DUPLICATE_THRESHOLD = config('RESUME_DUPLICATE_THRESHOLD', default=0.8, cast=float)
+
+# Resume Parse Quotas (token buckets: burst capacity + hourly refill)
+# Uploads over quota are parsed later from the low-priority queue.
+RESUME_PARSE_QUOTAS = {
+    'interactive': {
+        'user': {'capacity': 10, 'refill_per_hour': 30},
+        'company': {'capacity': 40, 'refill_per_hour': 120},
+    },
+}
+RESUME_PARSE_QUEUE = config('RESUME_PARSE_QUEUE', default='resume-parse-low')
+
+# Embedding service (apps.screening.embeddings). Linear layers are
+# dynamically quantized to int8 unless EMBEDDING_QUANTIZE is off; vectors
+# are cached on disk as float16 keyed by content hash.
+EMBEDDING_MODEL = config('EMBEDDING_MODEL', default='sentence-transformers/all-MiniLM-L6-v2')
+EMBEDDING_THREADS = config('EMBEDDING_THREADS', default=2, cast=int)
+EMBEDDING_QUANTIZE = config('EMBEDDING_QUANTIZE', default=True, cast=bool)
+# Padded tokens per inference batch, and tokens kept per text/section chunk
+EMBEDDING_BATCH_TOKENS = config('EMBEDDING_BATCH_TOKENS', default=8192, cast=int)
+EMBEDDING_MAX_TOKENS = config('EMBEDDING_MAX_TOKENS', default=256, cast=int)
+EMBEDDING_STORE_DIR = config('EMBEDDING_STORE_DIR', default=str(BASE_DIR / 'embeddings'))
+
+# Health probes (/livez, /readyz). System metrics are sampled by a
+# background thread every HEALTH_SAMPLE_INTERVAL seconds; database/cache
+# checks give up after HEALTH_CHECK_TIMEOUT and are reused for
+# HEALTH_CHECK_CACHE_TTL seconds.
+HEALTH_SAMPLE_INTERVAL = config('HEALTH_SAMPLE_INTERVAL', default=5, cast=float)
+HEALTH_CHECK_TIMEOUT = config('HEALTH_CHECK_TIMEOUT', default=0.5, cast=float)
+HEALTH_CHECK_CACHE_TTL = config('HEALTH_CHECK_CACHE_TTL', default=2, cast=float)
+
+# Prometheus scrape endpoint (/metrics): staff users, or requests with
+# "Authorization: Bearer <METRICS_TOKEN>" when a token is set
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# Request profiling. Staff add "X-Profile: 1" (or ?_profile=1) to profile a
+# request; PROFILING_SAMPLE_RATE also profiles that fraction of all
+# requests (0 disables sampling). "sample" writes collapsed stacks for
+# flame graphs, "cprofile" writes pstats files. The newest PROFILING_KEEP
+# profiles are kept, each with a JSON log of its SQL queries.
+PROFILING_MODE = config('PROFILING_MODE', default='sample')
+PROFILING_SAMPLE_RATE = config('PROFILING_SAMPLE_RATE', default=0.0, cast=float)
+PROFILING_INTERVAL = config('PROFILING_INTERVAL', default=0.005, cast=float)
+PROFILING_DIR = config('PROFILING_DIR', default=str(BASE_DIR / 'logs' / 'profiles'))
+PROFILING_KEEP = config('PROFILING_KEEP', default=200, cast=int)
+
+# Slow-query log (logger "hiresight.slow_queries"). Queries slower than
+# SLOW_QUERY_THRESHOLD_MS are logged with their call site; every
+# SLOW_QUERY_REPORT_INTERVAL seconds each process logs its top
+# SLOW_QUERY_REPORT_TOP statements by total time.
+SLOW_QUERY_THRESHOLD_MS = config('SLOW_QUERY_THRESHOLD_MS', default=100, cast=float)
+SLOW_QUERY_REPORT_INTERVAL = config('SLOW_QUERY_REPORT_INTERVAL', default=300, cast=int)
+SLOW_QUERY_REPORT_TOP = config('SLOW_QUERY_REPORT_TOP', default=10, cast=int)
+
+# Startup budget for django.setup() plus URLconf loading, checked by
+# `manage.py check_import_time`
+IMPORT_TIME_BUDGET_MS = config('IMPORT_TIME_BUDGET_MS', default=1500, cast=int)
 
 # Login Settings
 LOGIN_URL = '/accounts/login/'
@@ -253,33 +368,55 @@ LOGOUT_REDIRECT_URL = '/'
 ADMIN_URL = config('ADMIN_URL', default='admin/')
 
 # Logging
+# Handlers write through a bounded queue drained by a background thread,
+# so a slow disk never blocks a request; records beyond LOG_QUEUE_SIZE are
+# dropped and counted. LOG_FORMAT is "verbose" or "json".
+LOG_FORMAT = config('LOG_FORMAT', default='verbose')
+LOG_QUEUE_SIZE = config('LOG_QUEUE_SIZE', default=10000, cast=int)
+LOG_MAX_BYTES = config('LOG_MAX_BYTES', default=10 * 1024 * 1024, cast=int)
+LOG_BACKUP_COUNT = config('LOG_BACKUP_COUNT', default=5, cast=int)
+
+
+def _async_file_handler(filename):
+    return {
+        'level': 'INFO',
+        'class': 'apps.monitoring.log_handlers.AsyncRotatingFileHandler',
+        'filename': BASE_DIR / 'logs' / filename,
+        'maxBytes': LOG_MAX_BYTES,
+        'backupCount': LOG_BACKUP_COUNT,
+        'queue_size': LOG_QUEUE_SIZE,
+        'formatter': LOG_FORMAT,
+        'filters': ['request_id'],
+    }
+
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
     'formatters': {
         'verbose': {
-            'format': '{levelname} {asctime} {module} {process:d} {thread:d} {message}',
+            'format': '{levelname} {asctime} {module} {process:d} {thread:d} [{request_id}] {message}',
             'style': '{',
+            'defaults': {'request_id': '-'},
         },
         'simple': {
             'format': '{levelname} {message}',
             'style': '{',
         },
-    },
-    'handlers': {
-        'file': {
-            'level': 'INFO',
-            'class': 'logging.FileHandler',
-            'filename': BASE_DIR / 'logs/django.log',
-            'formatter': 'verbose',
+        'json': {
+            '()': 'apps.monitoring.log_handlers.JsonFormatter',
         },
-        'security_file': {
-            'level': 'INFO',
-            'class': 'logging.FileHandler',
-            'filename': BASE_DIR / 'logs/security.log',
-            'formatter': 'verbose',
+    },
+    'filters': {
+        'request_id': {
+            '()': 'apps.monitoring.log_handlers.RequestIDFilter',
         },
     },
+    'handlers': {
+        'file': _async_file_handler('django.log'),
+        'security_file': _async_file_handler('security.log'),
+        'slow_query_file': _async_file_handler('slow_queries.log'),
+    },
     'loggers': {
         'django': {
             'handlers': ['file'],
@@ -296,5 +433,10 @@ LOGGING = {
             'level': 'INFO',
             'propagate': False,
         },
+        'hiresight.slow_queries': {
+            'handlers': ['slow_query_file'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
\ No newline at end of file
@@ -33,6 +33,7 @@ urlpatterns = [
     path('messages/', include('apps.messages.urls')),
     path('following/', include('apps.following.urls')),
     path('analytics/', include('apps.analytics.urls')),
+    path('', include('apps.monitoring.urls')),
 ]
 
 if settings.DEBUG:
@@ -5,7 +5,7 @@
 set -e  # Exit on any error
 
 # Configuration
-HEALTH_URL="http://localhost:8000/accounts/health/"
+HEALTH_URL="http://localhost:8000/readyz"
 LOG_FILE="/home/jamesuchechi/Projects/HireSight/logs/health_monitor.log"
 TIMESTAMP=$(date +"%Y-%m-%d %H:%M:%S")
 
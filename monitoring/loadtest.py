@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Load test for the main HireSight user journeys.
+
+Each virtual user runs in its own thread with its own session: it
+registers and logs in once, then loops over dashboard, resume upload
+(which parses synchronously), resume list/preview/download/delete, profile
+and notifications until the duration or iteration count is reached.
+Deleting the uploaded resume keeps every iteration valid, so a clean run
+reports a 0% error rate.
+
+    # Against a local server; disable rate limiting for the run
+    RATELIMIT_ENABLE=False python manage.py runserver --noreload
+    python monitoring/loadtest.py run --users 20 --duration 60 --output after.json
+
+    # Compare two runs; exits 1 when a step regressed
+    python monitoring/loadtest.py compare before.json after.json
+"""
+import argparse
+import json
+import re
+import sys
+import threading
+import time
+import uuid
+from urllib.parse import urlsplit
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+PASSWORD = 'LoadTest#2026pass'
+LOGIN_PATH = '/accounts/login/'
+CSRF_PATTERN = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+RESUME_LINK_PATTERN = re.compile(r'/resumes/(\d+)/')
+PERCENTILES = (50, 90, 95, 99)
+
+RESUME_TEXT = [
+    'Load Test Candidate',
+    'Email: loadtest@example.com | Phone: (555) 123-4567',
+    'EXPERIENCE',
+    'Senior Software Engineer, Acme Corp',
+    'Jan 2018 - Present',
+    'Built Django and PostgreSQL services running on AWS with Docker.',
+    'EDUCATION',
+    'Bachelor of Science in Computer Science, University of Lagos, 2016.',
+    'SKILLS',
+    'Python, Django, SQL, Redis, Docker, Kubernetes, Git',
+]
+
+
+def make_pdf(lines):
+    """Return a small one-page PDF with ``lines`` of extractable text."""
+    escaped = (line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)') for line in lines)
+    text = ''.join(f'({line}) Tj 0 -16 Td ' for line in escaped)
+    stream = f'BT /F1 11 Tf 50 780 Td {text}ET'.encode('latin-1')
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+        b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+        b'/Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>',
+        b'<< /Length %d >>\nstream\n%s\nendstream' % (len(stream), stream),
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    ]
+
+    pdf = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    xref = len(pdf)
+    pdf += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    pdf += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    pdf += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    return bytes(pdf)
+
+
+class Stats:
+    """Thread-safe latency and error samples per journey step."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.error_samples = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def record(self, step, elapsed, error=None):
+        with self._lock:
+            self.latencies[step].append(elapsed)
+            if error is not None:
+                self.errors[step] += 1
+                if len(self.error_samples[step]) < 5:
+                    self.error_samples[step].append(error)
+
+    def summary(self, wall_time):
+        steps = {}
+        total = 0
+        total_errors = 0
+        for step, samples in self.latencies.items():
+            ordered = sorted(samples)
+            count = len(ordered)
+            total += count
+            total_errors += self.errors[step]
+            steps[step] = {
+                'requests': count,
+                'rps': round(count / wall_time, 2),
+                'error_rate': round(self.errors[step] / count, 4),
+                'mean_ms': round(sum(ordered) / count * 1000, 2),
+                **{
+                    f'p{p}_ms': round(ordered[min(count - 1, int(count * p / 100))] * 1000, 2)
+                    for p in PERCENTILES
+                },
+                'max_ms': round(ordered[-1] * 1000, 2),
+                'error_samples': self.error_samples[step],
+            }
+        return {
+            'requests': total,
+            'duration_s': round(wall_time, 2),
+            'rps': round(total / wall_time, 2) if wall_time else 0,
+            'error_rate': round(total_errors / total, 4) if total else 0,
+            'steps': steps,
+        }
+
+
+class VirtualUser:
+    """One simulated user with its own cookie session."""
+
+    def __init__(self, base_url, stats, run_id, number, timeout):
+        self.base_url = base_url.rstrip('/')
+        self.stats = stats
+        self.email = f'loadtest-{run_id}-{number}@example.com'
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.resume_pdf = make_pdf(RESUME_TEXT)
+
+    def request(self, step, method, path, expect=(200,), **kwargs):
+        """Time one request; any status outside ``expect`` counts as an error."""
+        start = time.perf_counter()
+        try:
+            response = self.session.request(
+                method, self.base_url + path, timeout=self.timeout, **kwargs
+            )
+        except requests.RequestException as e:
+            self.stats.record(step, time.perf_counter() - start, f'{type(e).__name__}: {e}')
+            return None
+        error = None if response.status_code in expect else f'HTTP {response.status_code}'
+        if error is None and response.history and urlsplit(response.url).path == LOGIN_PATH:
+            # A lost session still ends in a 200 login page
+            error = 'Redirected to login'
+        self.stats.record(step, time.perf_counter() - start, error)
+        return response
+
+    def _csrf(self, step, path):
+        response = self.request(step, 'GET', path)
+        match = CSRF_PATTERN.search(response.text) if response is not None else None
+        return match.group(1) if match else self.session.cookies.get('csrftoken', '')
+
+    def sign_up(self):
+        token = self._csrf('register_form', '/accounts/register/')
+        self.request('register', 'POST', '/accounts/register/', data={
+            'csrfmiddlewaretoken': token,
+            'email': self.email,
+            'account_type': 'personal',
+            'password1': PASSWORD,
+            'password2': PASSWORD,
+            'terms_accepted': 'on',
+        }, headers={'Referer': self.base_url + '/accounts/register/'})
+
+        token = self._csrf('login_form', LOGIN_PATH)
+        self.request('login', 'POST', LOGIN_PATH, data={
+            'csrfmiddlewaretoken': token,
+            'username': self.email,
+            'password': PASSWORD,
+            'remember_me': 'on',
+        }, headers={'Referer': self.base_url + LOGIN_PATH})
+
+    def iteration(self, number):
+        self.request('dashboard', 'GET', '/dashboard/')
+
+        token = self._csrf('upload_form', '/resumes/upload/')
+        self.request('resume_upload', 'POST', '/resumes/upload/', data={
+            'csrfmiddlewaretoken': token,
+            'title': f'Load test resume {number}',
+        }, files={'file': ('resume.pdf', self.resume_pdf, 'application/pdf')},
+            headers={'Referer': self.base_url + '/resumes/upload/'})
+
+        response = self.request('resume_list', 'GET', '/resumes/')
+        ids = RESUME_LINK_PATTERN.findall(response.text) if response is not None else []
+        if ids:
+            newest = max(ids, key=int)
+            self.request('resume_preview', 'GET', f'/resumes/{newest}/preview/')
+            self.request('resume_download', 'GET', f'/resumes/{newest}/download/')
+
+            # A user holds at most one non-primary resume, so remove this
+            # one before the next iteration uploads another
+            self.request('resume_delete', 'POST', f'/resumes/{newest}/delete/', data={
+                'csrfmiddlewaretoken': self.session.cookies.get('csrftoken', ''),
+            }, headers={'Referer': self.base_url + '/resumes/'})
+
+        self.request('profile', 'GET', '/accounts/profile/')
+        self.request('notifications', 'GET', '/notifications/')
+
+    def run(self, deadline, iterations):
+        self.sign_up()
+        number = 0
+        while time.monotonic() < deadline and (iterations is None or number < iterations):
+            self.iteration(number)
+            number += 1
+
+
+def run(args):
+    stats = Stats()
+    run_id = uuid.uuid4().hex[:8]
+    deadline = time.monotonic() + args.duration
+    users = [
+        VirtualUser(args.base_url, stats, run_id, number, args.timeout)
+        for number in range(args.users)
+    ]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.users) as pool:
+        for future in [pool.submit(user.run, deadline, args.iterations) for user in users]:
+            future.result()
+    result = stats.summary(time.perf_counter() - start)
+    result['config'] = {
+        'base_url': args.base_url,
+        'users': args.users,
+        'duration': args.duration,
+        'iterations': args.iterations,
+    }
+
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    print(output)
+    return 0
+
+
+def compare(args):
+    """Flag steps whose p95, throughput or error rate regressed."""
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    regressions = []
+    print(f'{"step":<18} {"p95 before":>11} {"p95 after":>10} {"change":>8} {"rps before":>11} {"rps after":>10} {"errors":>14}')
+    for step, before in sorted(baseline['steps'].items()):
+        after = candidate['steps'].get(step)
+        if after is None:
+            regressions.append(f'{step}: missing from candidate run')
+            continue
+
+        change = (after['p95_ms'] - before['p95_ms']) / before['p95_ms'] if before['p95_ms'] else 0.0
+        rps_change = (after['rps'] - before['rps']) / before['rps'] if before['rps'] else 0.0
+        flags = []
+        if change > args.threshold:
+            flags.append(f'p95 +{change:.0%}')
+        if rps_change < -args.threshold:
+            flags.append(f'rps {rps_change:.0%}')
+        if after['error_rate'] - before['error_rate'] > args.error_threshold:
+            flags.append(f'errors {before["error_rate"]:.1%} -> {after["error_rate"]:.1%}')
+
+        print(
+            f'{step:<18} {before["p95_ms"]:>11.1f} {after["p95_ms"]:>10.1f} {change:>+8.0%} '
+            f'{before["rps"]:>11.1f} {after["rps"]:>10.1f} '
+            f'{before["error_rate"]:>6.1%}->{after["error_rate"]:<6.1%}'
+            f'{"  REGRESSION: " + ", ".join(flags) if flags else ""}'
+        )
+        regressions.extend(f'{step}: {flag}' for flag in flags)
+
+    if regressions:
+        print(f'\n{len(regressions)} regression(s):')
+        for regression in regressions:
+            print(f'  {regression}')
+        return 1
+    print('\nNo regressions.')
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='Run the load test.')
+    run_parser.add_argument('--base-url', default='http://127.0.0.1:8000', help='Server to test.')
+    run_parser.add_argument('--users', type=int, default=10, help='Concurrent virtual users.')
+    run_parser.add_argument('--duration', type=float, default=60, help='Seconds to run.')
+    run_parser.add_argument('--iterations', type=int, default=None, help='Journeys per user (default: until --duration).')
+    run_parser.add_argument('--timeout', type=float, default=30, help='Per-request timeout in seconds.')
+    run_parser.add_argument('--output', help='Write the JSON report to this file.')
+
+    compare_parser = commands.add_parser('compare', help='Compare two JSON reports.')
+    compare_parser.add_argument('baseline', help='Report of the reference run.')
+    compare_parser.add_argument('candidate', help='Report of the run to check.')
+    compare_parser.add_argument('--threshold', type=float, default=0.10, help='Allowed relative p95/rps change.')
+    compare_parser.add_argument('--error-threshold', type=float, default=0.01, help='Allowed error-rate increase.')
+
+    args = parser.parse_args(argv)
+    return run(args) if args.command == 'run' else compare(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,246 @@
+# Tests for accounts app
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.sessions.backends.db import SessionStore as DatabaseSessionStore
+from django.contrib.sessions.models import Session
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models.signals import post_save
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.accounts.models import CompanyProfile, PersonalProfile, User
+from apps.accounts.sessions import REFRESHED_AT_KEY, CacheSessionStore, WriteThroughSessionStore
+from apps.following.models import Follow
+from apps.messages.models import Conversation, Message
+from apps.notifications.models import Notification
+from apps.resumes.models import Resume
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class DirtyFieldsTests(TestCase):
+    """Saves write only changed columns and skip no-op saves entirely."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('dirty@example.com', 'pass-1234')
+        self.saves = []
+        post_save.connect(self._record_save, dispatch_uid='dirty_fields_test')
+        self.addCleanup(post_save.disconnect, dispatch_uid='dirty_fields_test')
+
+    def _record_save(self, sender, instance, update_fields=None, **kwargs):
+        self.saves.append((sender, None if update_fields is None else set(update_fields)))
+
+    def test_noop_save_issues_no_query_or_signal(self):
+        user = User.objects.get(pk=self.user.pk)
+        profile = PersonalProfile.objects.get(user=user)
+
+        with self.assertNumQueries(0):
+            user.save()
+            profile.save()
+        self.assertEqual(self.saves, [])
+
+    def test_update_fields_has_only_dirty_and_auto_now_fields(self):
+        user = User.objects.get(pk=self.user.pk)
+        user.is_verified = True
+
+        with CaptureQueriesContext(connection) as queries:
+            user.save()
+
+        self.assertEqual(self.saves, [(User, {'is_verified', 'updated_at'})])
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"email"', queries[0]['sql'])
+        self.assertTrue(User.objects.get(pk=user.pk).is_verified)
+
+        # Saved values are the new baseline
+        with self.assertNumQueries(0):
+            user.save()
+
+    def test_in_place_json_edit_is_written(self):
+        profile = PersonalProfile.objects.get(user=self.user)
+        profile.skills.append('Django')
+        profile.save()
+
+        self.assertEqual(self.saves, [(PersonalProfile, {'skills', 'updated_at'})])
+        self.assertIn('Django', PersonalProfile.objects.get(pk=profile.pk).skills)
+
+    def test_deferred_fields(self):
+        user = User.objects.only('email').get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            user.save()
+
+        user.email = 'renamed@example.com'
+        with self.assertNumQueries(1):
+            user.save()
+        self.assertEqual(self.saves, [(User, {'email', 'updated_at'})])
+        self.assertFalse(User.objects.get(pk=user.pk).is_verified)
+
+        # Assigned without being loaded: still written
+        user = User.objects.only('email').get(pk=self.user.pk)
+        user.is_verified = True
+        user.save()
+        self.assertEqual(self.saves[-1], (User, {'is_verified', 'updated_at'}))
+        self.assertTrue(User.objects.get(pk=user.pk).is_verified)
+
+        # Loaded on access, then left unchanged: not written
+        user = User.objects.only('email').get(pk=self.user.pk)
+        self.assertTrue(user.is_verified)
+        with self.assertNumQueries(0):
+            user.save()
+
+    def test_login_does_not_resave_profile(self):
+        user = User.objects.get(pk=self.user.pk)
+        user.save(update_fields=['last_login'])
+        self.assertEqual(self.saves, [(User, {'last_login'})])
+
+    def test_explicit_update_fields_and_inserts_are_unchanged(self):
+        user = User.objects.get(pk=self.user.pk)
+        user.save(update_fields=['email'])
+        self.assertEqual(self.saves, [(User, {'email'})])
+
+        User.objects.create_user('new@example.com', 'pass-1234')
+        self.assertIn((User, None), self.saves[1:])
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    SESSION_REFRESH_INTERVAL=300,
+)
+class SessionRefreshTests(TestCase):
+    """Sessions are re-saved at most once per SESSION_REFRESH_INTERVAL."""
+
+    def _load_at(self, store_class, session_key, now):
+        store = store_class(session_key)
+        with mock.patch('apps.accounts.sessions.time.time', return_value=now):
+            store.load()
+        return store
+
+    def _create(self, store_class, now):
+        store = store_class()
+        store['user'] = 'alice'
+        with mock.patch('apps.accounts.sessions.time.time', return_value=now):
+            store.save(must_create=True)
+        return store.session_key
+
+    def test_saved_only_after_interval(self):
+        now = time.time()
+        key = self._create(CacheSessionStore, now)
+
+        self.assertFalse(self._load_at(CacheSessionStore, key, now + 299).modified)
+
+        store = self._load_at(CacheSessionStore, key, now + 300)
+        self.assertTrue(store.modified)
+        with mock.patch('apps.accounts.sessions.time.time', return_value=now + 300):
+            store.save()
+
+        # The refresh restarts the interval
+        self.assertEqual(CacheSessionStore(key).load()[REFRESHED_AT_KEY], int(now + 300))
+        self.assertFalse(self._load_at(CacheSessionStore, key, now + 599).modified)
+
+    def test_unstamped_session_is_refreshed(self):
+        store = CacheSessionStore()
+        store.create()
+        store._cache.set(store.cache_key, {'user': 'alice'})
+        self.assertTrue(self._load_at(CacheSessionStore, store.session_key, time.time()).modified)
+
+    def test_write_through_writes_db_row(self):
+        now = time.time()
+        key = self._create(WriteThroughSessionStore, now)
+
+        row = Session.objects.get(session_key=key)
+        self.assertEqual(row.get_decoded()['user'], 'alice')
+        self.assertEqual(row.get_decoded()[REFRESHED_AT_KEY], int(now))
+
+        store = self._load_at(WriteThroughSessionStore, key, now + 300)
+        with mock.patch('apps.accounts.sessions.time.time', return_value=now + 300):
+            store.save()
+        row.refresh_from_db()
+        self.assertEqual(row.get_decoded()[REFRESHED_AT_KEY], int(now + 300))
+
+    def test_reads_rows_written_by_db_engine(self):
+        legacy = DatabaseSessionStore()
+        legacy['user'] = 'alice'
+        legacy.create()
+        self.assertEqual(WriteThroughSessionStore(legacy.session_key).load()['user'], 'alice')
+
+    def test_cache_store_writes_no_db_row(self):
+        self._create(CacheSessionStore, time.time())
+        self.assertFalse(Session.objects.exists())
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    SESSION_DB_WRITE_THROUGH=False,
+)
+class PurgeDbSessionsTests(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        encode = Session.objects.encode
+        self.live = Session.objects.create(
+            session_key='live' * 8, session_data=encode({'user': 'alice'}),
+            expire_date=now + timedelta(days=1),
+        )
+        self.expired = Session.objects.create(
+            session_key='gone' * 8, session_data=encode({'user': 'bob'}),
+            expire_date=now - timedelta(days=1),
+        )
+
+    def _purge(self, *args):
+        call_command('purge_db_sessions', *args, stdout=StringIO())
+
+    def test_full_purge_requires_copy_or_force(self):
+        with self.assertRaises(CommandError):
+            self._purge()
+        self.assertEqual(Session.objects.count(), 2)
+
+    def test_expired_only_keeps_live_sessions(self):
+        self._purge('--expired-only')
+        self.assertQuerySetEqual(Session.objects.values_list('session_key', flat=True), [self.live.session_key])
+
+    def test_copy_to_cache_keeps_users_logged_in(self):
+        self._purge('--copy-to-cache')
+        self.assertFalse(Session.objects.exists())
+        self.assertEqual(CacheSessionStore(self.live.session_key).load()['user'], 'alice')
+        self.assertFalse(CacheSessionStore(self.expired.session_key).exists(self.expired.session_key))
+
+    def test_force_deletes_everything(self):
+        self._purge('--force')
+        self.assertFalse(Session.objects.exists())
+
+    @override_settings(SESSION_DB_WRITE_THROUGH=True)
+    def test_write_through_allows_only_expired(self):
+        with self.assertRaises(CommandError):
+            self._purge('--force')
+        self.assertEqual(Session.objects.count(), 2)
+
+
+class SeedScaleTests(TestCase):
+    def _seed(self, *args):
+        call_command('seed_scale', '--users', '10', *args, stdout=StringIO())
+
+    def test_row_counts(self):
+        self._seed()
+
+        seeded = User.objects.filter(email__endswith='@seed.hiresight.test')
+        self.assertEqual(seeded.filter(account_type='personal').count(), 9)
+        self.assertEqual(seeded.filter(account_type='company').count(), 1)
+        self.assertEqual(PersonalProfile.objects.filter(user__in=seeded).count(), 9)
+        self.assertEqual(CompanyProfile.objects.filter(user__in=seeded).count(), 1)
+        self.assertEqual(Resume.objects.count(), 18)
+        self.assertEqual(Resume.objects.filter(is_primary=True).count(), 9)
+        self.assertEqual(Follow.objects.count(), 90)
+        self.assertEqual(Conversation.objects.count(), 5)
+        self.assertEqual(Message.objects.count(), 40)
+        self.assertEqual(Notification.objects.count(), 100)
+
+    def test_rerun_requires_flush(self):
+        self._seed()
+        with self.assertRaises(CommandError):
+            self._seed()
+
+        self._seed('--flush')
+        self.assertEqual(User.objects.count(), 10)
+        self.assertEqual(Notification.objects.count(), 100)
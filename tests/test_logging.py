@@ -0,0 +1,64 @@
+# Tests for the queued logging configuration
+import copy
+import logging
+import logging.config
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from apps.monitoring.log_handlers import AsyncRotatingFileHandler, request_id_var
+
+
+class LoggingConfigTests(SimpleTestCase):
+    """settings.LOGGING must load with dictConfig and deliver records to the files."""
+
+    def setUp(self):
+        self.log_dir = Path(tempfile.mkdtemp())
+        self.config = copy.deepcopy(settings.LOGGING)
+        for handler in self.config['handlers'].values():
+            if 'filename' in handler:
+                handler['filename'] = self.log_dir / Path(handler['filename']).name
+        # Put the project's own configuration back afterwards
+        self.addCleanup(logging.config.dictConfig, settings.LOGGING)
+
+    def _handler(self, logger_name):
+        return next(
+            handler for handler in logging.getLogger(logger_name).handlers
+            if isinstance(handler, AsyncRotatingFileHandler)
+        )
+
+    def test_dictconfig_writes_to_file(self):
+        logging.config.dictConfig(self.config)
+        token = request_id_var.set('req-123')
+        try:
+            logging.getLogger('django').warning('queued %s', 'record')
+        finally:
+            request_id_var.reset(token)
+        # Closing stops the listener after it drains the queue
+        self._handler('django').close()
+
+        written = (self.log_dir / 'django.log').read_text()
+        self.assertIn('queued record', written)
+        self.assertIn('[req-123]', written)
+
+    def test_full_queue_drops_and_reports(self):
+        handler = AsyncRotatingFileHandler(self.log_dir / 'small.log', queue_size=2)
+        # Stop the listener so nothing drains the queue
+        handler.listener.stop()
+        handler.listener = None
+        self.addCleanup(handler.close)
+        record = logging.LogRecord('test', logging.INFO, __file__, 0, 'message', None, None)
+
+        for _ in range(3):
+            handler.handle(record)
+        self.assertEqual(handler.dropped, 1)
+
+        handler.queue.get_nowait()
+        handler.queue.get_nowait()
+        handler.handle(record)
+        self.assertEqual(handler.queue.get_nowait().getMessage(), 'message')
+        self.assertEqual(
+            handler.queue.get_nowait().getMessage(), '1 log records dropped: logging queue was full'
+        )
@@ -0,0 +1,475 @@
+# Tests for the monitoring app
+import cProfile
+import importlib.util
+import json
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.core.cache.backends.redis import RedisCache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.views.generic import DetailView
+from prometheus_client import REGISTRY
+
+from apps.accounts.models import User
+from apps.monitoring import health, memory
+from apps.monitoring.cache import InstrumentedRedisCache
+from apps.monitoring.metrics import parse_stage, record_cache_lookup, render_metrics
+from apps.monitoring.middleware import MetricsMiddleware, ProfilingMiddleware
+from apps.resumes.models import Resume
+
+
+class UserEmailView(DetailView):
+    model = User
+
+    def render_to_response(self, context):
+        return HttpResponse(self.object.email)
+
+
+@override_settings(SLOW_QUERY_THRESHOLD_MS=0)
+class SlowQueryLoggingTests(TestCase):
+    """Slow queries are logged per request without leaking execute wrappers."""
+
+    def _view(self, request):
+        # Simulate the connection being opened inside the request, as it is
+        # with CONN_MAX_AGE=0, before the view runs its queries
+        connection_created.send(sender=connection.__class__, connection=connection)
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        return HttpResponse()
+
+    def test_connection_opened_inside_request(self):
+        before = list(connection.execute_wrappers)
+        middleware = MetricsMiddleware(self._view)
+
+        for _ in range(3):
+            with self.assertLogs('hiresight.slow_queries', 'WARNING') as logs:
+                middleware(RequestFactory().get('/'))
+            self.assertIn('SELECT ?', logs.output[0])
+            self.assertIn('tests/test_monitoring.py', logs.output[0])
+            self.assertIn('in _view', logs.output[0])
+            self.assertEqual(connection.execute_wrappers, before)
+
+    def test_class_based_view_is_named(self):
+        user = User.objects.create_user('slow@example.com', 'pass-1234')
+        view = UserEmailView.as_view()
+        middleware = MetricsMiddleware(lambda request: view(request, pk=user.pk))
+
+        # The query runs inside Django's get_object(); the view class is named
+        with self.assertLogs('hiresight.slow_queries', 'WARNING') as logs:
+            middleware(RequestFactory().get('/'))
+
+        self.assertIn('in UserEmailView', logs.output[0])
+        self.assertNotIn('apps/monitoring/', logs.output[0])
+
+    @override_settings(
+        CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+        PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+        PROFILING_SAMPLE_RATE=0,
+    )
+    def test_full_middleware_stack_names_project_code(self):
+        user = User.objects.create_user('stack@example.com', 'pass-1234')
+        resume = Resume.objects.create(
+            user=user, title='CV', file='resumes/cv.pdf', file_size=1, original_filename='cv.pdf',
+        )
+        self.client.force_login(user)
+
+        with self.assertLogs('hiresight.slow_queries', 'WARNING') as logs:
+            self.client.get(f'/resumes/{resume.pk}/')
+
+        self.assertTrue(any('apps/resumes/views.py' in line for line in logs.output), logs.output)
+        for line in logs.output:
+            self.assertNotIn('apps/monitoring/', line)
+            self.assertNotIn('in __call__', line)
+
+
+@override_settings(HEALTH_CHECK_TIMEOUT=5, HEALTH_CHECK_CACHE_TTL=60)
+class DependencyCheckTests(SimpleTestCase):
+    """Readiness checks are cached and a slow refresh never blocks other probes."""
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.calls = 0
+        for patcher in (
+            patch.dict(health.CHECKS, {'database': self._slow_check, 'cache': lambda: None}, clear=True),
+            patch.dict(health._results, {'database': (0.0, 'healthy')}, clear=True),
+            patch.dict(health._pending, clear=True),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(self.release.set)
+
+    def _slow_check(self):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+
+    def test_concurrent_probe_serves_stale_result(self):
+        refresher = threading.Thread(target=health.dependency_checks)
+        refresher.start()
+        self.assertTrue(self.started.wait(5))
+
+        start = time.monotonic()
+        statuses = health.dependency_checks()
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(statuses['database'], 'healthy')
+
+        self.release.set()
+        refresher.join(5)
+        self.assertEqual(self.calls, 1)
+
+    def test_fresh_result_is_reused(self):
+        self.release.set()
+        health._results['database'] = (0.0, 'unhealthy: stale')
+        self.assertEqual(health.dependency_checks()['database'], 'healthy')
+        self.assertEqual(health.dependency_checks(), {'database': 'healthy', 'cache': 'healthy'})
+        self.assertEqual(self.calls, 1)
+
+
+class ProfilingMiddlewareTests(SimpleTestCase):
+    """Only staff who ask for a profile are told where it was written."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        self.middleware = ProfilingMiddleware(lambda request: HttpResponse())
+
+    def _get(self, path='/', is_staff=False, **headers):
+        request = RequestFactory().get(path, headers=headers)
+        request.user = SimpleNamespace(is_staff=is_staff)
+        with self.settings(PROFILING_DIR=str(self.directory), PROFILING_MODE='cprofile'):
+            return self.middleware(request)
+
+    def _profiles(self):
+        return list(self.directory.glob('*.prof'))
+
+    @override_settings(PROFILING_SAMPLE_RATE=0)
+    def test_overlapping_cprofile_requests(self):
+        # Python 3.12+ allows one active cProfile per process; enforce that
+        # here too so the fallback is exercised on every version
+        active = []
+        enable, disable = cProfile.Profile.enable, cProfile.Profile.disable
+
+        def enable_once(profiler, *args, **kwargs):
+            if active:
+                raise ValueError('Another profiling tool is already active')
+            active.append(profiler)
+            enable(profiler, *args, **kwargs)
+
+        def disable_once(profiler):
+            disable(profiler)
+            if profiler in active:
+                active.remove(profiler)
+
+        barrier = threading.Barrier(2, timeout=5)
+
+        def view(request):
+            barrier.wait()
+            return HttpResponse()
+
+        self.middleware = ProfilingMiddleware(view)
+        responses = []
+        with patch.object(cProfile.Profile, 'enable', enable_once), \
+                patch.object(cProfile.Profile, 'disable', disable_once):
+            threads = [
+                threading.Thread(target=lambda: responses.append(self._get(is_staff=True, x_profile='1')))
+                for _ in range(2)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual([response.status_code for response in responses], [200, 200])
+        self.assertEqual(
+            sorted(Path(response['X-Profile-File']).suffix for response in responses),
+            ['.folded', '.prof'],
+        )
+
+    @override_settings(PROFILING_SAMPLE_RATE=1.0)
+    def test_sampled_profile_is_not_exposed(self):
+        response = self._get()
+        self.assertNotIn('X-Profile-File', response)
+        self.assertTrue(self._profiles())
+
+    @override_settings(PROFILING_SAMPLE_RATE=0)
+    def test_staff_request_returns_file_name(self):
+        response = self._get(is_staff=True, x_profile='1')
+        self.assertTrue((self.directory / response['X-Profile-File']).exists())
+
+        response = self._get('/?_profile=1', is_staff=True)
+        self.assertIn('X-Profile-File', response)
+
+    @override_settings(PROFILING_SAMPLE_RATE=1.0)
+    def test_non_staff_request_is_not_exposed(self):
+        response = self._get(x_profile='1')
+        self.assertNotIn('X-Profile-File', response)
+
+    @override_settings(PROFILING_SAMPLE_RATE=0)
+    def test_untriggered_request_is_not_profiled(self):
+        self._get(x_profile='1')
+        self.assertEqual(list(self.directory.iterdir()), [])
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+    PROFILING_SAMPLE_RATE=0,
+    METRICS_TOKEN='scrape-secret',
+)
+class MetricsEndpointTests(TestCase):
+    """/metrics is for staff and scrapers holding the token."""
+
+    def test_anonymous_and_non_staff_are_forbidden(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+
+        self.client.force_login(User.objects.create_user('user@example.com', 'pass-1234'))
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+
+    def test_staff_can_scrape(self):
+        self.client.force_login(User.objects.create_user('staff@example.com', 'pass-1234', is_staff=True))
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertIn(b'hiresight_request_duration_seconds', response.content)
+
+    def test_bearer_token(self):
+        response = self.client.get('/metrics', headers={'Authorization': 'Bearer scrape-secret'})
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get('/metrics', headers={'Authorization': 'Bearer wrong'})
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(METRICS_TOKEN='')
+    def test_token_is_ignored_when_unset(self):
+        response = self.client.get('/metrics', headers={'Authorization': 'Bearer '})
+        self.assertEqual(response.status_code, 403)
+
+    def test_requests_are_labelled_by_route_name(self):
+        livez = {'view': 'monitoring:livez', 'method': 'GET', 'status': '200'}
+        unresolved = {'view': 'unresolved', 'method': 'GET', 'status': '404'}
+        before = [sample('hiresight_request_duration_seconds_count', **labels) for labels in (livez, unresolved)]
+
+        self.client.get('/livez')
+        self.client.get('/no-such-page/12345')
+
+        after = [sample('hiresight_request_duration_seconds_count', **labels) for labels in (livez, unresolved)]
+        self.assertEqual([b - a for a, b in zip(before, after)], [1, 1])
+        self.assertNotIn(b'no-such-page', render_metrics()[0])
+
+    def test_unknown_methods_share_one_label(self):
+        labels = {'view': 'monitoring:livez', 'method': 'other', 'status': '200'}
+        before = sample('hiresight_request_duration_seconds_count', **labels)
+
+        self.client.generic('BREW', '/livez')
+        self.client.generic('PROPFIND', '/livez')
+
+        self.assertEqual(sample('hiresight_request_duration_seconds_count', **labels) - before, 2)
+        self.assertNotIn(b'BREW', render_metrics()[0])
+
+    def test_multiprocess_registry(self):
+        with tempfile.TemporaryDirectory() as directory, \
+                patch.dict(os.environ, {'PROMETHEUS_MULTIPROC_DIR': directory}):
+            body, content_type = render_metrics()
+        self.assertTrue(content_type.startswith('text/plain'))
+        self.assertNotIn(b'hiresight_request_duration_seconds', body)
+
+
+class MetricsRecordingTests(SimpleTestCase):
+    def test_cache_hits_and_misses(self):
+        cache = InstrumentedRedisCache('redis://127.0.0.1:6379/1', {})
+        stored = {'a': 1, 'b': None}
+        hits = sample('hiresight_cache_requests_total', result='hit')
+        misses = sample('hiresight_cache_requests_total', result='miss')
+
+        with patch.object(RedisCache, 'get', lambda self, key, default=None, version=None: stored.get(key, default)), \
+                patch.object(RedisCache, 'get_many', lambda self, keys, version=None: {k: stored[k] for k in keys if k in stored}):
+            self.assertEqual(cache.get('a'), 1)
+            self.assertIsNone(cache.get('b', 'default'))
+            self.assertEqual(cache.get('missing', 'default'), 'default')
+            self.assertEqual(cache.get_many(['a', 'missing']), {'a': 1})
+
+        # A cached None is a hit, not a miss
+        self.assertEqual(sample('hiresight_cache_requests_total', result='hit') - hits, 3)
+        self.assertEqual(sample('hiresight_cache_requests_total', result='miss') - misses, 2)
+
+    def test_record_cache_lookup_skips_zero(self):
+        before = sample('hiresight_cache_requests_total', result='miss')
+        record_cache_lookup(0, 0)
+        self.assertEqual(sample('hiresight_cache_requests_total', result='miss'), before)
+
+    def test_parse_stage_times_failures_too(self):
+        before = sample('hiresight_resume_parse_stage_seconds_count', stage='test_stage')
+        with self.assertRaises(ValueError), parse_stage('test_stage'):
+            raise ValueError
+        self.assertEqual(sample('hiresight_resume_parse_stage_seconds_count', stage='test_stage') - before, 1)
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+    PROFILING_SAMPLE_RATE=0,
+)
+class MemoryDiagnosticsTests(TestCase):
+    """/diagnostics/memory is staff-only and traces nothing until started."""
+
+    url = '/diagnostics/memory'
+
+    def setUp(self):
+        self.addCleanup(memory.stop)
+        self.staff = User.objects.create_user('staff@example.com', 'pass-1234', is_staff=True)
+
+    def test_requires_staff(self):
+        self.assertEqual(self.client.get(self.url).status_code, 302)
+
+        self.client.force_login(User.objects.create_user('user@example.com', 'pass-1234'))
+        self.assertEqual(self.client.get(self.url).status_code, 302)
+        self.assertEqual(self.client.post(self.url, {'action': 'start'}).status_code, 302)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_idle_report(self):
+        self.client.force_login(self.staff)
+        data = self.client.get(self.url).json()
+
+        self.assertFalse(data['tracing'])
+        self.assertEqual(data['snapshots'], [])
+        self.assertEqual(len(data['gc']['counts']), 3)
+        self.assertNotIn('top_sites', data)
+
+    def test_snapshots_are_diffed(self):
+        self.client.force_login(self.staff)
+        self.client.post(self.url, {'action': 'start', 'frames': '5'})
+        self.client.post(self.url, {'action': 'snapshot'})
+        retained = [bytearray(1024) for _ in range(100)]
+        data = self.client.post(self.url + '?limit=5', {'action': 'snapshot'}).json()
+
+        self.assertTrue(data['tracing'])
+        self.assertEqual(data['compared'], [1, 2])
+        self.assertLessEqual(len(data['top_sites']), 5)
+        self.assertGreaterEqual(sum(group['size_diff'] for group in data['groups']), 100 * 1024)
+        del retained
+
+        self.client.post(self.url, {'action': 'stop'})
+        data = self.client.get(self.url).json()
+        self.assertFalse(data['tracing'])
+        self.assertEqual(data['snapshots'], [])
+
+    def test_bad_actions(self):
+        self.client.force_login(self.staff)
+        self.assertEqual(self.client.post(self.url, {'action': 'snapshot'}).status_code, 400)
+        self.assertEqual(self.client.post(self.url, {'action': 'explode'}).status_code, 400)
+        self.assertEqual(self.client.put(self.url).status_code, 405)
+
+    def test_keeps_bounded_number_of_snapshots(self):
+        memory.start(1)
+        for _ in range(memory.MAX_SNAPSHOTS + 2):
+            memory.take_snapshot()
+        self.assertEqual(memory.report()['snapshots'], list(range(3, memory.MAX_SNAPSHOTS + 3)))
+
+    def test_groups_by_innermost_matching_frame(self):
+        def traceback(*filenames):
+            return [SimpleNamespace(filename=filename) for filename in filenames]
+
+        self.assertEqual(memory._group(traceback(
+            '/srv/app/apps/resumes/parsers.py', '/venv/site-packages/spacy/language.py',
+        )), 'spacy')
+        self.assertEqual(memory._group(traceback(
+            '/venv/site-packages/django/db/models/query.py', '/srv/app/apps/resumes/nlp.py',
+        )), 'caches')
+        self.assertEqual(memory._group(traceback('/usr/lib/python3/json/decoder.py')), 'other')
+
+
+class CheckImportTimeTests(SimpleTestCase):
+    """Startup is timed in a fresh interpreter against the budget."""
+
+    def test_within_budget(self):
+        stdout = StringIO()
+        call_command('check_import_time', '--budget', '60000', '--top', '3', stdout=stdout)
+        output = stdout.getvalue()
+        self.assertIn('Top 3 packages by self import time:', output)
+        self.assertIn('Import-time budget OK', output)
+
+    def test_over_budget(self):
+        with self.assertRaisesMessage(CommandError, 'Import-time budget exceeded'):
+            call_command('check_import_time', '--budget', '0', stdout=StringIO())
+
+
+def load_loadtest():
+    """Import monitoring/loadtest.py, which is a script rather than a package module."""
+    path = Path(__file__).resolve().parent.parent / 'monitoring' / 'loadtest.py'
+    spec = importlib.util.spec_from_file_location('loadtest', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class LoadTestCompareTests(SimpleTestCase):
+    """Comparing two load test reports flags regressed steps."""
+
+    BASELINE = {'steps': {
+        'dashboard': {'p95_ms': 100.0, 'rps': 50.0, 'error_rate': 0.0},
+        'resume_upload': {'p95_ms': 400.0, 'rps': 10.0, 'error_rate': 0.0},
+    }}
+
+    def setUp(self):
+        self.loadtest = load_loadtest()
+        self.directory = self.enterContext(tempfile.TemporaryDirectory())
+
+    def _compare(self, candidate, *args):
+        paths = []
+        for name, report in (('before.json', self.BASELINE), ('after.json', candidate)):
+            path = os.path.join(self.directory, name)
+            with open(path, 'w') as f:
+                json.dump(report, f)
+            paths.append(path)
+
+        stdout = StringIO()
+        with redirect_stdout(stdout):
+            status = self.loadtest.main(['compare', *paths, *args])
+        return status, stdout.getvalue()
+
+    def test_no_regression(self):
+        candidate = {'steps': {
+            'dashboard': {'p95_ms': 105.0, 'rps': 48.0, 'error_rate': 0.005},
+            'resume_upload': {'p95_ms': 300.0, 'rps': 12.0, 'error_rate': 0.0},
+        }}
+        status, output = self._compare(candidate)
+        self.assertEqual(status, 0)
+        self.assertIn('No regressions.', output)
+
+    def test_regressions_are_reported(self):
+        candidate = {'steps': {
+            'dashboard': {'p95_ms': 150.0, 'rps': 30.0, 'error_rate': 0.05},
+        }}
+        status, output = self._compare(candidate)
+        self.assertEqual(status, 1)
+        self.assertIn('4 regression(s):', output)
+        self.assertIn('dashboard: p95 +50%', output)
+        self.assertIn('dashboard: rps -40%', output)
+        self.assertIn('dashboard: errors 0.0% -> 5.0%', output)
+        self.assertIn('resume_upload: missing from candidate run', output)
+
+    def test_threshold_is_configurable(self):
+        candidate = {'steps': {
+            'dashboard': {'p95_ms': 150.0, 'rps': 50.0, 'error_rate': 0.0},
+            'resume_upload': {'p95_ms': 400.0, 'rps': 10.0, 'error_rate': 0.0},
+        }}
+        self.assertEqual(self._compare(candidate)[0], 1)
+        self.assertEqual(self._compare(candidate, '--threshold', '0.6')[0], 0)
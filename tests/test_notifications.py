@@ -0,0 +1,106 @@
+# Tests for the cached unread notification counter
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from apps.accounts.context_processors import unread_notifications_count
+from apps.accounts.models import User
+from apps.notifications import counters
+from apps.notifications.models import Notification
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+    PROFILING_SAMPLE_RATE=0,
+)
+class UnreadCounterTests(TestCase):
+    """The unread count is adjusted in the cache and rebuilt on a miss."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('reader@example.com', 'pass-1234')
+
+    def _notify(self, count=1):
+        with self.captureOnCommitCallbacks(execute=True):
+            return [
+                Notification.objects.create(user=self.user, message=f'Notification {index}')
+                for index in range(count)
+            ]
+
+    def assertCachedCount(self, expected):
+        with self.assertNumQueries(0):
+            self.assertEqual(counters.unread_count(self.user.id), expected)
+
+    def test_rebuilds_on_miss(self):
+        self._notify(2)
+        cache.clear()
+        with self.assertNumQueries(1):
+            self.assertEqual(counters.unread_count(self.user.id), 2)
+        self.assertCachedCount(2)
+
+    def test_create_increments(self):
+        self.assertEqual(counters.unread_count(self.user.id), 0)
+        self._notify(3)
+        self.assertCachedCount(3)
+
+    def test_mark_as_read_decrements(self):
+        first, _ = self._notify(2)
+        self.assertEqual(counters.unread_count(self.user.id), 2)
+        self.client.force_login(self.user)
+
+        url = reverse('notifications:mark_as_read', args=[first.pk])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.get(url)
+            # Reading it again must not decrement twice
+            self.client.get(url)
+        self.assertCachedCount(1)
+
+    def test_mark_all_as_read_decrements(self):
+        self._notify(3)
+        self.assertEqual(counters.unread_count(self.user.id), 3)
+        self.client.force_login(self.user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('notifications:mark_all_as_read'))
+        self.assertCachedCount(0)
+
+    def test_change_during_rebuild_is_not_lost(self):
+        # A reader misses and counts before a new notification commits...
+        generation = counters._generation(self.user.id)
+        stale = Notification.objects.filter(user=self.user, is_read=False).count()
+        # ...the notification commits while there is no count to adjust...
+        self._notify()
+        # ...and only then does the reader store what it counted
+        cache.add(counters.cache_key(self.user.id, generation), stale)
+
+        self.assertEqual(counters.unread_count(self.user.id), 1)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class UnreadCountContextProcessorTests(TestCase):
+    """The badge count is only looked up when a template renders it."""
+
+    def test_lazy(self):
+        request = RequestFactory().get('/')
+        request.user = _ExplodingUser()
+        # Neither the user nor the count is touched until the value is used
+        context = unread_notifications_count(request)
+
+        user = User.objects.create_user('lazy@example.com', 'pass-1234')
+        Notification.objects.create(user=user, message='Hello')
+        request.user = user
+        self.assertEqual(str(context['unread_notifications_count']), '1')
+
+    def test_anonymous(self):
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        with self.assertNumQueries(0):
+            self.assertEqual(str(unread_notifications_count(request)['unread_notifications_count']), '0')
+
+
+class _ExplodingUser:
+    @property
+    def is_authenticated(self):
+        raise AssertionError('request.user was evaluated eagerly')
@@ -0,0 +1,242 @@
+# SQL query budget tests: per-view query counts must not grow with data size
+import copy
+import traceback
+from collections import defaultdict
+from contextlib import ExitStack
+from pathlib import Path
+from django.conf import settings
+from django.db import connections
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from apps.accounts.models import User
+from apps.following.models import Follow
+from apps.messages.models import Conversation, Message
+from apps.monitoring.slow_queries import fingerprint
+from apps.notifications.models import Notification
+from apps.resumes.models import Resume
+
+
+# Each view is rendered after seeding this many related rows
+DATA_SIZES = (1, 5, 20)
+
+
+def _with_test_templates():
+    """
+    TEMPLATES plus tests/templates, minimal pages for views whose real
+    templates do not exist yet; templates/ still takes precedence.
+    """
+    templates = copy.deepcopy(settings.TEMPLATES)
+    templates[0]['DIRS'] = [*templates[0]['DIRS'], Path(__file__).parent / 'templates']
+    return templates
+
+
+def _app_stack():
+    """Stack frames from project code, skipping Django, libraries and this file."""
+    base = str(settings.BASE_DIR)
+    return [
+        frame for frame in traceback.extract_stack()[:-2]
+        if frame.filename.startswith(base)
+        and 'site-packages' not in frame.filename
+        and frame.filename != __file__
+    ]
+
+
+class QueryLog:
+    """``execute_wrapper`` recording each statement and where it came from."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append((sql, _app_stack()))
+        return execute(sql, params, many, context)
+
+    def __len__(self):
+        return len(self.queries)
+
+    def duplicates(self):
+        """Fingerprints issued more than once, with the stack of the first call."""
+        grouped = defaultdict(list)
+        for sql, stack in self.queries:
+            grouped[fingerprint(sql)].append(stack)
+        return {sql: stacks for sql, stacks in grouped.items() if len(stacks) > 1}
+
+
+class QueryBudgetMixin:
+    """Assertions that a view's query count stays flat as its data grows."""
+
+    def get_queries(self, url):
+        """GET ``url`` and return the log of SQL it issued."""
+        log = QueryLog()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(log))
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, f'{url} returned {response.status_code}')
+        return log
+
+    def assertConstantQueries(self, url, seed, sizes=DATA_SIZES):
+        """
+        Render ``url`` after ``seed(n)`` has added rows up to each size.
+
+        Fails when a larger data set issues more queries than the smallest,
+        listing the repeated statements and the code that issued them.
+        """
+        counts = {}
+        seeded = 0
+        for size in sizes:
+            seed(size - seeded)
+            seeded = size
+            log = self.get_queries(url)
+            counts[size] = len(log)
+
+            if counts[size] > counts[sizes[0]]:
+                self.fail(self._report(url, counts, log))
+
+    def _report(self, url, counts, log):
+        lines = [
+            f'{url}: query count grows with data '
+            f'({", ".join(f"{size} rows: {count}" for size, count in counts.items())})',
+            '',
+        ]
+        for sql, stacks in sorted(log.duplicates().items(), key=lambda item: -len(item[1])):
+            lines.append(f'{len(stacks)}x {sql}')
+            lines.extend(f'    {line.rstrip()}' for line in traceback.format_list(stacks[0]))
+            lines.append('')
+        return '\n'.join(lines)
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    PROFILING_SAMPLE_RATE=0,
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+    TEMPLATES=_with_test_templates(),
+)
+class ViewQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Query counts of the main views must not depend on data volume."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('seeker@example.com', 'pass-1234', account_type='personal')
+        self.client.force_login(self.user)
+        self._counter = 0
+
+    def _new_user(self, account_type='personal'):
+        self._counter += 1
+        return User.objects.create_user(
+            f'user{self._counter}@example.com', 'pass-1234', account_type=account_type
+        )
+
+    def _add_resumes(self, count):
+        """
+        Add resumes for ``self.user``: the primary first, then one other.
+
+        ``unique_together = (user, is_primary)`` allows at most two.
+        """
+        existing = Resume.objects.filter(user=self.user).count()
+        self.assertLessEqual(existing + count, 2, 'a user can have at most two resumes')
+        Resume.objects.bulk_create(
+            Resume(
+                user=self.user,
+                title=f'Resume {index}',
+                file=f'resumes/{self.user.id}/{index}.pdf',
+                file_size=1024,
+                original_filename='resume.pdf',
+                status='parsed',
+                skills=['Python', 'Django'],
+                is_primary=index == 0,
+            )
+            for index in range(existing, existing + count)
+        )
+
+    def _add_notifications(self, count):
+        Notification.objects.bulk_create(
+            Notification(user=self.user, message=f'Notification {index}') for index in range(count)
+        )
+
+    def _add_following(self, count):
+        for index in range(count):
+            Follow.objects.create(
+                follower=self.user,
+                followed=self._new_user('company' if index % 2 else 'personal'),
+            )
+
+    def _add_followers(self, count):
+        for index in range(count):
+            Follow.objects.create(
+                follower=self._new_user('company' if index % 2 else 'personal'),
+                followed=self.user,
+            )
+
+    def _add_conversations(self, count):
+        for _ in range(count):
+            other = self._new_user()
+            conversation = Conversation.objects.create()
+            conversation.participants.add(self.user, other)
+            Message.objects.create(conversation=conversation, sender=other, content='Hello')
+
+    def test_dashboard(self):
+        self.assertConstantQueries(reverse('dashboard:dashboard_home'), self._add_notifications)
+
+    def test_resume_list(self):
+        self.assertConstantQueries(reverse('resumes:list'), self._add_resumes, sizes=(0, 1, 2))
+
+    def test_resume_detail(self):
+        self._add_resumes(1)
+        resume = Resume.objects.get(user=self.user)
+        self.assertConstantQueries(
+            reverse('resumes:detail', args=[resume.pk]), self._add_resumes, sizes=(0, 1)
+        )
+
+    def test_public_personal_profile(self):
+        self.assertConstantQueries(
+            reverse('accounts:public_personal_profile', args=[self.user.id]), self._add_followers
+        )
+
+    def test_notification_list(self):
+        self.assertConstantQueries(reverse('notifications:list'), self._add_notifications)
+
+    def test_following_list(self):
+        self.assertConstantQueries(reverse('following_list'), self._add_following)
+
+    def test_followers_list(self):
+        self.assertConstantQueries(reverse('followers_list'), self._add_followers)
+
+    def test_inbox(self):
+        self.assertConstantQueries(reverse('messages:inbox'), self._add_conversations)
+
+    def test_conversation_detail(self):
+        other = self._new_user()
+        conversation = Conversation.objects.create()
+        conversation.participants.add(self.user, other)
+
+        def add_messages(count):
+            for index in range(count):
+                sender = self._new_user() if index % 2 else self.user
+                Message.objects.create(conversation=conversation, sender=sender, content='Hi')
+
+        self.assertConstantQueries(
+            reverse('messages:conversation_detail', args=[conversation.pk]), add_messages
+        )
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    PROFILING_SAMPLE_RATE=0,
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+)
+class CachedUserTests(QueryBudgetMixin, TestCase):
+    """The logged-in user and profile are loaded once, then served from the cache."""
+
+    def test_user_loaded_once_per_session(self):
+        user = User.objects.create_user('cached@example.com', 'pass-1234', account_type='personal')
+        self.client.force_login(user, backend='apps.accounts.backends.ProfileModelBackend')
+        url = reverse('dashboard:dashboard_home')
+
+        first = self.get_queries(url)
+        user_loads = [sql for sql, _ in first.queries if 'JOIN "personal_profiles"' in sql]
+        self.assertEqual(len(user_loads), 1, 'user and profile should load in one query')
+
+        second = self.get_queries(url)
+        self.assertLess(len(second), len(first))
+        self.assertFalse([sql for sql, _ in second.queries if 'JOIN "personal_profiles"' in sql])
@@ -1 +1,686 @@
-# Tests for resumes app
\ No newline at end of file
+# Tests for resumes app
+import io
+import random
+import tempfile
+import time
+import zipfile
+from datetime import date
+from types import SimpleNamespace
+from unittest import skipUnless
+from unittest.mock import Mock, patch
+
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db.models.fields.files import FieldFile
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.accounts.models import User
+from apps.resumes import preload
+from apps.resumes.dedup import index_resume
+from apps.resumes.language import detect_language
+from apps.resumes.models import Resume
+from apps.resumes.nlp import ModelRegistry, load_pipeline
+from apps.resumes.parsers import ResumeParser, resume_parser
+from apps.resumes.quotas import ParseQuota, parse_quota
+from apps.resumes.scanner import normalize_phone, scan_text
+from apps.resumes.sections import PAGE_BREAK, split_sections
+from apps.resumes.synthetic import generate_resume_text
+from apps.resumes.validators import validate_resume_file
+from utils.helpers import get_redis_connection
+
+
+def make_pdf(page_count=1, outline_count=None, prefix=b''):
+    """Minimal PDF whose root page tree declares ``page_count`` pages."""
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R%s >>' % (b' /Outlines 4 0 R' if outline_count else b''),
+        b'<< /Type /Pages /Kids [3 0 R] /Count %d >>' % page_count,
+        b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] >>',
+    ]
+    if outline_count:
+        objects.append(b'<< /Type /Outlines /Count %d >>' % outline_count)
+
+    pdf = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    xref = len(pdf)
+    pdf += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    pdf += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    pdf += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    return prefix + bytes(pdf)
+
+
+def make_docx(extra=()):
+    """Minimal DOCX zip, plus ``extra`` (name, bytes) entries."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', '<Types/>')
+        archive.writestr('word/document.xml', '<document>Resume</document>')
+        for name, data in extra:
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+class ScannerTests(SimpleTestCase):
+    """Tests for the single-pass contact and experience scanner."""
+
+    def test_extracts_contact_info(self):
+        result = scan_text(
+            "Jane Doe\n"
+            "jane.doe@example.co.uk | (555) 123-4567\n"
+            "linkedin.com/in/janedoe | https://github.com/janedoe\n"
+        )
+
+        self.assertEqual(result['contact_info'], {
+            'email': 'jane.doe@example.co.uk',
+            'phone': '+15551234567',
+            'linkedin': 'linkedin.com/in/janedoe',
+            'github': 'https://github.com/janedoe',
+        })
+
+    def test_normalizes_international_phones(self):
+        self.assertEqual(normalize_phone('+234 803 123 4567'), '+2348031234567')
+        self.assertEqual(normalize_phone('+44 (20) 7946 0958'), '+442079460958')
+        self.assertEqual(normalize_phone('555.123.4567', default_calling_code='1'), '+15551234567')
+        self.assertIsNone(normalize_phone('12345'))
+
+    def test_stated_experience_takes_precedence(self):
+        result = scan_text("8+ years of experience. Acme, Jan 2020 - Jan 2021")
+        self.assertEqual(result['experience_years'], 8.0)
+
+    def test_sums_date_ranges_counting_overlaps_once(self):
+        result = scan_text(
+            "Acme Jan 2018 - Dec 2019\n"
+            "Globex Jun 2019 - Dec 2020\n"
+            "Initech 2010 - 2012\n",
+            today=date(2026, 1, 1),
+        )
+        # 2018-01..2020-12 (3 years) + 2010..2012 (2 years)
+        self.assertEqual(result['experience_years'], 5.0)
+
+    def test_present_ranges_end_today(self):
+        result = scan_text("Acme 06/2024 to present", today=date(2026, 5, 15))
+        self.assertEqual(result['experience_years'], 2.0)
+
+    def test_year_ranges_are_not_phones(self):
+        result = scan_text("Acme 2015 - 2018")
+        self.assertNotIn('phone', result['contact_info'])
+
+    def test_pathological_inputs_scan_in_linear_time(self):
+        """Doubling a pathological input must not quadruple scan time."""
+        builders = [
+            lambda n: 'a' * n,
+            lambda n: 'a@' * (n // 2),
+            lambda n: 'a@' + 'a.' * (n // 2),
+            lambda n: '1 ' * (n // 2),
+            lambda n: '+1' * (n // 2),
+            lambda n: '5 years ' * (n // 8),
+        ]
+        for build in builders:
+            small, large = build(20_000), build(40_000)
+            small_time = min(self._time(small) for _ in range(3))
+            large_time = min(self._time(large) for _ in range(3))
+
+            self.assertLess(large_time, 1.0)
+            self.assertLess(large_time, small_time * 3 + 0.01)
+
+    def _time(self, text):
+        start = time.perf_counter()
+        scan_text(text)
+        return time.perf_counter() - start
+
+
+def make_text_pdf(*pages):
+    """Real PDF, via PyMuPDF, with one page per string in ``pages``."""
+    import fitz
+
+    with fitz.open() as document:
+        for text in pages:
+            document.new_page().insert_text((72, 72), text)
+        return document.tobytes()
+
+
+def make_text_docx(*paragraphs):
+    from docx import Document
+
+    document = Document()
+    for paragraph in paragraphs:
+        document.add_paragraph(paragraph)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def make_pages(*bodies, header='Jane Doe | jane@example.com', footer='Page {} of {}'):
+    """Extracted PDF text: ``bodies`` with a running header and numbered footer."""
+    return PAGE_BREAK.join(
+        '\n'.join([header, *body.splitlines(), footer.format(number, len(bodies))]) + '\n'
+        for number, body in enumerate(bodies, start=1)
+    )
+
+
+class LanguageDetectionTests(SimpleTestCase):
+    def test_detects_languages(self):
+        samples = {
+            'en': 'I worked as the lead of the data team in London for five years and built tools with Python.',
+            'es': 'Trabajé como jefe del equipo de datos en la empresa de Madrid y desarrollé las herramientas para los clientes.',
+            'fr': 'J\'ai travaillé dans une équipe de données pour le client et avec les développeurs sur des projets.',
+            'de': 'Ich war der Leiter von dem Team und habe die Werkzeuge für den Kunden mit der Gruppe im Büro entwickelt.',
+        }
+        for language, text in samples.items():
+            with self.subTest(language):
+                self.assertEqual(detect_language(text), language)
+
+    def test_skills_list_uses_default(self):
+        self.assertEqual(detect_language('Python, Django, SQL, Docker, AWS', default='en'), 'en')
+
+
+class ModelRegistryTests(SimpleTestCase):
+    """Pipelines load on first use and are evicted least recently used first."""
+
+    MB = 1024 * 1024
+
+    def setUp(self):
+        self.loaded = []
+        self.enterContext(patch('apps.resumes.nlp.load_pipeline', side_effect=self._load))
+        self.enterContext(patch('apps.resumes.nlp.estimate_pipeline_size', return_value=100 * self.MB))
+
+    def _load(self, model_name, profile):
+        if model_name == 'missing_model':
+            raise OSError(model_name)
+        self.loaded.append(model_name)
+        return f'nlp:{model_name}'
+
+    def _registry(self, budget_mb=250, **models):
+        return ModelRegistry(
+            'fast', models=models or {'en': 'en_model', 'es': 'es_model', 'fr': 'fr_model'},
+            default_language='en', budget_bytes=budget_mb * self.MB,
+        )
+
+    def test_loads_once(self):
+        registry = self._registry()
+        self.assertEqual(registry.get('es'), 'nlp:es_model')
+        self.assertEqual(registry.get('es'), 'nlp:es_model')
+        self.assertEqual(self.loaded, ['es_model'])
+
+    def test_evicts_least_recently_used(self):
+        registry = self._registry()
+        registry.get('en')
+        registry.get('es')
+        registry.get('en')
+        registry.get('fr')
+
+        self.assertEqual(registry.loaded_languages(), ['en', 'fr'])
+        self.assertEqual(registry.memory_usage(), 200 * self.MB)
+
+    def test_keeps_a_pipeline_larger_than_the_budget(self):
+        registry = self._registry(budget_mb=50)
+        registry.get('en')
+        registry.get('es')
+        self.assertEqual(registry.loaded_languages(), ['es'])
+
+    def test_falls_back_to_default_language(self):
+        registry = self._registry(en='en_model', de='missing_model')
+        self.assertEqual(registry.get('it'), 'nlp:en_model')
+        with self.assertLogs('apps.resumes.nlp', 'WARNING'):
+            self.assertEqual(registry.get('de'), 'nlp:en_model')
+            registry.get('de')
+        # A missing model is not looked up again
+        self.assertEqual(self.loaded, ['en_model'])
+
+    def test_none_without_default_model(self):
+        registry = self._registry(en='missing_model')
+        with self.assertLogs('apps.resumes.nlp', 'WARNING'):
+            self.assertIsNone(registry.get('fr'))
+
+    def test_parser_loads_each_language_once_per_batch(self):
+        parser = ResumeParser(profile='fast')
+        parser.models = Mock(default_language='en', get=Mock(return_value=None))
+        english = 'I am the engineer in charge of the platform and of the data for the team at work.'
+        spanish = 'Soy el ingeniero de la plataforma y de los datos para el equipo con una empresa en Madrid.'
+
+        results = parser.parse_texts([english, spanish, english])
+
+        self.assertEqual(sorted(call.args[0] for call in parser.models.get.call_args_list), ['en', 'es'])
+        self.assertEqual([result['language'] for result in results], ['en', 'es', 'en'])
+
+
+class PipelineProfileTests(SimpleTestCase):
+    """Each NLP profile loads the expected components."""
+
+    # Component layout of the en_core_web_* packages; senter ships disabled
+    TRAINED = ['tok2vec', 'tagger', 'parser', 'senter', 'attribute_ruler', 'lemmatizer', 'ner']
+
+    def _model(self, names, disabled=()):
+        """Save a blank pipeline with no-op components named like a trained one."""
+        import spacy
+        from spacy.language import Language
+
+        if 'profile_test_noop' not in Language.factories:
+            Language.component('profile_test_noop', func=lambda doc: doc)
+
+        nlp = spacy.blank('en')
+        for name in names:
+            nlp.add_pipe('profile_test_noop', name=name)
+        for name in disabled:
+            nlp.disable_pipe(name)
+        path = self.enterContext(tempfile.TemporaryDirectory())
+        nlp.to_disk(path)
+        return path
+
+    def test_fast_profile(self):
+        nlp = load_pipeline(self._model(self.TRAINED, disabled=['senter']), 'fast')
+        self.assertEqual(nlp.pipe_names, [
+            'tok2vec', 'tagger', 'senter', 'attribute_ruler', 'resume_skills', 'resume_education',
+        ])
+
+    def test_full_profile(self):
+        nlp = load_pipeline(self._model(self.TRAINED, disabled=['senter']), 'full')
+        self.assertEqual(nlp.pipe_names, [
+            'tok2vec', 'tagger', 'parser', 'attribute_ruler', 'lemmatizer', 'ner',
+            'resume_skills', 'resume_education',
+        ])
+
+    def test_sentencizer_without_senter(self):
+        nlp = load_pipeline(self._model(['tok2vec', 'tagger', 'parser', 'ner']), 'fast')
+        self.assertEqual(nlp.pipe_names, [
+            'sentencizer', 'tok2vec', 'tagger', 'resume_skills', 'resume_education',
+        ])
+
+
+class ExtractionComponentTests(SimpleTestCase):
+    """The skills and education components on a blank pipeline."""
+
+    def setUp(self):
+        import spacy
+        from apps.resumes import components  # noqa: F401 - registers the spaCy factories
+
+        self.nlp = spacy.blank('en')
+        self.nlp.add_pipe('sentencizer')
+        self.nlp.add_pipe('resume_skills')
+        self.nlp.add_pipe('resume_education')
+
+    def _education(self, text, section='general'):
+        doc = self.nlp.make_doc(text)
+        doc._.section = section
+        for _name, component in self.nlp.pipeline:
+            doc = component(doc)
+        return doc._.education
+
+    def test_skills_are_technical_nouns(self):
+        doc = self.nlp.make_doc('Built webhooks in Python for the team')
+        for token in doc:
+            token.pos_ = 'NOUN' if token.text in ('webhooks', 'Python', 'team') else 'VERB'
+        self.assertEqual(sorted(self.nlp.get_pipe('resume_skills')(doc)._.skills), ['Python', 'webhooks'])
+
+    def test_highest_degree_wins(self):
+        education = self._education('Bachelor of Science and a Master of Arts. PhD candidate since 2021.')
+        self.assertEqual([entry['degree'] for entry in education], ['Master', 'PhD'])
+
+    def test_institution_is_matched(self):
+        education = self._education(
+            'Earned a BS at the University of Lagos in 2015. Then an MSc from Stanford University.'
+        )
+        self.assertEqual(
+            [(entry['degree'], entry['institution']) for entry in education],
+            [('BS', 'University of Lagos'), ('MS', 'Stanford University')],
+        )
+
+    def test_institution_alone_is_education(self):
+        education = self._education('Studied at Imperial College London.')
+        self.assertEqual(education, [{
+            'text': 'Studied at Imperial College London.', 'degree': '', 'institution': 'Imperial College London',
+        }])
+
+    def test_sentences_without_education_are_ignored(self):
+        self.assertEqual(self._education('Led a team of five engineers.'), [])
+
+    def test_skipped_sections(self):
+        text = 'Software engineer at the University of Lagos, supporting PhD students.'
+        self.assertEqual(len(self._education(text)), 1)
+        for section in ('experience', 'skills', 'projects'):
+            self.assertEqual(self._education(text, section=section), [])
+
+
+class PreloadTests(SimpleTestCase):
+    """Models are loaded and the heap frozen before workers fork."""
+
+    def setUp(self):
+        self.nlp = Mock()
+        self.models = Mock(get=Mock(return_value=self.nlp), loaded_languages=Mock(return_value=['en', 'es']))
+        self.enterContext(patch.object(resume_parser, 'models', self.models))
+        self.enterContext(patch.object(preload, '_preloaded', False))
+        # Freezing the test runner's own heap would outlive the test
+        self.freeze = self.enterContext(patch('gc.freeze'))
+
+    @override_settings(RESUME_PRELOAD_LANGUAGES=['en', 'es'])
+    def test_when_ready_loads_registry(self):
+        with self.assertLogs('apps.resumes.preload', 'INFO'):
+            preload.when_ready(server=None)
+
+        self.assertEqual([call.args[0] for call in self.models.get.call_args_list], ['en', 'es'])
+        self.assertEqual(self.nlp.call_count, 2)
+        self.freeze.assert_called_once_with()
+        self.assertTrue(preload._preloaded)
+
+    def test_spawned_worker_loads_its_own_model(self):
+        with self.assertLogs('apps.resumes.preload', 'INFO'):
+            preload.init_worker()
+        self.models.get.assert_called_once_with()
+
+    def test_memory_report(self):
+        report = preload.memory_report()
+        self.assertEqual(set(report), {'rss', 'pss', 'shared', 'private'})
+        self.assertGreater(report['rss'], 0)
+
+
+class SectionSplitTests(SimpleTestCase):
+    """Only running page headers and footers are dropped before chunking."""
+
+    def _text(self, text):
+        return '\n'.join(chunk for _section, chunk in split_sections(text, 10_000))
+
+    def test_drops_running_header_and_footer(self):
+        text = self._text(make_pages(
+            'EXPERIENCE\nEngineer at Acme',
+            'Engineer at Initech\nEDUCATION\nBSc Physics',
+            'SKILLS\nPython',
+        ))
+        self.assertEqual(text.count('Jane Doe | jane@example.com'), 1)
+        self.assertEqual(text.count('Page 1 of 3'), 1)
+        self.assertNotIn('Page 2 of 3', text)
+        self.assertNotIn('Page 3 of 3', text)
+        for line in ('Engineer at Acme', 'Engineer at Initech', 'BSc Physics', 'Python'):
+            self.assertIn(line, text)
+
+    def test_keeps_repeated_body_lines(self):
+        bullet = 'Mentored junior engineers'
+        body = f'Line one\nLine two\nLine three\n{bullet}\nLine four\nLine five\nLine six'
+        text = self._text(make_pages(body, body, body))
+        self.assertEqual(text.count(bullet), 3)
+
+    def test_keeps_repeats_without_page_breaks(self):
+        text = self._text('EXPERIENCE\n' + 'Python\nDjango\n' * 3)
+        self.assertEqual(text.count('Python'), 3)
+
+    def test_keeps_edge_lines_on_few_pages(self):
+        text = self._text(make_pages('Reference: Dr Smith\nA', 'B', 'C', 'Reference: Dr Smith\nD', footer=''))
+        self.assertEqual(text.count('Reference: Dr Smith'), 2)
+
+    def test_pdf_text_keeps_page_breaks(self):
+        pdf = make_text_pdf(*(f'Jane Doe Resume\n\n\nBody text {number}' for number in range(1, 4)))
+
+        text = resume_parser._extract_pdf_text(pdf)
+        self.assertEqual(text.count(PAGE_BREAK), 2)
+        self.assertEqual(self._text(text).count('Jane Doe Resume'), 1)
+
+
+class ParseSourceTests(SimpleTestCase):
+    """The parser reads paths, bytes and uploads alike."""
+
+    def test_pdf_sources(self):
+        pdf = make_text_pdf('Jane Doe, Python developer')
+        with tempfile.NamedTemporaryFile(suffix='.pdf') as stored:
+            stored.write(pdf)
+            stored.flush()
+            sources = [pdf, memoryview(pdf), SimpleUploadedFile('cv.pdf', pdf), stored.name]
+            for source in sources:
+                with self.subTest(source=type(source).__name__):
+                    self.assertIn('Python developer', resume_parser._extract_text(source, 'cv.pdf'))
+
+    def test_docx_sources(self):
+        docx = make_text_docx('Jane Doe', 'Python developer')
+        for source in (docx, SimpleUploadedFile('cv.docx', docx)):
+            with self.subTest(source=type(source).__name__):
+                self.assertIn('Python developer', resume_parser._extract_text(source, 'cv.docx'))
+
+    def test_upload_buffer_is_used_wherever_it_was_read_to(self):
+        upload = SimpleUploadedFile('cv.pdf', b'%PDF-1.4 data')
+        upload.read()
+        self.assertEqual(resume_parser._read_bytes(upload), b'%PDF-1.4 data')
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+    PROFILING_SAMPLE_RATE=0,
+)
+class ResumeUploadTests(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+        self.enterContext(patch.object(parse_quota, 'consume', return_value=True))
+
+        self.user = User.objects.create_user('upload@example.com', 'pass-1234')
+        self.client.force_login(self.user)
+
+    def test_over_quota_upload_is_queued(self):
+        upload = SimpleUploadedFile('cv.pdf', make_text_pdf('Jane Doe, Python developer'))
+        with patch.object(parse_quota, 'consume', return_value=False), \
+                patch('apps.resumes.views.enqueue_parse') as enqueue, \
+                patch('apps.resumes.views.parse_resume') as parse:
+            self.client.post('/resumes/upload/', {'title': 'CV', 'file': upload})
+
+        resume = Resume.objects.get(user=self.user)
+        enqueue.assert_called_once_with(resume)
+        parse.assert_not_called()
+
+    def test_parses_the_upload_without_reading_storage(self):
+        upload = SimpleUploadedFile('cv.pdf', make_text_pdf('Jane Doe, Python developer'))
+        with patch.object(FieldFile, 'open', side_effect=AssertionError('read from storage')):
+            response = self.client.post('/resumes/upload/', {'title': 'CV', 'file': upload})
+
+        self.assertRedirects(response, '/resumes/', fetch_redirect_response=False)
+        resume = Resume.objects.get(user=self.user)
+        self.assertEqual(resume.status, 'parsed', resume.error_message)
+        self.assertIn('Python developer', resume.parsed_text)
+
+
+def redis_available():
+    try:
+        return get_redis_connection().ping()
+    except Exception:
+        return False
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class ParseQuotaTests(TestCase):
+    """Uploads draw from per-user and, for recruiters, per-company buckets."""
+
+    def setUp(self):
+        self.quota = ParseQuota()
+        self.script = Mock(return_value=1)
+        self.quota._script = self.script
+        self.person = User.objects.create_user('person@example.com', 'pass-1234')
+        self.recruiter = User.objects.create_user('hr@example.com', 'pass-1234', account_type='company')
+
+    def test_personal_user_draws_from_own_bucket(self):
+        self.assertTrue(self.quota.consume(self.person, scope='interactive'))
+
+        kwargs = self.script.call_args.kwargs
+        self.assertEqual(kwargs['keys'], [f'parse_quota:interactive:user:{self.person.pk}'])
+        self.assertEqual(kwargs['args'][1:], [1, 10, 30 / 3600])
+
+    def test_recruiter_also_draws_from_company_bucket(self):
+        self.quota.consume(self.recruiter, scope='interactive', cost=5)
+
+        kwargs = self.script.call_args.kwargs
+        company = self.recruiter.company_profile
+        self.assertEqual(kwargs['keys'], [
+            f'parse_quota:interactive:user:{self.recruiter.pk}',
+            f'parse_quota:interactive:company:{company.pk}',
+        ])
+        self.assertEqual(kwargs['args'][1:], [5, 10, 30 / 3600, 40, 120 / 3600])
+
+    def test_exhausted_bucket_defers(self):
+        self.script.return_value = 0
+        self.assertFalse(self.quota.consume(self.person))
+
+    def test_fails_open_without_redis(self):
+        self.script.side_effect = ConnectionError('refused')
+        with self.assertLogs('apps.resumes.quotas', 'WARNING'):
+            self.assertTrue(self.quota.consume(self.person))
+
+
+@skipUnless(redis_available(), 'needs the Redis server at REDIS_URL')
+@override_settings(
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+    RESUME_PARSE_QUOTAS={'interactive': {
+        'user': {'capacity': 2, 'refill_per_hour': 1},
+        'company': {'capacity': 3, 'refill_per_hour': 1},
+    }},
+)
+class RedisTokenBucketTests(TestCase):
+    """The Lua script against a real Redis."""
+
+    def setUp(self):
+        self.quota = ParseQuota()
+        self.quota.KEY_PREFIX = f'test_parse_quota:{random.getrandbits(64):x}'
+        self.addCleanup(self._delete_keys)
+
+    def _delete_keys(self):
+        redis = get_redis_connection()
+        for key in redis.scan_iter(f'{self.quota.KEY_PREFIX}:*'):
+            redis.delete(key)
+
+    def test_user_bucket_runs_out(self):
+        user = User.objects.create_user('bucket@example.com', 'pass-1234')
+        self.assertEqual([self.quota.consume(user) for _ in range(3)], [True, True, False])
+
+    def test_company_bucket_is_shared_and_debited_all_or_nothing(self):
+        first = User.objects.create_user('hr1@example.com', 'pass-1234', account_type='company')
+        second = SimpleNamespace(pk='colleague', account_type='company', company_profile=first.company_profile)
+
+        self.assertEqual([self.quota.consume(first) for _ in range(3)], [True, True, False])
+        # The company bucket has one token left; the refused call above took none
+        self.assertTrue(self.quota.consume(second))
+        self.assertFalse(self.quota.consume(second))
+
+
+class DuplicateDetectionTests(TestCase):
+    """Near-identical resumes of the same user are linked to the original."""
+
+    def setUp(self):
+        self.text = generate_resume_text(random.Random(1))
+        self.user = User.objects.create_user('dup@example.com', 'pass-1234')
+
+    def _resume(self, user, text, is_primary=False):
+        resume = Resume.objects.create(
+            user=user,
+            title='Resume',
+            file=f'resumes/{user.id}/resume.pdf',
+            file_size=1024,
+            original_filename='resume.pdf',
+            status='parsed',
+            parsed_text=text,
+            is_primary=is_primary,
+        )
+        index_resume(resume)
+        return resume
+
+    def test_links_near_duplicate(self):
+        original = self._resume(self.user, self.text, is_primary=True)
+        edited = self._resume(self.user, self.text.replace('Python', 'Pythonic', 1))
+
+        edited.refresh_from_db()
+        self.assertEqual(edited.duplicate_of_id, original.pk)
+        self.assertIsNone(Resume.objects.get(pk=original.pk).duplicate_of_id)
+
+    def test_does_not_link_dissimilar(self):
+        self._resume(self.user, self.text, is_primary=True)
+        other = self._resume(self.user, generate_resume_text(random.Random(2)))
+
+        other.refresh_from_db()
+        self.assertIsNone(other.duplicate_of_id)
+
+    def test_other_users_resumes_are_never_linked(self):
+        someone_else = User.objects.create_user('other@example.com', 'pass-1234')
+        self._resume(someone_else, self.text, is_primary=True)
+        copy = self._resume(self.user, self.text, is_primary=True)
+
+        copy.refresh_from_db()
+        self.assertIsNone(copy.duplicate_of_id)
+
+
+@override_settings(
+    RESUME_MAX_PDF_PAGES=30,
+    RESUME_MAX_DOCX_ENTRIES=500,
+    RESUME_MAX_DOCX_UNCOMPRESSED_SIZE=50 * 1024 * 1024,
+    RESUME_MAX_COMPRESSION_RATIO=200,
+)
+class UploadValidationTests(SimpleTestCase):
+    """Uploads are sniffed from their headers, trailers and zip directories."""
+
+    def assertRejected(self, name, content, code):
+        with self.assertRaises(ValidationError) as raised:
+            validate_resume_file(SimpleUploadedFile(name, content))
+        self.assertEqual(raised.exception.code, code)
+
+    def test_accepts_valid_files(self):
+        validate_resume_file(SimpleUploadedFile('resume.pdf', make_pdf(2)))
+        validate_resume_file(SimpleUploadedFile('resume.docx', make_docx()))
+
+    def test_rejects_too_many_pages(self):
+        self.assertRejected('resume.pdf', make_pdf(31), 'too_many_pages')
+
+    def test_page_count_ignores_outline_counts(self):
+        validate_resume_file(SimpleUploadedFile('resume.pdf', make_pdf(1, outline_count=500)))
+
+    def test_page_count_allows_junk_before_header(self):
+        self.assertRejected('resume.pdf', make_pdf(31, prefix=b'junk\n'), 'too_many_pages')
+
+    def test_rejects_truncated_pdf(self):
+        self.assertRejected('resume.pdf', make_pdf()[:-200], 'truncated_pdf')
+
+    def test_rejects_disguised_files(self):
+        png = b'\x89PNG\r\n\x1a\n' + b'\0' * 2048
+        self.assertRejected('resume.pdf', png, 'invalid_pdf')
+        self.assertRejected('resume.docx', make_pdf(), 'invalid_docx')
+        self.assertRejected('resume.pdf', make_docx(), 'invalid_pdf')
+
+    def test_rejects_plain_zip_renamed_to_docx(self):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            archive.writestr('notes.txt', 'hello')
+        self.assertRejected('resume.docx', buffer.getvalue(), 'invalid_docx')
+
+    def test_rejects_docx_zip_bomb(self):
+        bomb = make_docx([('word/media/filler.bin', b'\0' * (4 * 1024 * 1024))])
+        self.assertLess(len(bomb), 64 * 1024)
+        self.assertRejected('resume.docx', bomb, 'zip_bomb')
+
+    @override_settings(RESUME_MAX_DOCX_ENTRIES=5)
+    def test_rejects_docx_with_too_many_entries(self):
+        parts = [(f'word/part{index}.xml', '<p/>') for index in range(10)]
+        self.assertRejected('resume.docx', make_docx(parts), 'too_many_entries')
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+    PROFILING_SAMPLE_RATE=0,
+)
+class ResumePreviewTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('preview@example.com', 'pass-1234')
+        self.resume = Resume.objects.create(
+            user=self.user,
+            title='Backend resume',
+            file=f'resumes/{self.user.id}/resume.pdf',
+            file_size=1024,
+            original_filename='resume.pdf',
+            status='parsed',
+            parsed_text='Python and Django',
+        )
+
+    def test_owner_sees_preview(self):
+        self.client.force_login(self.user)
+        response = self.client.get(f'/resumes/{self.resume.pk}/preview/')
+        self.assertContains(response, 'Backend resume')
+
+    def test_other_users_get_404(self):
+        self.client.force_login(User.objects.create_user('other@example.com', 'pass-1234'))
+        response = self.client.get(f'/resumes/{self.resume.pk}/preview/')
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,84 @@
+# Tests for screening app
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from apps.screening.embeddings import EmbeddingService, EmbeddingStore, content_key
+
+
+class EmbeddingStoreTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name)
+
+    def _vector(self, seed, dimension=4):
+        return np.random.default_rng(seed).random(dimension, dtype=np.float32)
+
+    def test_round_trip_without_known_dimension(self):
+        EmbeddingStore(self.path).put_many({'a': self._vector(1), 'b': self._vector(2)})
+
+        store = EmbeddingStore(self.path)
+        self.assertEqual(store.dimension, 4)
+        vectors = store.get_many(['a', 'b', 'missing'])
+        self.assertEqual(set(vectors), {'a', 'b'})
+        np.testing.assert_allclose(vectors['a'], self._vector(1), rtol=1e-3)
+
+    def test_picks_up_rows_from_other_writers_incrementally(self):
+        reader = EmbeddingStore(self.path)
+        writer = EmbeddingStore(self.path)
+        writer.put_many({'a': self._vector(1)})
+        self.assertEqual(set(reader.get_many(['a'])), {'a'})
+
+        writer.put_many({'b': self._vector(2)})
+        with patch.object(Path, 'read_text', side_effect=AssertionError('re-read dimension')):
+            self.assertEqual(set(reader.get_many(['a', 'b'])), {'a', 'b'})
+        self.assertEqual(reader._keys_offset, (self.path / 'keys.txt').stat().st_size)
+
+    def test_ignores_partially_written_key(self):
+        store = EmbeddingStore(self.path)
+        store.put_many({'a': self._vector(1)})
+        with open(self.path / 'vectors.f16', 'ab') as vectors_file:
+            vectors_file.write(self._vector(2).astype(np.float16).tobytes())
+        with open(self.path / 'keys.txt', 'a') as keys_file:
+            keys_file.write('bb')
+
+        self.assertEqual(store.get_many(['bb']), {})
+        with open(self.path / 'keys.txt', 'a') as keys_file:
+            keys_file.write('b\n')
+        self.assertEqual(set(store.get_many(['bbb'])), {'bbb'})
+
+    def test_rejects_other_dimension(self):
+        store = EmbeddingStore(self.path)
+        store.put_many({'a': self._vector(1)})
+        with self.assertRaises(ValueError):
+            store.put_many({'b': self._vector(2, dimension=8)})
+
+    def test_store_without_dimension_starts_afresh(self):
+        (self.path / 'keys.txt').write_text('old\n')
+        (self.path / 'vectors.f16').write_bytes(b'\0' * 6)
+
+        store = EmbeddingStore(self.path)
+        self.assertEqual(len(store), 0)
+        store.put_many({'a': self._vector(1)})
+        self.assertEqual((self.path / 'keys.txt').read_text(), 'a\n')
+        self.assertEqual(len(EmbeddingStore(self.path)), 1)
+
+
+class EmbeddingServiceTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.service = EmbeddingService(store_dir=directory.name)
+
+    def test_cached_texts_do_not_load_model(self):
+        vector = np.ones(4, dtype=np.float32) / 2
+        self.service.store.put_many({content_key('Python developer'): vector})
+
+        with patch.object(EmbeddingService, '_load_model', side_effect=AssertionError('model loaded')):
+            embedded = self.service.embed_texts(['Python developer', 'Python developer'])
+            self.assertEqual(embedded.shape, (2, 4))
+            self.assertEqual(self.service.embed_texts([]).shape, (0, 4))
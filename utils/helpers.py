@@ -0,0 +1,18 @@
+from django.conf import settings
+
+
+_redis_connection = None
+
+
+def get_redis_connection():
+    """
+    Return a shared raw Redis client for ``settings.REDIS_URL``.
+
+    The Django cache API has no scripting, lists or atomic multi-key
+    operations; features that need them talk to Redis through this client.
+    """
+    global _redis_connection
+    if _redis_connection is None:
+        import redis
+        _redis_connection = redis.Redis.from_url(settings.REDIS_URL)
+    return _redis_connection